@@ -27,6 +27,9 @@ import io
 from datetime import datetime
 from collections import deque
 
+import numpy as np
+from rapidfuzz import fuzz
+
 # Configuração da página
 st.set_page_config(
     page_title="Revisor de Documentos - Travessia",
@@ -188,6 +191,13 @@ except Exception as e:
     st.error(f"Falha ao importar parse_document: {e}")
     st.stop()
 
+try:
+    from backend.parsers.cache import ParseCache, DEFAULT_CACHE_DIR, compute_file_hash
+except Exception as e:
+    st.warning(f"Cache de parsing indisponível: {e}")
+    ParseCache = None
+    compute_file_hash = None
+
 try:
     from backend.utils.catalog import load_catalog
 except Exception as e:
@@ -201,6 +211,14 @@ except Exception as e:
             st.error(f"Erro ao carregar catálogo: {e}")
             st.stop()
 
+try:
+    from backend.keyword_index import KeywordIndex
+    from backend.matching import prepare, fuzzy_matrix, title_word_bonus, assign_clauses
+    from backend.parsers.clause import clause_normalized
+except Exception as e:
+    st.error(f"Falha ao importar keyword_index/matching: {e}")
+    st.stop()
+
 try:
     from backend.vector_db import DocumentVectorDB, get_rag_context_for_suggestion
 except Exception as e:
@@ -211,6 +229,10 @@ except Exception as e:
 if 'vector_db' not in st.session_state:
     st.session_state.vector_db = DocumentVectorDB(persist_directory="data/vector_db")
 
+# Cache de parsing (minutas reenviadas não são reprocessadas)
+if 'parse_cache' not in st.session_state:
+    st.session_state.parse_cache = ParseCache(DEFAULT_CACHE_DIR) if ParseCache else None
+
 
 # ========================================
 # FUNÇÕES AUXILIARES
@@ -423,6 +445,10 @@ with st.sidebar:
     with st.expander("Opções Avançadas"):
         skip_tier2 = st.checkbox("Pular Tier-2 (apenas classificar)", value=True)
         top_k = st.slider("Top-K matches", 1, 10, 3)
+        max_per_doc = st.slider(
+            "Cláusulas do catálogo por cláusula do documento", 1, 5, 2,
+            help="Quantas cláusulas do catálogo uma mesma cláusula da minuta pode atender"
+        )
 
     st.markdown("---")
 
@@ -489,12 +515,10 @@ with tab1:
             st.error("Por favor, insira sua Gemini API Key na barra lateral")
             st.stop()
 
-        # Salva arquivo temporariamente
-        temp_path = Path("data/entrada") / uploaded_file.name
-        temp_path.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(temp_path, 'wb') as f:
-            f.write(uploaded_file.read())
+        # Parse direto do buffer do upload (sem arquivo temporário); o
+        # hash do mesmo buffer serve ao cache e à auditoria
+        file_hash = compute_file_hash(uploaded_file) if compute_file_hash else None
+        st.session_state['document_hash'] = file_hash
 
         # Progress
         progress_bar = st.progress(0)
@@ -505,7 +529,8 @@ with tab1:
             status_text.text("Parseando documento...")
             progress_bar.progress(10)
 
-            document = parse_document(str(temp_path))
+            document = parse_document(uploaded_file, cache=st.session_state.parse_cache,
+                                      filename=uploaded_file.name, file_hash=file_hash)
             st.session_state['document'] = document
 
             status_text.text(f"{len(document.clauses)} cláusulas encontradas")
@@ -530,7 +555,36 @@ with tab1:
             doc_full_text = "\n\n".join([
                 f"{c['title']}\n{c['content']}" 
                 for c in document.clauses
-            ]).lower()
+            ])
+
+            # Keywords do catálogo em um autômato: uma passada pelo texto
+            # normalizado de cada cláusula (visão em cache da Clause) conta as
+            # keywords (sem acentos) de todas as cláusulas do catálogo
+            keyword_index = KeywordIndex([c.get('keywords', []) for c in catalog_clauses])
+            keyword_hits = keyword_index.count_matrix([clause_normalized(c) for c in document.clauses])
+            full_text_hits = keyword_index.hit_counts(doc_full_text)
+
+            # Scores de título catálogo × documento em matriz (rapidfuzz cdist,
+            # títulos normalizados uma vez) em vez de fuzz por par dentro do laço
+            cat_titles = prepare([c.get('titulo', 'Sem título') for c in catalog_clauses])
+            doc_titles = prepare([c['title'] for c in document.clauses])
+            # 1. Similaridade do título (peso 50)
+            match_scores = fuzzy_matrix(cat_titles, doc_titles, scorer=fuzz.partial_ratio) / 100.0 * 50
+            # 2. Palavras importantes do título do catálogo no título do documento (+10 exata, +5 similar)
+            match_scores = match_scores + title_word_bonus(cat_titles, doc_titles)
+            # 3. Keywords no texto (peso 3 por keyword)
+            match_scores = match_scores + keyword_hits.T * 3
+            # 4. Posição no documento (cláusulas iniciais têm leve bônus para empate)
+            positions = np.array([c['index'] for c in document.clauses], dtype=np.float64)
+            match_scores = match_scores + (1 - positions / max(len(document.clauses), 1)) * 2
+
+            # Atribuição global: uma cláusula da minuta não é disputada por
+            # todo o catálogo (até max_per_doc cláusulas do catálogo por cláusula)
+            assignment = assign_clauses(match_scores, max_per_doc=max_per_doc)
+            assigned = assignment.by_catalog()
+            # Cláusulas do catálogo atendidas por cada cláusula da minuta (limite max_per_doc)
+            doc_load = np.bincount(np.array([j for _, j, _ in assignment.pairs], dtype=np.int64),
+                                   minlength=len(document.clauses))
 
             for i, cat_clause in enumerate(catalog_clauses):
                 # Update progress
@@ -539,63 +593,38 @@ with tab1:
                 cat_title = cat_clause.get('titulo', 'Sem título')
                 status_text.text(f"Verificando cláusula {i+1}/{total_catalog}: {cat_title[:50]}...")
 
-                # Encontra melhor match no documento usando múltiplas estratégias
+                # Par da atribuição global (se houver)
                 best_doc_clause = None
+                best_j = None
                 best_score = 0
-                
-                from rapidfuzz import fuzz
-                
-                cat_title_lower = cat_title.lower()
-                cat_keywords = [kw.lower() for kw in cat_clause.get('keywords', [])]
-
-                for doc_clause in document.clauses:
-                    doc_title = doc_clause['title'].lower()
-                    doc_text = (doc_clause['title'] + " " + doc_clause['content'][:2000]).lower()
-                    
-                    score = 0
-                    
-                    # 1. Similaridade do título (peso alto)
-                    title_similarity = fuzz.partial_ratio(cat_title_lower, doc_title) / 100.0
-                    score += title_similarity * 50  # Peso 50 para título
-                    
-                    # 2. Similaridade fuzzy de palavras-chave importantes do título do catálogo
-                    cat_important_words = [w for w in cat_title_lower.split() if len(w) > 3]
-                    for word in cat_important_words:
-                        if word in doc_title:
-                            score += 10  # Bônus por palavra exata no título
-                        elif any(fuzz.ratio(word, doc_word) > 80 for doc_word in doc_title.split()):
-                            score += 5  # Bônus por palavra similar no título
-                    
-                    # 3. Keywords no texto (peso médio)
-                    keywords_in_text = sum(1 for kw in cat_keywords if kw in doc_text)
-                    score += keywords_in_text * 3
-                    
-                    # 4. Posição no documento (cláusulas iniciais têm leve bônus para empate)
-                    position_bonus = (1 - (doc_clause['index'] / max(len(document.clauses), 1))) * 2
-                    score += position_bonus
-
-                    if score > best_score:
-                        best_score = score
-                        best_doc_clause = doc_clause
+                if i in assigned:
+                    best_j, best_score = assigned[i]
+                    best_doc_clause = document.clauses[best_j]
 
                 # Se não achou match razoável, busca em todo documento
                 if not best_doc_clause or best_score < 5:
                     # Verifica se alguma keyword aparece em qualquer lugar do documento
-                    keywords_found = sum(1 for kw in cat_keywords if kw in doc_full_text)
+                    keywords_found = int(full_text_hits[i])
                     
                     if keywords_found > 0 and document.clauses:
-                        # Busca a cláusula que mais menciona as keywords
-                        best_kw_clause = None
+                        # Busca a cláusula que mais menciona as keywords, entre as
+                        # que ainda têm vaga (ou a já atribuída a esta cláusula)
+                        best_kw_j = None
                         best_kw_count = 0
-                        for doc_clause in document.clauses:
-                            doc_text = (doc_clause['title'] + " " + doc_clause['content'][:2000]).lower()
-                            kw_count = sum(1 for kw in cat_keywords if kw in doc_text)
+                        for j in range(len(document.clauses)):
+                            if j != best_j and doc_load[j] >= max_per_doc:
+                                continue
+                            kw_count = int(keyword_hits[j, i])
                             if kw_count > best_kw_count:
                                 best_kw_count = kw_count
-                                best_kw_clause = doc_clause
+                                best_kw_j = j
                         
-                        if best_kw_clause and best_kw_count > best_score:
-                            best_doc_clause = best_kw_clause
+                        if best_kw_j is not None and best_kw_count > best_score:
+                            if best_j is not None:
+                                doc_load[best_j] -= 1
+                            doc_load[best_kw_j] += 1
+                            best_j = best_kw_j
+                            best_doc_clause = document.clauses[best_kw_j]
                             best_score = best_kw_count * 2
 
                 # Classifica e gera sugestão com Gemini + RAG
@@ -632,6 +661,12 @@ with tab1:
             # Salva resultados
             st.session_state['results'] = results
             st.session_state['catalog'] = catalog
+            # Sem par na atribuição e não recuperadas pela busca por keywords
+            used = {id(r['doc_clause']) for r in results if r['doc_clause']}
+            st.session_state['unmatched_doc_clauses'] = [
+                document.clauses[j]['title'] for j in assignment.unmatched_document
+                if id(document.clauses[j]) not in used
+            ]
 
             # 🆕 SALVA DOCUMENTO NO BANCO VETORIAL
             status_text.text("Salvando documento na base de conhecimento...")
@@ -651,11 +686,10 @@ with tab1:
             time.sleep(1)
 
             st.success("Análise concluída com sucesso!")
+            if file_hash:
+                st.caption(f"SHA-256 da minuta: {file_hash}")
             st.balloons()
 
-            # Remove arquivo temporário
-            temp_path.unlink()
-
         except Exception as e:
             st.error(f"Erro durante análise: {str(e)}")
             import traceback
@@ -710,6 +744,13 @@ with tab2:
             </div>
             """, unsafe_allow_html=True)
 
+        # Cláusulas da minuta sem correspondência no catálogo (atribuição global)
+        unmatched_doc = st.session_state.get('unmatched_doc_clauses', [])
+        if unmatched_doc:
+            with st.expander(f"{len(unmatched_doc)} cláusulas da minuta sem correspondência no catálogo"):
+                for title in unmatched_doc:
+                    st.write(f"- {title}")
+
         st.markdown("---")
 
         # Tabela de resultados
@@ -58,19 +58,22 @@ class AuditTrail:
             logger.error(f"Erro ao calcular hash: {e}")
             return "ERROR_HASH"
 
-    def log_document_info(self, filepath: str, document_type: str = None):
+    def log_document_info(self, filepath: str, document_type: str = None,
+                          file_hash: Optional[str] = None):
         """
         Registra informações do documento de entrada
 
         Args:
             filepath: Caminho do documento
             document_type: Tipo do documento (CRI, CRA, Debênture)
+            file_hash: SHA-256 já calculado (ex: pelo cache de parsing);
+                evita reler o arquivo
         """
         file_path = Path(filepath)
 
         self.metadata['documento'] = {
             'nome': file_path.name,
-            'hash_sha256': self.compute_file_hash(filepath),
+            'hash_sha256': file_hash or self.compute_file_hash(filepath),
             'tamanho_bytes': file_path.stat().st_size,
             'tipo': document_type,
             'data_modificacao': datetime.fromtimestamp(
@@ -199,6 +202,30 @@ class AuditTrail:
             'count': num_sugestoes
         })
 
+    def log_revision(self, previous: str, diff: Dict):
+        """
+        Registra revisão incremental (diff contra a rodada anterior)
+
+        Args:
+            previous: Caminho da revisão anterior
+            diff: Contagens de cláusulas inalteradas/alteradas/novas/removidas/reavaliadas
+        """
+        self.metadata['revisao_incremental'] = {
+            'anterior': str(previous),
+            **diff
+        }
+
+        self.log_event('REVISION_DIFF', diff)
+
+    def log_review_state(self, state_file: Path):
+        """
+        Registra o arquivo de estado usado pela próxima revisão incremental
+
+        Args:
+            state_file: Caminho do estado salvo (mesmo diretório da auditoria)
+        """
+        self.metadata['estado_revisao'] = Path(state_file).name
+
     def log_prompt(self,
                    stage: str,
                    prompt_type: str,
@@ -0,0 +1,184 @@
+"""
+BM25 (Okapi) com índice invertido.
+
+rank_bm25.BM25Okapi.get_scores percorre, para cada token da query, a lista
+de dicionários de frequência de todos os documentos do corpus. Aqui o corpus
+vira um índice invertido na construção:
+
+- postings em formato CSR: para cada termo, os documentos que o contêm
+  (indptr/doc_ids), já com o peso Okapi pré-calculado em cada posting
+  (idf × tf saturado pela norma de comprimento do documento)
+- o score de uma query é a soma dos pesos das postings dos seus termos,
+  acumulada com np.bincount; um lote de queries é uma única bincount sobre
+  a matriz D×N achatada
+- top-k por np.argpartition, sem ordenar o corpus inteiro
+
+Os scores são os mesmos do BM25Okapi (k1, b e piso epsilon do idf para
+termos em mais da metade dos documentos, tokens repetidos na query contam
+de novo). O tokenizador padrão remove acentos como utils.text_norm.normalize,
+então "credito" e "crédito" são o mesmo termo.
+"""
+
+import re
+from collections import Counter
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from .utils.text_norm import normalize
+except ImportError:
+    from utils.text_norm import normalize
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+# Elementos da matriz de scores calculados por vez (D×N) no top-k em lote
+SCORE_BLOCK_SIZE = 1 << 22
+
+
+def tokenize(text: str) -> List[str]:
+    """Tokenização para o BM25: texto normalizado (sem acentos, minúsculas) em palavras"""
+    return TOKEN_PATTERN.findall(normalize(text))
+
+
+class BM25Index:
+    """Índice invertido BM25 Okapi sobre um corpus tokenizado"""
+
+    def __init__(self,
+                 corpus_tokenized: Sequence[Sequence[str]],
+                 k1: float = 1.5,
+                 b: float = 0.75,
+                 epsilon: float = 0.25):
+        """
+        Constrói o índice
+
+        Args:
+            corpus_tokenized: Tokens de cada documento, na ordem
+            k1: Saturação da frequência do termo
+            b: Peso da normalização por comprimento
+            epsilon: Piso do idf (fração do idf médio), como no BM25Okapi
+        """
+        self.k1 = k1
+        self.b = b
+        self.epsilon = epsilon
+        self.size = len(corpus_tokenized)
+        self.vocab = {}
+
+        terms, docs, freqs = [], [], []
+        doc_len = np.zeros(self.size, dtype=np.float64)
+        for d, tokens in enumerate(corpus_tokenized):
+            doc_len[d] = len(tokens)
+            for term, tf in Counter(tokens).items():
+                terms.append(self.vocab.setdefault(term, len(self.vocab)))
+                docs.append(d)
+                freqs.append(tf)
+
+        terms = np.asarray(terms, dtype=np.int64)
+        order = np.argsort(terms, kind='stable')
+        self.doc_ids = np.asarray(docs, dtype=np.int64)[order]
+        tf = np.asarray(freqs, dtype=np.float64)[order]
+
+        # Frequência de documento por termo = tamanho de cada lista de postings
+        df = np.bincount(terms, minlength=len(self.vocab)).astype(np.float64)
+        self.indptr = np.concatenate([[0], np.cumsum(df)]).astype(np.int64)
+
+        self.idf = np.log(self.size - df + 0.5) - np.log(df + 0.5)
+        if len(self.idf):
+            # Piso para termos em mais da metade dos documentos (idf negativo)
+            floor = self.epsilon * self.idf.mean()
+            self.idf[self.idf < 0] = floor
+
+        self.avgdl = doc_len.mean() if self.size else 0.0
+        norm = self.k1 * (1 - self.b + self.b * doc_len / self.avgdl) if self.avgdl else np.full(self.size, self.k1)
+        self.weights = self.idf[terms[order]] * tf * (self.k1 + 1) / (tf + norm[self.doc_ids])
+
+    @classmethod
+    def from_texts(cls, texts: Sequence[str], tokenizer: Callable[[str], List[str]] = tokenize, **params):
+        """Índice a partir dos textos, tokenizados com tokenizer"""
+        return cls([tokenizer(text) for text in texts], **params)
+
+    def _postings(self, tokens: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """(documentos, pesos) de todas as postings dos termos da query"""
+        counts = Counter(t for t in tokens if t in self.vocab)
+        if not counts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+        docs, weights = [], []
+        for term, repeat in counts.items():
+            t = self.vocab[term]
+            start, end = self.indptr[t], self.indptr[t + 1]
+            docs.append(self.doc_ids[start:end])
+            # Token repetido na query soma o termo de novo
+            weights.append(self.weights[start:end] * repeat)
+        return np.concatenate(docs), np.concatenate(weights)
+
+    def scores(self, tokens: Sequence[str]) -> np.ndarray:
+        """
+        Scores BM25 de uma query contra todo o corpus
+
+        Args:
+            tokens: Tokens da query
+
+        Returns:
+            Vetor de scores (um por documento)
+        """
+        docs, weights = self._postings(tokens)
+        return np.bincount(docs, weights=weights, minlength=self.size).astype(np.float64)
+
+    def score_matrix(self, queries: Sequence[Sequence[str]]) -> np.ndarray:
+        """
+        Scores BM25 de um lote de queries
+
+        Args:
+            queries: Tokens de cada query
+
+        Returns:
+            Matriz D×N (queries × documentos)
+        """
+        all_docs, all_weights = [], []
+        for row, tokens in enumerate(queries):
+            docs, weights = self._postings(tokens)
+            all_docs.append(docs + row * self.size)
+            all_weights.append(weights)
+        if not queries:
+            return np.zeros((0, self.size))
+        flat = np.bincount(np.concatenate(all_docs), weights=np.concatenate(all_weights),
+                           minlength=len(queries) * self.size)
+        return flat.astype(np.float64).reshape(len(queries), self.size)
+
+    def top_k(self,
+              queries: Sequence[Sequence[str]],
+              k: int = 10,
+              mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k documentos de cada query (partial sort)
+
+        Args:
+            queries: Tokens de cada query
+            k: Número de resultados por query
+            mask: Vetor booleano de documentos elegíveis (None = todos)
+
+        Returns:
+            (índices D×k, scores D×k), em ordem decrescente de score;
+            k = min(k, N). Documentos fora de mask têm score -inf.
+        """
+        k = min(k, self.size)
+        indices = np.zeros((len(queries), k), dtype=np.int64)
+        top_scores = np.zeros((len(queries), k), dtype=np.float64)
+        if k == 0:
+            return indices, top_scores
+
+        # Lotes de queries para a matriz D×N não crescer com o corpus
+        rows = max(1, SCORE_BLOCK_SIZE // max(self.size, 1))
+        for start in range(0, len(queries), rows):
+            block = self.score_matrix(queries[start:start + rows])
+            if mask is not None:
+                block[:, ~mask] = -np.inf
+            if k < self.size:
+                part = np.argpartition(-block, k - 1, axis=1)[:, :k]
+            else:
+                part = np.broadcast_to(np.arange(self.size), block.shape)
+            part_scores = np.take_along_axis(block, part, axis=1)
+            order = np.argsort(-part_scores, axis=1, kind='stable')
+            indices[start:start + len(block)] = np.take_along_axis(part, order, axis=1)
+            top_scores[start:start + len(block)] = np.take_along_axis(part_scores, order, axis=1)
+        return indices, top_scores
@@ -0,0 +1,316 @@
+"""
+Índice persistente do catálogo para o HybridRanker.
+
+Sem ele, cada execução (CLI, lote, Streamlit) recodifica todas as
+cláusulas do catálogo no modelo de embeddings e retokeniza o corpus do
+BM25. O índice guarda, por modelo de embeddings:
+
+- embeddings.npy: matriz float32 (uma linha por cláusula indexada), aberta
+  com mmap na carga
+- manifest.json: para cada (id da cláusula, hash do conteúdo) a linha da
+  matriz, os tokens do BM25 e os regex_patterns inválidos
+
+A chave inclui o hash de título, keywords, template e regex_patterns, então
+editar uma cláusula no YAML recodifica só ela; as demais são lidas do
+arquivo. O manifest aponta para o arquivo de embeddings vigente e é trocado
+atomicamente, então processos concorrentes (workers do main_batch) nunca
+leem um par manifest/embeddings inconsistente.
+
+Gravações são serializadas por um arquivo de lock (index.lock): o escritor
+relê o manifest vigente sob o lock e acrescenta a ele as suas cláusulas
+(nada gravado por outro processo se perde) e remove só o arquivo de
+embeddings do manifest que substituiu. Versões antigas de uma cláusula
+editada saem do manifest; quando as linhas sem entrada passam de
+STALE_FRACTION da matriz, ela é compactada para as linhas vivas.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+import numpy as np
+
+try:
+    from .pattern_scanner import DEFAULT_FLAGS
+except ImportError:
+    from pattern_scanner import DEFAULT_FLAGS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_DIR = "data/cache/catalog_index"
+
+# Muda quando o texto indexado ou a tokenização mudam
+INDEX_VERSION = "2"
+
+MANIFEST = "manifest.json"
+LOCK = "index.lock"
+
+# Espera máxima pelo lock de gravação (segundos); sem ele, o índice não é gravado
+LOCK_TIMEOUT = 30.0
+# Lock mais velho que isso ficou de um processo que morreu (segundos)
+LOCK_STALE_SECONDS = 300.0
+
+# Fração de linhas sem entrada no manifest acima da qual a matriz é compactada
+STALE_FRACTION = 0.5
+
+INDEXED_FIELDS = ('titulo', 'keywords', 'template', 'regex_patterns')
+
+
+def clause_text(clause: Dict) -> str:
+    """Texto indexado de uma cláusula do catálogo: título + keywords + template"""
+    return ' '.join([
+        clause.get('titulo', ''),
+        ' '.join(clause.get('keywords', [])),
+        clause.get('template', '')
+    ])
+
+
+def clause_hash(clause: Dict) -> str:
+    """Hash do conteúdo indexado de uma cláusula (muda quando ela é editada no YAML)"""
+    content = {field: clause.get(field) for field in INDEXED_FIELDS}
+    raw = INDEX_VERSION + json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()[:16]
+
+
+def invalid_patterns(patterns: List[str], flags: int = DEFAULT_FLAGS) -> Dict[str, str]:
+    """Posição -> erro dos regex_patterns que não compilam (com as flags do PatternScanner)"""
+    invalid = {}
+    for i, pattern in enumerate(patterns):
+        try:
+            re.compile(pattern, flags)
+        except re.error as e:
+            invalid[str(i)] = str(e)
+    return invalid
+
+
+class IndexedCatalog:
+    """Índice das cláusulas de um catálogo, na ordem do catálogo"""
+
+    def __init__(self, embeddings: np.ndarray, corpus_tokenized: List[List[str]],
+                 invalid: List[Dict[str, str]], stats: Dict):
+        self.embeddings = embeddings
+        self.corpus_tokenized = corpus_tokenized
+        self.invalid = invalid
+        self.stats = stats
+
+
+class CatalogIndex:
+    """Índice persistente de um modelo de embeddings"""
+
+    def __init__(self, index_dir: str = DEFAULT_INDEX_DIR, model_name: str = 'all-MiniLM-L6-v2'):
+        """
+        Inicializa o índice
+
+        Args:
+            index_dir: Diretório base dos índices
+            model_name: Modelo de embeddings (um subdiretório por modelo)
+        """
+        self.model_name = model_name
+        self.path = Path(index_dir) / re.sub(r'[^\w.-]+', '_', model_name)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(clause: Dict) -> str:
+        """Chave de uma cláusula: id + hash do conteúdo"""
+        return f"{clause.get('id')}|{clause_hash(clause)}"
+
+    def _read(self):
+        """(manifest, embeddings por mmap) vigentes, ou (None, None)"""
+        try:
+            with open(self.path / MANIFEST, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('model') != self.model_name or manifest.get('version') != INDEX_VERSION:
+                return None, None
+            embeddings = np.load(self.path / manifest['embeddings'], mmap_mode='r')
+        except (OSError, ValueError, KeyError) as e:
+            if (self.path / MANIFEST).exists():
+                logger.warning(f"Índice do catálogo ilegível, reconstruindo: {e}")
+            return None, None
+        return manifest, embeddings
+
+    @contextmanager
+    def _lock(self):
+        """
+        Lock de gravação entre processos (arquivo criado com O_EXCL)
+
+        Raises:
+            TimeoutError: Lock não obtido em LOCK_TIMEOUT segundos
+        """
+        lock = self.path / LOCK
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while True:
+            try:
+                fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - lock.stat().st_mtime > LOCK_STALE_SECONDS:
+                        lock.unlink(missing_ok=True)
+                        continue
+                except OSError:
+                    continue
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Lock do índice do catálogo ocupado: {lock}")
+                time.sleep(0.05)
+        try:
+            os.write(fd, str(os.getpid()).encode('ascii'))
+            os.close(fd)
+            yield
+        finally:
+            lock.unlink(missing_ok=True)
+
+    def _write(self, entries: Dict, embeddings: np.ndarray, replaced: Optional[str]) -> bool:
+        """
+        Grava embeddings em arquivo novo e troca o manifest atomicamente
+
+        Chamado sob o lock. Remove só replaced, o arquivo de embeddings do
+        manifest substituído (leitores já abertos mantêm o mmap).
+
+        Returns:
+            True se o índice foi gravado
+        """
+        filename = f"embeddings-{uuid.uuid4().hex[:12]}.npy"
+        manifest = {'version': INDEX_VERSION, 'model': self.model_name,
+                    'embeddings': filename, 'entries': entries}
+        tmp_manifest = self.path / f"{MANIFEST}.{os.getpid()}.tmp"
+        try:
+            np.save(self.path / filename, embeddings)
+            with open(tmp_manifest, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False)
+            os.replace(tmp_manifest, self.path / MANIFEST)
+        except OSError as e:
+            logger.warning(f"Falha ao gravar índice do catálogo: {e}")
+            tmp_manifest.unlink(missing_ok=True)
+            (self.path / filename).unlink(missing_ok=True)
+            return False
+
+        if replaced and replaced != filename:
+            try:
+                (self.path / replaced).unlink(missing_ok=True)
+            except OSError:
+                pass
+        return True
+
+    @staticmethod
+    def _merge(manifest: Optional[Dict], pool: Optional[np.ndarray], added: Dict,
+               added_embeddings: np.ndarray, catalog_ids: Set[str], keys: Set[str]):
+        """
+        Acrescenta cláusulas novas ao manifest vigente
+
+        Args:
+            manifest: Manifest vigente (relido sob o lock) ou None
+            pool: Matriz de embeddings vigente ou None
+            added: Chave -> entrada (sem 'row') das cláusulas codificadas
+            added_embeddings: Embeddings de added, na mesma ordem
+            catalog_ids: Ids das cláusulas do catálogo carregado
+            keys: Chaves vigentes das cláusulas do catálogo carregado
+
+        Returns:
+            (entries, embeddings, changed): changed é False quando o
+            manifest vigente já tinha tudo (outro processo gravou antes)
+        """
+        entries = {}
+        superseded = 0
+        for key, entry in (manifest['entries'] if manifest else {}).items():
+            if key not in keys and key.rsplit('|', 1)[0] in catalog_ids:
+                # Versão anterior de uma cláusula editada
+                superseded += 1
+                continue
+            entries[key] = entry
+
+        start = len(pool) if pool is not None else 0
+        new_rows = []
+        for position, (key, entry) in enumerate(added.items()):
+            if key not in entries:
+                entries[key] = {**entry, 'row': start + len(new_rows)}
+                new_rows.append(position)
+
+        if pool is not None and len(pool):
+            embeddings = np.concatenate([pool, added_embeddings[new_rows]]) if new_rows else pool
+        else:
+            embeddings = added_embeddings[new_rows]
+
+        compacted = False
+        live = sorted(entry['row'] for entry in entries.values())
+        if len(embeddings) and 1 - len(live) / len(embeddings) > STALE_FRACTION:
+            renumber = {row: new for new, row in enumerate(live)}
+            embeddings = np.asarray(embeddings[live])
+            entries = {key: {**entry, 'row': renumber[entry['row']]} for key, entry in entries.items()}
+            compacted = True
+
+        return entries, embeddings, bool(new_rows or superseded or compacted)
+
+    def load(self,
+             clauses: List[Dict],
+             encode: Callable[[List[str]], np.ndarray],
+             tokenize: Callable[[str], List[str]]) -> IndexedCatalog:
+        """
+        Índice das cláusulas, codificando só as ausentes ou alteradas
+
+        Args:
+            clauses: Cláusulas do catálogo (catalog['clausulas'])
+            encode: Função de embeddings em lote (SentenceTransformer.encode)
+            tokenize: Tokenizador do BM25
+
+        Returns:
+            IndexedCatalog na ordem de clauses
+        """
+        manifest, pool = self._read()
+        entries = manifest['entries'] if manifest else {}
+        keys = [self.key(clause) for clause in clauses]
+
+        missing = [i for i, key in enumerate(keys) if key not in entries]
+        if missing:
+            # Codifica fora do lock; a gravação parte do manifest vigente
+            texts = [clause_text(clauses[i]) for i in missing]
+            new_embeddings = np.asarray(encode(texts), dtype=np.float32)
+            added = {
+                keys[i]: {
+                    'tokens': tokenize(texts[offset]),
+                    'invalid_patterns': invalid_patterns(clauses[i].get('regex_patterns', []))
+                }
+                for offset, i in enumerate(missing)
+            }
+            catalog_ids = {str(clause.get('id')) for clause in clauses}
+
+            try:
+                with self._lock():
+                    manifest, pool = self._read()
+                    replaced = manifest['embeddings'] if manifest else None
+                    entries, pool, changed = self._merge(manifest, pool, added, new_embeddings,
+                                                         catalog_ids, set(keys))
+                    if changed:
+                        self._write(entries, pool, replaced)
+            except TimeoutError as e:
+                # Segue com o índice em memória, sem gravar
+                logger.warning(f"{e}; índice do catálogo não gravado")
+                entries, pool, _ = self._merge(manifest, pool, added, new_embeddings,
+                                               catalog_ids, set(keys))
+            logger.info(f"Índice do catálogo: {len(missing)} cláusulas codificadas, "
+                        f"{len(keys) - len(missing)} reaproveitadas")
+
+        rows = [entries[key]['row'] for key in keys]
+        if rows and rows == list(range(rows[0], rows[0] + len(rows))):
+            # Catálogo contíguo no arquivo: visão do mmap, sem cópia
+            embeddings = pool[rows[0]:rows[0] + len(rows)]
+        else:
+            embeddings = np.asarray(pool[rows]) if rows else np.zeros((0, 0), dtype=np.float32)
+
+        return IndexedCatalog(
+            embeddings=embeddings,
+            corpus_tokenized=[entries[key]['tokens'] for key in keys],
+            invalid=[entries[key]['invalid_patterns'] for key in keys],
+            stats={'codificadas': len(missing), 'reaproveitadas': len(keys) - len(missing)}
+        )
+
+    def clear(self):
+        """Remove o índice deste modelo"""
+        for path in self.path.iterdir():
+            path.unlink(missing_ok=True)
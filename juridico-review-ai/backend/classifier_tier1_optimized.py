@@ -5,7 +5,7 @@ Classificador Tier-1 OTIMIZADO: Mais rápido e eficiente
 - Cache de resultados
 """
 
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional
 import json
 import ollama
 import logging
@@ -180,21 +180,30 @@ Critérios:
         return result
 
 
-def classify_document_matches_optimized(ranked_matches: List[Dict],
-                                        model: str = 'qwen2:7b-instruct') -> List[Dict]:
+def iter_classify_matches(ranked_matches: Iterable[Dict],
+                          model: str = 'qwen2:7b-instruct',
+                          total: Optional[int] = None) -> Iterator[Dict]:
     """
-    Versão otimizada da classificação
+    Classificação em streaming: um resultado por cláusula, à medida que sai
+
+    Args:
+        ranked_matches: Iterável no formato de ranker_v2.rank_clause_stream
+        model: Modelo Ollama
+        total: Total de cláusulas (só para o log de progresso)
+
+    Yields:
+        {'clause', 'classification', 'all_matches'}
     """
     classifier = Tier1ClassifierOptimized(model)
-    results = []
+    total_label = total if total is not None else '?'
 
-    logger.info(f"Iniciando classificação de {len(ranked_matches)} cláusulas...")
+    logger.info(f"Iniciando classificação de {total_label} cláusulas...")
 
     for i, item in enumerate(ranked_matches, 1):
         clause = item['clause']
         matches = item['matches']
 
-        logger.info(f"[{i}/{len(ranked_matches)}] Classificando: {clause['title'][:60]}...")
+        logger.info(f"[{i}/{total_label}] Classificando: {clause['title'][:60]}...")
 
         if matches:
             best_match = matches[0]
@@ -209,13 +218,13 @@ def classify_document_matches_optimized(ranked_matches: List[Dict],
             classification['match_score'] = best_match['combined_score']
             classification['scores_breakdown'] = best_match.get('scores_breakdown', {})
 
-            results.append({
+            yield {
                 'clause': clause,
                 'classification': classification,
                 'all_matches': matches
-            })
+            }
         else:
-            results.append({
+            yield {
                 'clause': clause,
                 'classification': {
                     'classificacao': 'AUSENTE',
@@ -224,8 +233,14 @@ def classify_document_matches_optimized(ranked_matches: List[Dict],
                     'no_match': True
                 },
                 'all_matches': []
-            })
+            }
 
     logger.info(f"Classificação concluída. Cache hits: {len(classifier.cache)}")
 
-    return results
+
+def classify_document_matches_optimized(ranked_matches: List[Dict],
+                                        model: str = 'qwen2:7b-instruct') -> List[Dict]:
+    """
+    Versão otimizada da classificação
+    """
+    return list(iter_classify_matches(ranked_matches, model, total=len(ranked_matches)))
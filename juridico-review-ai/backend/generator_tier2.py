@@ -3,7 +3,7 @@ Gerador Tier-2: Frontier models para gerar sugestões de cláusulas
 Suporta: Ollama (local), OpenAI, Anthropic (Claude)
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 import json
 import logging
 import os
@@ -315,22 +315,21 @@ Responda apenas o JSON, sem markdown ou texto adicional.
                 raise ValueError("Não foi possível extrair JSON da resposta")
 
 
-def generate_tier2_suggestions(needs_tier2: List[Dict],
-                                provider: str = 'ollama',
-                                model: str = 'qwen2:7b-instruct') -> List[Dict]:
+def iter_tier2_suggestions(needs_tier2: Iterable[Dict],
+                           provider: str = 'ollama',
+                           model: str = 'qwen2:7b-instruct') -> Iterator[Dict]:
     """
-    Gera sugestões Tier-2 para todas as cláusulas que precisam
+    Gera sugestões Tier-2 em streaming, uma por cláusula
 
     Args:
-        needs_tier2: Lista de cláusulas que precisam Tier-2
+        needs_tier2: Iterável de cláusulas que precisam Tier-2
         provider: Provider do LLM
         model: Modelo a usar
 
-    Returns:
-        Lista com sugestões
+    Yields:
+        Resultado de cada cláusula (com sugestão, ou skipped)
     """
     generator = Tier2Generator(provider, model)
-    results = []
 
     for item in needs_tier2:
         clause = item['clause']
@@ -341,13 +340,13 @@ def generate_tier2_suggestions(needs_tier2: List[Dict],
             catalog_clause = all_matches[0]['catalog_clause']
         else:
             # Sem match - skip (já foi marcado como problema)
-            results.append({
+            yield {
                 'clause': clause,
                 'classification': classification,
                 'suggestion': None,
                 'skipped': True,
                 'reason': 'Sem correspondência no catálogo'
-            })
+            }
             continue
 
         logger.info(f"Gerando sugestão Tier-2 para: {clause['title']}")
@@ -358,11 +357,26 @@ def generate_tier2_suggestions(needs_tier2: List[Dict],
             catalog_clause
         )
 
-        results.append({
+        yield {
             'clause': clause,
             'classification': classification,
             'suggestion': suggestion,
             'catalog_clause': catalog_clause
-        })
+        }
+
+
+def generate_tier2_suggestions(needs_tier2: List[Dict],
+                                provider: str = 'ollama',
+                                model: str = 'qwen2:7b-instruct') -> List[Dict]:
+    """
+    Gera sugestões Tier-2 para todas as cláusulas que precisam
+
+    Args:
+        needs_tier2: Lista de cláusulas que precisam Tier-2
+        provider: Provider do LLM
+        model: Modelo a usar
 
-    return results
+    Returns:
+        Lista com sugestões
+    """
+    return list(iter_tier2_suggestions(needs_tier2, provider, model))
@@ -0,0 +1,158 @@
+"""
+Índice de keywords do catálogo (autômato de Aho–Corasick).
+
+O score de keywords fazia um `kw in texto` por keyword, por cláusula do
+catálogo, por cláusula do documento; o laço de matching do app.py repetia as
+mesmas buscas no texto da cláusula e no texto completo. Aqui as keywords de
+todas as cláusulas, normalizadas (sem acentos, minúsculas, espaços
+colapsados), viram um único autômato construído na carga do catálogo:
+
+- goto/fail clássicos, achatados em uma tabela de transições por estado
+  (o fail já resolvido), então a varredura é um dict.get por caractere
+- cada estado guarda as keywords que terminam nele, inclusive pelas
+  ligações de fail (keyword que é sufixo de outra)
+
+Uma passada linear pelo texto devolve as keywords distintas presentes; a
+matriz de incidência keyword -> cláusulas transforma isso na contagem de
+keywords de todas as cláusulas do catálogo de uma vez.
+
+Como texto e keywords são normalizados, "credito" casa com "Crédito" e
+quebras de linha no meio de uma keyword composta não impedem o casamento.
+"""
+
+from collections import deque
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+try:
+    from .utils.text_norm import normalize
+except ImportError:
+    from utils.text_norm import normalize
+
+
+class KeywordIndex:
+    """Keywords de todas as cláusulas do catálogo em um autômato"""
+
+    def __init__(self, keyword_lists: Sequence[Sequence[str]]):
+        """
+        Constrói o autômato
+
+        Args:
+            keyword_lists: keywords de cada cláusula do catálogo, na ordem
+        """
+        self.num_clauses = len(keyword_lists)
+        # Denominador do score: keywords da cláusula como estão no catálogo
+        self.counts = np.array([len(k) for k in keyword_lists], dtype=np.float64)
+
+        unique: Dict[str, int] = {}
+        owners: List[List[int]] = []
+        for c, keywords in enumerate(keyword_lists):
+            for keyword in keywords:
+                key = normalize(str(keyword))
+                if not key:
+                    continue
+                if key not in unique:
+                    unique[key] = len(unique)
+                    owners.append([])
+                owners[unique[key]].append(c)
+
+        self.keywords = list(unique)
+        # Incidência keyword -> cláusulas (keyword repetida conta em cada dona)
+        self.incidence = np.zeros((len(self.keywords), self.num_clauses), dtype=np.float64)
+        for k, clauses in enumerate(owners):
+            for c in clauses:
+                self.incidence[k, c] += 1
+
+        self._build()
+
+    def _build(self):
+        """Trie + ligações de fail, achatadas em transições completas por estado"""
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[int]] = [[]]
+        for k, keyword in enumerate(self.keywords):
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][ch] = nxt
+                state = nxt
+            outputs[state].append(k)
+
+        # BFS: o fail de um estado é sempre mais raso, então já está resolvido
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0) if state else 0
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+                queue.append(nxt)
+            transitions = dict(delta[fail[state]])
+            transitions.update(goto[state])
+            delta[state] = transitions
+
+        self.delta = delta
+        self.outputs = [tuple(out) for out in outputs]
+
+    def matched(self, text: str) -> np.ndarray:
+        """
+        Keywords distintas que ocorrem no texto (uma passada)
+
+        Returns:
+            Vetor booleano (uma posição por keyword distinta)
+        """
+        hits = np.zeros(len(self.keywords), dtype=bool)
+        if not self.keywords or not text:
+            return hits
+
+        found = set()
+        delta, outputs = self.delta, self.outputs
+        state = 0
+        for ch in normalize(text):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        if found:
+            hits[list(found)] = True
+        return hits
+
+    def count_matrix(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Número de keywords de cada cláusula do catálogo presentes em cada texto
+
+        Args:
+            texts: Textos das cláusulas do documento
+
+        Returns:
+            Matriz D×C de contagens
+        """
+        hits = np.zeros((len(texts), len(self.keywords)), dtype=np.float64)
+        for d, text in enumerate(texts):
+            hits[d] = self.matched(text)
+        return hits @ self.incidence
+
+    def hit_counts(self, text: str) -> np.ndarray:
+        """Número de keywords de cada cláusula do catálogo presentes no texto"""
+        return self.count_matrix([text])[0]
+
+    def score_matrix(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Scores de keywords D×C (textos × cláusulas do catálogo)
+
+        Args:
+            texts: Textos das cláusulas do documento
+
+        Returns:
+            Matriz com a proporção de keywords de cada cláusula presentes
+        """
+        counts = self.count_matrix(texts)
+        return np.divide(counts, self.counts, out=np.zeros_like(counts), where=self.counts > 0)
+
+    def scores(self, text: str) -> np.ndarray:
+        """Proporção de keywords de cada cláusula do catálogo presentes no texto (0-1)"""
+        return self.score_matrix([text])[0]
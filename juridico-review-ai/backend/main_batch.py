@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Revisão em lote: processa um diretório (ou glob) de minutas
+
+- Pool de processos: cada worker revisa documentos inteiros
+- Modelos quentes: cada worker carrega o catálogo e o HybridRanker
+  (SentenceTransformer + BM25 + embeddings do catálogo) uma única vez
+- Relatórios por documento em <saida>/<nome>_<extensão>_<hash do caminho>/
+  (minutas de mesmo nome em pastas diferentes não dividem diretório)
+- Resumo do lote (resumo_lote.json) com throughput em docs/min
+- --spill: cláusulas e resultados de cada minuta em SQLite (store.py), com
+  memória limitada para minutas muito grandes
+"""
+
+import click
+import glob
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from parsing import parse_document, iter_document_clauses
+from parsers.cache import ParseCache, DEFAULT_CACHE_DIR
+from ranker_v2 import HybridRanker, rank_clause_stream
+from catalog_index import DEFAULT_INDEX_DIR
+from classifier_tier1_optimized import classify_document_matches_optimized, iter_classify_matches
+from router import ClauseRouter, create_routing_report
+from generator_tier2 import generate_tier2_suggestions, iter_tier2_suggestions
+from store import ReviewStore, STORE_FILENAME
+from report_v2 import generate_comprehensive_reports
+from audit import create_audit_trail
+from utils import load_catalog
+
+logger = logging.getLogger('juridico-review')
+
+SUPPORTED_SUFFIXES = ('.docx', '.pdf')
+
+# Estado de cada processo worker: catálogo e ranker quentes por catálogo
+_CATALOGS: Dict[str, Dict] = {}
+_RANKERS: Dict[str, HybridRanker] = {}
+
+
+def find_documents(entrada: str) -> List[Path]:
+    """
+    Lista as minutas de um diretório ou glob
+
+    Args:
+        entrada: Diretório (busca .docx/.pdf) ou padrão glob
+
+    Returns:
+        Caminhos ordenados
+    """
+    path = Path(entrada)
+    if path.is_dir():
+        files = [f for f in path.iterdir() if f.suffix.lower() in SUPPORTED_SUFFIXES]
+    else:
+        files = [Path(f) for f in glob.glob(entrada, recursive=True)]
+        files = [f for f in files if f.suffix.lower() in SUPPORTED_SUFFIXES]
+    return sorted(files)
+
+
+def document_output_dir(output_dir: str, minuta: str) -> Path:
+    """
+    Diretório de saída exclusivo de uma minuta
+
+    Nome, extensão e um hash curto do caminho absoluto: "a/minuta.pdf",
+    "b/minuta.pdf" e "a/minuta.docx" não compartilham relatórios nem o
+    banco do --spill entre workers.
+
+    Args:
+        output_dir: Diretório de saída do lote
+        minuta: Caminho da minuta
+
+    Returns:
+        <output_dir>/<nome>_<extensão>_<hash>
+    """
+    path = Path(minuta)
+    digest = hashlib.sha1(str(path.resolve()).encode('utf-8')).hexdigest()[:8]
+    suffix = path.suffix.lstrip('.').lower()
+    return Path(output_dir) / f"{path.stem}_{suffix}_{digest}"
+
+
+def get_catalog(catalog_path: str) -> Dict:
+    """Catálogo carregado uma vez por processo"""
+    key = os.path.abspath(catalog_path)
+    if key not in _CATALOGS:
+        _CATALOGS[key] = load_catalog(catalog_path)
+    return _CATALOGS[key]
+
+
+def get_ranker(catalog_path: str, index_dir: Optional[str] = None) -> HybridRanker:
+    """
+    HybridRanker com o catálogo já codificado, criado uma vez por processo e catálogo
+
+    Com index_dir, os workers carregam os embeddings do índice persistente
+    (mmap) em vez de recodificar o catálogo.
+    """
+    key = os.path.abspath(catalog_path)
+    if key not in _RANKERS:
+        t0 = time.time()
+        ranker = HybridRanker(index_dir=index_dir)
+        ranker.encode_catalog(get_catalog(catalog_path))
+        _RANKERS[key] = ranker
+        logger.info(f"[pid {os.getpid()}] Ranker carregado para {Path(catalog_path).name} "
+                    f"em {time.time() - t0:.1f}s")
+    return _RANKERS[key]
+
+
+def _init_worker(verbose: bool):
+    """Inicializa logging no processo worker"""
+    logging.basicConfig(
+        level=logging.DEBUG if verbose else logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+
+
+def _review_in_memory(minuta: str, catalog_path: str, output_path: Path, options: Dict, audit) -> Dict:
+    """Etapas do main_v3 com o documento e os resultados em memória"""
+    catalog = get_catalog(catalog_path)
+    audit.log_catalog_info(catalog, catalog_path)
+
+    # Parsing
+    t0 = time.time()
+    cache = ParseCache(options['cache_dir']) if options.get('cache_dir') else None
+    document = parse_document(minuta, cache=cache, pdf_backend=options['pdf_backend'])
+    audit.log_document_info(minuta, file_hash=document.metadata.get('sha256'))
+    audit.log_parsing(len(document.clauses), time.time() - t0)
+
+    # Ranking com o ranker quente do processo
+    t0 = time.time()
+    ranker = get_ranker(catalog_path, options.get('index_dir'))
+    ranked_matches = list(rank_clause_stream(document.clauses, ranker,
+                                             top_k=options['top_k'], lambda_param=0.7,
+                                             candidates=options.get('candidates')))
+    audit.log_ranking(len(ranked_matches), time.time() - t0)
+
+    # Tier-1
+    t0 = time.time()
+    classifications = classify_document_matches_optimized(ranked_matches, model=options['tier1_model'])
+    summary = {
+        status.lower(): sum(1 for c in classifications
+                            if c['classification'].get('classificacao') == status)
+        for status in ('PRESENTE', 'PARCIAL', 'AUSENTE')
+    }
+    audit.log_tier1_classification(len(classifications), options['tier1_model'],
+                                   time.time() - t0, summary)
+
+    # Roteamento
+    router = ClauseRouter(tier2_threshold=0.7)
+    routing_result = router.route_classifications(classifications)
+    audit.log_routing(create_routing_report(routing_result))
+
+    # Tier-2
+    tier2_suggestions = []
+    if not options['skip_tier2'] and routing_result['needs_tier2']:
+        t0 = time.time()
+        tier2_suggestions = generate_tier2_suggestions(
+            routing_result['needs_tier2'],
+            provider=options['tier2_provider'],
+            model=options['tier2_model']
+        )
+        audit.log_tier2_generation(len(tier2_suggestions), options['tier2_provider'],
+                                   options['tier2_model'], time.time() - t0)
+
+    # Relatórios
+    excel_path, docx_path = generate_comprehensive_reports(
+        tier1_results=routing_result['tier1_only'],
+        tier2_results=tier2_suggestions,
+        document_info=document,
+        catalog_info=catalog,
+        output_path=output_path,
+        audit_trail=audit
+    )
+
+    return {
+        'status': 'OK',
+        'clausulas': len(document.clauses),
+        'clausulas_antes_consolidacao': document.metadata.get('consolidation', {}).get(
+            'clausulas_antes', len(document.clauses)),
+        **summary,
+        'tier2': len(tier2_suggestions),
+        'excel': str(excel_path),
+        'docx': str(docx_path)
+    }
+
+
+def _review_spilled(minuta: str, catalog_path: str, output_path: Path, options: Dict, audit) -> Dict:
+    """
+    Mesmas etapas com cláusulas e resultados no ReviewStore (SQLite)
+
+    Cada etapa lê a anterior por cursor e grava em lotes; os relatórios
+    leem o banco. Não usa o cache de parsing (o próprio banco guarda as
+    cláusulas) nem o registro de roteamento por cláusula na auditoria.
+    """
+    catalog = get_catalog(catalog_path)
+    audit.log_catalog_info(catalog, catalog_path)
+
+    store_path = output_path / STORE_FILENAME
+    if store_path.exists():
+        store_path.unlink()
+
+    with ReviewStore(store_path, catalog) as store:
+        # Parsing em streaming direto para o banco
+        t0 = time.time()
+        stats = {}
+        num_clauses = store.add_clauses(iter_document_clauses(
+            minuta, pdf_backend=options['pdf_backend'], stats=stats))
+        audit.log_document_info(minuta)
+        audit.log_parsing(num_clauses, time.time() - t0)
+
+        # Ranking
+        t0 = time.time()
+        ranker = get_ranker(catalog_path, options.get('index_dir'))
+        num_ranked = store.add_ranked(rank_clause_stream(store.clauses(), ranker,
+                                                         top_k=options['top_k'], lambda_param=0.7,
+                                                         candidates=options.get('candidates')))
+        audit.log_ranking(num_ranked, time.time() - t0)
+
+        # Tier-1 + roteamento
+        t0 = time.time()
+        router = ClauseRouter(tier2_threshold=0.7)
+        num_classified = store.add_classifications(
+            iter_classify_matches(store.ranked(), model=options['tier1_model'], total=num_ranked),
+            router=router
+        )
+        summary = store.status_counts()
+        audit.log_tier1_classification(num_classified, options['tier1_model'],
+                                       time.time() - t0, summary)
+
+        # Tier-2
+        num_tier2 = 0
+        needs_tier2 = store.results(tier2=True)
+        if not options['skip_tier2'] and needs_tier2:
+            t0 = time.time()
+            num_tier2 = store.add_suggestions(iter_tier2_suggestions(
+                needs_tier2,
+                provider=options['tier2_provider'],
+                model=options['tier2_model']
+            ))
+            audit.log_tier2_generation(num_tier2, options['tier2_provider'],
+                                       options['tier2_model'], time.time() - t0)
+
+        # Relatórios lidos do banco
+        excel_path, docx_path = generate_comprehensive_reports(
+            tier1_results=store.results(tier2=False),
+            tier2_results=store.suggestions(),
+            document_info=store.document(Path(minuta).name, stats),
+            catalog_info=catalog,
+            output_path=output_path,
+            audit_trail=audit
+        )
+
+    return {
+        'status': 'OK',
+        'clausulas': num_clauses,
+        'clausulas_antes_consolidacao': stats.get('consolidation', {}).get('clausulas_antes', num_clauses),
+        **summary,
+        'tier2': num_tier2,
+        'excel': str(excel_path),
+        'docx': str(docx_path),
+        'banco': str(store_path)
+    }
+
+
+def review_document(minuta: str, catalog_path: str, output_dir: str, options: Dict) -> Dict:
+    """
+    Revisa uma minuta (mesmas etapas do main_v3) e grava seus relatórios
+
+    Args:
+        minuta: Caminho da minuta
+        catalog_path: Caminho do catálogo YAML
+        output_dir: Diretório de saída do lote
+        options: top_k, candidates, tier1_model, tier2_provider, tier2_model, skip_tier2,
+            cache_dir, pdf_backend, spill
+
+    Returns:
+        Linha do resumo do lote
+    """
+    t_start = time.time()
+    output_path = document_output_dir(output_dir, minuta)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    audit = create_audit_trail(output_path)
+    row = {'documento': Path(minuta).name, 'minuta': str(minuta), 'saida': str(output_path)}
+
+    try:
+        review = _review_spilled if options.get('spill') else _review_in_memory
+        row.update(review(minuta, catalog_path, output_path, options, audit))
+
+    except Exception as e:
+        logger.exception(f"Erro ao revisar {minuta}")
+        audit.log_event('ERROR', {'message': str(e)})
+        row.update({'status': 'ERRO', 'erro': str(e)})
+
+    audit.finalize()
+    row['tempo_segundos'] = round(time.time() - t_start, 2)
+    row['pid'] = os.getpid()
+    return row
+
+
+@click.command()
+@click.option('--entrada', '-e', required=True,
+              help='Diretório com minutas (.docx/.pdf) ou padrão glob')
+@click.option('--catalogo', '-c',
+              default='data/catalogos/catalogo_cri_v3.yaml',
+              type=click.Path(exists=True),
+              help='Catálogo YAML (default: v3)')
+@click.option('--output-dir', '-o', default='data/saida/lote',
+              help='Diretório de saída do lote')
+@click.option('--workers', '-w', default=1, type=int,
+              help='Processos em paralelo (cada um carrega seu próprio ranker)')
+@click.option('--tier1-model', default='qwen2:7b-instruct',
+              help='Modelo Ollama para Tier-1')
+@click.option('--tier2-provider', default='ollama',
+              type=click.Choice(['ollama', 'openai', 'anthropic', 'gemini']),
+              help='Provider para Tier-2')
+@click.option('--tier2-model', default='qwen2:7b-instruct',
+              help='Modelo para Tier-2')
+@click.option('--top-k', default=3, type=int,
+              help='Top-K matches')
+@click.option('--candidates', default=None, type=click.IntRange(min=1),
+              help='Ranking em dois estágios: candidatas lexicais (BM25 + keywords) por cláusula')
+@click.option('--skip-tier2', is_flag=True,
+              help='Pula Tier-2 (apenas classifica)')
+@click.option('--cache-dir', default=DEFAULT_CACHE_DIR,
+              help='Diretório do cache de parsing')
+@click.option('--no-cache', is_flag=True,
+              help='Desativa o cache de parsing e o índice persistente do catálogo')
+@click.option('--pdf-backend', default='pdfplumber',
+              type=click.Choice(['pdfplumber', 'pymupdf']),
+              help='Backend de extração de PDF')
+@click.option('--spill', is_flag=True,
+              help='Guarda cláusulas e resultados em SQLite (memória limitada p/ minutas muito grandes)')
+@click.option('--verbose', '-v', is_flag=True,
+              help='Modo verbose')
+def main(entrada, catalogo, output_dir, workers, tier1_model, tier2_provider, tier2_model,
+         top_k, candidates, skip_tier2, cache_dir, no_cache, pdf_backend, spill, verbose):
+    """
+    Revisão em lote de minutas (diretório ou glob)
+    """
+    _init_worker(verbose)
+
+    files = find_documents(entrada)
+    if not files:
+        print(f"❌ Nenhuma minuta encontrada em: {entrada}")
+        sys.exit(1)
+
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    options = {
+        'top_k': top_k,
+        'candidates': candidates,
+        'tier1_model': tier1_model,
+        'tier2_provider': tier2_provider,
+        'tier2_model': tier2_model,
+        'skip_tier2': skip_tier2,
+        'cache_dir': None if no_cache else cache_dir,
+        'index_dir': None if no_cache else DEFAULT_INDEX_DIR,
+        'pdf_backend': pdf_backend,
+        'spill': spill
+    }
+
+    workers = max(1, min(workers, len(files)))
+
+    print("\n" + "=" * 70)
+    print("  REVISÃO EM LOTE DE MINUTAS")
+    print("=" * 70)
+    print(f"  Documentos: {len(files)}")
+    print(f"  Catálogo: {Path(catalogo).name}")
+    print(f"  Workers: {workers}")
+    print("=" * 70 + "\n")
+
+    start = time.time()
+    rows = []
+
+    if workers == 1:
+        for i, f in enumerate(files, 1):
+            row = review_document(str(f), catalogo, output_dir, options)
+            rows.append(row)
+            print(f"  [{i}/{len(files)}] {row['status']:4} {row['documento']} -> {Path(row['saida']).name} ({row['tempo_segundos']:.1f}s)")
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(verbose,)) as pool:
+            futures = [pool.submit(review_document, str(f), catalogo, output_dir, options)
+                       for f in files]
+            for i, future in enumerate(as_completed(futures), 1):
+                row = future.result()
+                rows.append(row)
+                print(f"  [{i}/{len(files)}] {row['status']:4} {row['documento']} -> {Path(row['saida']).name} ({row['tempo_segundos']:.1f}s)")
+
+    elapsed = time.time() - start
+    ok = [r for r in rows if r['status'] == 'OK']
+    docs_per_min = len(ok) / (elapsed / 60) if elapsed > 0 else 0.0
+
+    rows.sort(key=lambda r: (r['documento'], r['minuta']))
+    summary = {
+        'timestamp': datetime.now().isoformat(),
+        'catalogo': Path(catalogo).name,
+        'workers': workers,
+        'documentos': len(rows),
+        'sucesso': len(ok),
+        'erros': len(rows) - len(ok),
+        'tempo_total_segundos': round(elapsed, 2),
+        'docs_por_minuto': round(docs_per_min, 2),
+        'resultados': rows
+    }
+
+    summary_file = output_path / 'resumo_lote.json'
+    with open(summary_file, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+
+    print("\n" + "=" * 70)
+    print(f"  ✅ LOTE CONCLUÍDO: {len(ok)}/{len(rows)} documentos")
+    print("=" * 70)
+    print(f"     • Tempo total: {elapsed:.1f}s ({elapsed/60:.1f}min)")
+    print(f"     • Throughput: {docs_per_min:.2f} docs/min")
+    print(f"     • Resumo: {summary_file}")
+    print("=" * 70 + "\n")
+
+    sys.exit(0 if len(ok) == len(rows) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -12,6 +12,7 @@ import logging
 
 # Importações dos módulos
 from parsing import parse_document
+from parsers.cache import ParseCache, DEFAULT_CACHE_DIR
 from ranker_v2 import rank_document_clauses
 from classifier_tier1 import classify_document_matches
 from router import ClauseRouter, create_routing_report
@@ -39,10 +40,19 @@ from utils import load_catalog, setup_logging
               help='Top-K matches por cláusula')
 @click.option('--skip-tier2', is_flag=True,
               help='Pula Tier-2 (apenas classifica)')
+@click.option('--cache-dir', default=DEFAULT_CACHE_DIR,
+              help='Diretório do cache de parsing')
+@click.option('--no-cache', is_flag=True,
+              help='Desativa o cache de parsing')
+@click.option('--pdf-workers', default=1, type=int,
+              help='Processos para extração paralela de páginas do PDF')
+@click.option('--pdf-backend', default='pdfplumber',
+              type=click.Choice(['pdfplumber', 'pymupdf']),
+              help='Backend de extração de PDF')
 @click.option('--verbose', '-v', is_flag=True,
               help='Modo verbose')
 def main(minuta, catalogo, output_dir, tier1_model, tier2_provider,
-         tier2_model, top_k, skip_tier2, verbose):
+         tier2_model, top_k, skip_tier2, cache_dir, no_cache, pdf_workers, pdf_backend, verbose):
     """
     Sistema de Revisão Automatizada de Minutas v2.0
 
@@ -87,13 +97,17 @@ def main(minuta, catalogo, output_dir, tier1_model, tier2_provider,
         logger.info("📄 ETAPA 2: Parseando documento...")
         start_time = time.time()
 
-        document = parse_document(minuta)
-        audit.log_document_info(minuta)
+        parse_cache = None if no_cache else ParseCache(cache_dir)
+        document = parse_document(minuta, cache=parse_cache, workers=pdf_workers,
+                                  pdf_backend=pdf_backend)
+        audit.log_document_info(minuta, file_hash=document.metadata.get('sha256'))
 
         parsing_time = time.time() - start_time
         audit.log_parsing(len(document.clauses), parsing_time)
 
         logger.info(f"  ✓ Cláusulas encontradas: {len(document.clauses)}")
+        if document.from_cache:
+            logger.info("  ✓ Recuperado do cache de parsing")
         logger.info(f"  ✓ Tempo: {parsing_time:.2f}s")
         logger.info("")
 
@@ -5,6 +5,8 @@ Pipeline v3: OTIMIZADO para performance
 - Classificador otimizado (prompts menores)
 - Cache de embeddings
 - Logging melhorado
+- --spill: cláusulas e resultados em SQLite (store.py), com memória limitada
+  para minutas muito grandes
 """
 
 import click
@@ -13,16 +15,132 @@ from pathlib import Path
 import time
 import logging
 
-from parsing import parse_document
-from ranker_v2 import rank_document_clauses
-from classifier_tier1_optimized import classify_document_matches_optimized
+from parsing import parse_document, iter_document_clauses
+from parsers.cache import ParseCache, DEFAULT_CACHE_DIR
+from ranker_v2 import HybridRanker, rank_document_clauses, rank_clause_stream
+from catalog_index import DEFAULT_INDEX_DIR
+from classifier_tier1_optimized import classify_document_matches_optimized, iter_classify_matches
 from router import ClauseRouter, create_routing_report
-from generator_tier2 import generate_tier2_suggestions
+from generator_tier2 import generate_tier2_suggestions, iter_tier2_suggestions
+from store import ReviewStore, STORE_FILENAME
 from report_v2 import generate_comprehensive_reports
 from audit import create_audit_trail
+from revision import load_review_state, plan_revision, merge_results, save_review_state, split_tier2
 from utils import load_catalog, setup_logging
 
 
+def review_spilled(minuta, catalog, output_path: Path, audit, options: dict) -> dict:
+    """
+    Etapas 2-7 com cláusulas e resultados no ReviewStore (SQLite)
+
+    Cada etapa lê a anterior por cursor e grava em lotes; os relatórios
+    leem o banco. Não usa o cache de parsing (o próprio banco guarda as
+    cláusulas), a extração paralela de páginas nem a revisão incremental.
+
+    Args:
+        minuta: Caminho da minuta
+        catalog: Catálogo carregado
+        output_path: Diretório de saída (recebe o banco e os relatórios)
+        audit: Trilha de auditoria
+        options: tier1_model, tier2_provider, tier2_model, top_k, candidates,
+            skip_tier2, pdf_backend, index_dir
+
+    Returns:
+        Sumário (total, presente, parcial, ausente)
+    """
+    store_path = output_path / STORE_FILENAME
+    if store_path.exists():
+        store_path.unlink()
+
+    with ReviewStore(store_path, catalog) as store:
+        print("📄 [2/7] Parseando documento (streaming para o banco)...")
+        t0 = time.time()
+        stats = {}
+        num_clauses = store.add_clauses(iter_document_clauses(
+            minuta, pdf_backend=options['pdf_backend'], stats=stats))
+        audit.log_document_info(minuta)
+        audit.log_parsing(num_clauses, time.time() - t0)
+        print(f"    ✓ {num_clauses} cláusulas gravadas em {store_path.name}")
+        print(f"    ✓ Tempo: {time.time() - t0:.1f}s\n")
+
+        print("🔍 [3/7] Ranking híbrido (BM25 + Embeddings + Regex + MMR)...")
+        t0 = time.time()
+        ranker = HybridRanker(index_dir=options['index_dir'])
+        ranker.encode_catalog(catalog)
+        num_ranked = store.add_ranked(rank_clause_stream(store.clauses(), ranker,
+                                                         top_k=options['top_k'], lambda_param=0.7,
+                                                         candidates=options['candidates']))
+        audit.log_ranking(num_ranked, time.time() - t0)
+        print(f"    ✓ {num_ranked} cláusulas rankeadas")
+        print(f"    ✓ Tempo: {time.time() - t0:.1f}s\n")
+
+        print(f"🤖 [4/7] Classificação Tier-1 OTIMIZADA ({options['tier1_model']}) + roteamento [5/7]...")
+        t0 = time.time()
+        router = ClauseRouter(tier2_threshold=0.7)
+        num_classified = store.add_classifications(
+            iter_classify_matches(store.ranked(), model=options['tier1_model'], total=num_ranked),
+            router=router
+        )
+        summary = store.status_counts()
+        audit.log_tier1_classification(num_classified, options['tier1_model'], time.time() - t0, summary)
+        needs_tier2 = store.results(tier2=True)
+        print(f"    ✓ PRESENTE: {summary['presente']} | PARCIAL: {summary['parcial']} | "
+              f"AUSENTE: {summary['ausente']}")
+        print(f"    ✓ Encaminhadas para Tier-2: {len(needs_tier2)}\n")
+
+        if not options['skip_tier2'] and needs_tier2:
+            print(f"🚀 [6/7] Geração Tier-2 ({options['tier2_provider']}/{options['tier2_model']})...")
+            t0 = time.time()
+            num_tier2 = store.add_suggestions(iter_tier2_suggestions(
+                needs_tier2,
+                provider=options['tier2_provider'],
+                model=options['tier2_model']
+            ))
+            audit.log_tier2_generation(num_tier2, options['tier2_provider'],
+                                       options['tier2_model'], time.time() - t0)
+            print(f"    ✓ {num_tier2} sugestões geradas\n")
+        elif options['skip_tier2']:
+            print("⏭  [6/7] Tier-2 pulado (--skip-tier2)\n")
+        else:
+            print("✓ [6/7] Tier-2 não necessário (todas OK)\n")
+
+        print("📊 [7/7] Gerando relatórios (lidos do banco)...")
+        excel_path, docx_path = generate_comprehensive_reports(
+            tier1_results=store.results(tier2=False),
+            tier2_results=store.suggestions(),
+            document_info=store.document(Path(minuta).name, stats),
+            catalog_info=catalog,
+            output_path=output_path,
+            audit_trail=audit
+        )
+        print(f"    ✓ {excel_path}")
+        print(f"    ✓ {docx_path}\n")
+
+    return {'total': num_classified, **summary}
+
+
+def print_final_summary(summary: dict, output_path: Path, audit_file: Path, t_total: float):
+    """Resumo final da revisão no terminal"""
+    total = summary['total']
+    print("=" * 70)
+    print("  ✅ REVISÃO CONCLUÍDA COM SUCESSO!")
+    print("=" * 70)
+    print(f"\n  📊 RESUMO:")
+    print(f"     • Total de cláusulas: {total}")
+    print(f"     • PRESENTE: {summary['presente']} | PARCIAL: {summary['parcial']} | AUSENTE: {summary['ausente']}")
+    print(f"     • Tempo total: {t_total:.1f}s ({t_total/60:.1f}min)")
+    if total:
+        print(f"     • Performance: ~{t_total/total:.1f}s por cláusula")
+    print(f"\n  📁 Arquivos gerados:")
+    print(f"     • Excel: {output_path / 'revisao_completa.xlsx'}")
+    print(f"     • DOCX: {output_path / 'sugestoes_detalhadas.docx'}")
+    if summary.get('banco'):
+        print(f"     • Banco: {summary['banco']}")
+    print(f"     • Auditoria: {audit_file.name}")
+    print(f"\n  📂 Diretório: {output_path.absolute()}")
+    print("=" * 70 + "\n")
+
+
 @click.command()
 @click.option('--minuta', '-m', required=True, type=click.Path(exists=True),
               help='Caminho para a minuta (.docx ou .pdf)')
@@ -41,12 +159,28 @@ from utils import load_catalog, setup_logging
               help='Modelo para Tier-2')
 @click.option('--top-k', default=3, type=int,
               help='Top-K matches')
+@click.option('--candidates', default=None, type=click.IntRange(min=1),
+              help='Ranking em dois estágios: candidatas lexicais (BM25 + keywords) por cláusula')
 @click.option('--skip-tier2', is_flag=True,
               help='Pula Tier-2 (apenas classifica)')
+@click.option('--cache-dir', default=DEFAULT_CACHE_DIR,
+              help='Diretório do cache de parsing')
+@click.option('--no-cache', is_flag=True,
+              help='Desativa o cache de parsing e o índice persistente do catálogo')
+@click.option('--pdf-workers', default=1, type=int,
+              help='Processos para extração paralela de páginas do PDF')
+@click.option('--pdf-backend', default='pdfplumber',
+              type=click.Choice(['pdfplumber', 'pymupdf']),
+              help='Backend de extração de PDF')
+@click.option('--previous', type=click.Path(exists=True), default=None,
+              help='Saída/estado da revisão anterior (reprocessa só cláusulas alteradas)')
+@click.option('--spill', is_flag=True,
+              help='Cláusulas e resultados em SQLite: memória limitada para minutas muito grandes')
 @click.option('--verbose', '-v', is_flag=True,
               help='Modo verbose')
 def main(minuta, catalogo, output_dir, tier1_model, tier2_provider,
-         tier2_model, top_k, skip_tier2, verbose):
+         tier2_model, top_k, candidates, skip_tier2, cache_dir, no_cache, pdf_workers, pdf_backend, previous,
+         spill, verbose):
     """
     Sistema de Revisão de Minutas v3.0 - OTIMIZADO
 
@@ -57,6 +191,9 @@ def main(minuta, catalogo, output_dir, tier1_model, tier2_provider,
     ✓ Cache inteligente
     """
 
+    if spill and previous:
+        raise click.UsageError("--spill não suporta --previous (revisão incremental)")
+
     # Setup
     logger = setup_logging(verbose)
     output_path = Path(output_dir)
@@ -86,21 +223,66 @@ def main(minuta, catalogo, output_dir, tier1_model, tier2_provider,
         print(f"    ✓ {catalog.get('metadata', {}).get('nome')} v{catalog.get('metadata', {}).get('versao')}")
         print(f"    ✓ {num_clausulas_cat} cláusulas de referência\n")
 
+        if spill:
+            summary = review_spilled(minuta, catalog, output_path, audit, {
+                'tier1_model': tier1_model, 'tier2_provider': tier2_provider, 'tier2_model': tier2_model,
+                'top_k': top_k, 'candidates': candidates, 'skip_tier2': skip_tier2,
+                'pdf_backend': pdf_backend, 'index_dir': None if no_cache else DEFAULT_INDEX_DIR
+            })
+            summary['banco'] = str(output_path / STORE_FILENAME)
+            print_final_summary(summary, output_path, audit.finalize(), time.time() - start_total)
+            sys.exit(0)
+
         # ==========================================
         # ETAPA 2: PARSING
         # ==========================================
         print("📄 [2/7] Parseando documento...")
         t0 = time.time()
 
-        document = parse_document(minuta)
-        audit.log_document_info(minuta)
+        parse_cache = None if no_cache else ParseCache(cache_dir)
+        document = parse_document(minuta, cache=parse_cache, workers=pdf_workers,
+                                  pdf_backend=pdf_backend)
+        audit.log_document_info(minuta, file_hash=document.metadata.get('sha256'))
 
         t_parse = time.time() - t0
         audit.log_parsing(len(document.clauses), t_parse)
 
         print(f"    ✓ {len(document.clauses)} cláusulas encontradas")
+        if document.from_cache:
+            print("    ✓ Recuperado do cache de parsing")
+        layout_cleaning = document.metadata.get('layout_cleaning')
+        if layout_cleaning:
+            audit.log_event('LAYOUT_CLEANING', layout_cleaning)
+            print(f"    ✓ Cabeçalhos/rodapés removidos: {layout_cleaning['linhas_removidas']} linhas, "
+                  f"{layout_cleaning['caracteres_removidos']} caracteres, "
+                  f"{layout_cleaning['tokens_removidos']} tokens")
+        consolidation = document.metadata.get('consolidation')
+        if consolidation:
+            audit.log_event('CONSOLIDATION', consolidation)
+            print(f"    ✓ Fragmentos mesclados: {consolidation['clausulas_antes']} → "
+                  f"{consolidation['clausulas_depois']} cláusulas")
         print(f"    ✓ Tempo: {t_parse:.1f}s\n")
 
+        # Revisão incremental: só cláusulas alteradas/novas seguem adiante
+        settings = {
+            'catalog_hash': audit.metadata['catalogo']['hash_arquivo'],
+            'tier1_model': tier1_model,
+            'top_k': top_k,
+            'candidates': candidates,
+            'tier2_provider': tier2_provider,
+            'tier2_model': tier2_model
+        }
+        state = load_review_state(previous) if previous else None
+        revision = plan_revision(state, document, catalog, settings)
+
+        if previous:
+            audit.log_revision(previous, revision['diff'])
+            diff = revision['diff']
+            print(f"    ✓ Revisão incremental: {diff['inalteradas']} inalteradas, "
+                  f"{diff['alteradas']} alteradas, {diff['novas']} novas, "
+                  f"{diff['removidas']} removidas, {diff['reavaliadas']} reavaliadas "
+                  f"(match fora do catálogo)\n")
+
         # ==========================================
         # ETAPA 3: RANKING HÍBRIDO
         # ==========================================
@@ -111,8 +293,11 @@ def main(minuta, catalogo, output_dir, tier1_model, tier2_provider,
             document,
             catalog,
             top_k=top_k,
-            lambda_param=0.7
-        )
+            lambda_param=0.7,
+            clauses=revision['to_review'],
+            index_dir=None if no_cache else DEFAULT_INDEX_DIR,
+            candidates=candidates
+        ) if revision['to_review'] else []
 
         t_rank = time.time() - t0
         audit.log_ranking(len(ranked_matches), t_rank)
@@ -127,10 +312,11 @@ def main(minuta, catalogo, output_dir, tier1_model, tier2_provider,
         print(f"    Processando {len(ranked_matches)} cláusulas...")
         t0 = time.time()
 
-        classifications = classify_document_matches_optimized(
+        reviewed = classify_document_matches_optimized(
             ranked_matches,
             model=tier1_model
-        )
+        ) if ranked_matches else []
+        classifications = merge_results(revision['carried'], reviewed)
 
         t_tier1 = time.time() - t0
 
@@ -149,8 +335,11 @@ def main(minuta, catalogo, output_dir, tier1_model, tier2_provider,
         print(f"      • PRESENTE: {presente}")
         print(f"      • PARCIAL: {parcial}")
         print(f"      • AUSENTE: {ausente}")
-        print(f"    ✓ Tempo: {t_tier1:.1f}s ({t_tier1/len(classifications):.1f}s/cláusula)")
-        print(f"    ✓ Performance: {(1827.48/t_tier1):.1f}x mais rápido que v2\n")
+        if reviewed:
+            print(f"    ✓ Tempo: {t_tier1:.1f}s ({t_tier1/len(reviewed):.1f}s/cláusula)")
+            print(f"    ✓ Performance: {(1827.48/t_tier1):.1f}x mais rápido que v2\n")
+        if revision['carried']:
+            print(f"    ✓ {len(revision['carried'])} vereditos reaproveitados da revisão anterior\n")
 
         # ==========================================
         # ETAPA 5: ROTEAMENTO
@@ -167,18 +356,23 @@ def main(minuta, catalogo, output_dir, tier1_model, tier2_provider,
         # ==========================================
         # ETAPA 6: TIER-2 (se necessário)
         # ==========================================
-        tier2_suggestions = []
+        # Sugestões Tier-2 de cláusulas inalteradas vêm da revisão anterior e
+        # entram no relatório e no estado mesmo com --skip-tier2
+        tier2_reused, tier2_pending = split_tier2(routing_result['needs_tier2'], revision['carried_tier2'])
+        tier2_suggestions = tier2_reused
 
         if not skip_tier2 and routing_result['needs_tier2']:
             print(f"🚀 [6/7] Geração Tier-2 ({tier2_provider}/{tier2_model})...")
-            print(f"    Processando {len(routing_result['needs_tier2'])} cláusulas...")
+            print(f"    Processando {len(tier2_pending)} cláusulas...")
+            if tier2_reused:
+                print(f"    ✓ {len(tier2_reused)} sugestões reaproveitadas da revisão anterior")
             t0 = time.time()
 
-            tier2_suggestions = generate_tier2_suggestions(
-                routing_result['needs_tier2'],
+            tier2_suggestions = merge_results(tier2_reused, generate_tier2_suggestions(
+                tier2_pending,
                 provider=tier2_provider,
                 model=tier2_model
-            )
+            ) if tier2_pending else [])
 
             t_tier2 = time.time() - t0
             audit.log_tier2_generation(len(tier2_suggestions), tier2_provider, tier2_model, t_tier2)
@@ -186,7 +380,10 @@ def main(minuta, catalogo, output_dir, tier1_model, tier2_provider,
             print(f"    ✓ {len(tier2_suggestions)} sugestões geradas")
             print(f"    ✓ Tempo: {t_tier2:.1f}s\n")
         elif skip_tier2:
-            print("⏭  [6/7] Tier-2 pulado (--skip-tier2)\n")
+            print("⏭  [6/7] Tier-2 pulado (--skip-tier2)")
+            if tier2_reused:
+                print(f"    ✓ {len(tier2_reused)} sugestões reaproveitadas da revisão anterior")
+            print()
         else:
             print("✓ [6/7] Tier-2 não necessário (todas OK)\n")
 
@@ -207,27 +404,17 @@ def main(minuta, catalogo, output_dir, tier1_model, tier2_provider,
         print(f"    ✓ {excel_path}")
         print(f"    ✓ {docx_path}\n")
 
+        state_file = save_review_state(output_path, document, classifications,
+                                       tier2_suggestions, settings)
+        audit.log_review_state(state_file)
+
         # ==========================================
         # FINALIZAÇÃO
         # ==========================================
         audit_file = audit.finalize()
 
-        t_total = time.time() - start_total
-
-        print("=" * 70)
-        print("  ✅ REVISÃO CONCLUÍDA COM SUCESSO!")
-        print("=" * 70)
-        print(f"\n  📊 RESUMO:")
-        print(f"     • Total de cláusulas: {len(classifications)}")
-        print(f"     • PRESENTE: {presente} | PARCIAL: {parcial} | AUSENTE: {ausente}")
-        print(f"     • Tempo total: {t_total:.1f}s ({t_total/60:.1f}min)")
-        print(f"     • Performance: ~{t_total/len(classifications):.1f}s por cláusula")
-        print(f"\n  📁 Arquivos gerados:")
-        print(f"     • Excel: {output_path / 'revisao_completa.xlsx'}")
-        print(f"     • DOCX: {output_path / 'sugestoes_detalhadas.docx'}")
-        print(f"     • Auditoria: {audit_file.name}")
-        print(f"\n  📂 Diretório: {output_path.absolute()}")
-        print("=" * 70 + "\n")
+        print_final_summary({'total': len(classifications), **summary}, output_path, audit_file,
+                            time.time() - start_total)
 
         sys.exit(0)
 
@@ -0,0 +1,172 @@
+"""
+Fuzzy matching em lote (rapidfuzz.process.cdist).
+
+O ClauseRanker chamava fuzz.token_sort_ratio em uma list comprehension por
+cláusula do documento, e o laço de matching do app.py chamava
+fuzz.partial_ratio e, para o bônus de palavras do título, fuzz.ratio para
+cada par de palavras, dentro do laço catálogo × documento. Aqui:
+
+- os textos são normalizados uma vez (utils.text_norm.normalize: sem
+  acentos, minúsculas, espaços colapsados)
+- as matrizes de similaridade saem de uma chamada a process.cdist, em C++
+  e com várias threads (workers=-1 usa todos os núcleos)
+- o bônus de palavras do título compara os vocabulários (palavras
+  importantes dos títulos do catálogo × palavras dos títulos do documento)
+  uma vez, e o bônus de cada par de títulos vira produto de matrizes
+
+Com a matriz C×D de scores pronta, assign_clauses atribui cláusulas do
+catálogo a cláusulas do documento de forma globalmente ótima
+(scipy.optimize.linear_sum_assignment), em vez de cada cláusula do catálogo
+escolher sozinha o melhor par.
+"""
+
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+from scipy.optimize import linear_sum_assignment
+
+try:
+    from .utils.text_norm import normalize
+except ImportError:
+    from utils.text_norm import normalize
+
+# Palavras do título do catálogo com mais de MIN_WORD_LENGTH letras contam no bônus
+MIN_WORD_LENGTH = 3
+EXACT_WORD_BONUS = 10
+SIMILAR_WORD_BONUS = 5
+SIMILAR_WORD_THRESHOLD = 80
+
+
+def prepare(texts: Sequence[str]) -> List[str]:
+    """Textos normalizados para o matching (uma vez por texto)"""
+    return [normalize(text) for text in texts]
+
+
+def fuzzy_matrix(queries: Sequence[str],
+                 choices: Sequence[str],
+                 scorer: Callable = fuzz.token_sort_ratio,
+                 workers: int = -1) -> np.ndarray:
+    """
+    Similaridade fuzzy de todas as queries contra todas as escolhas
+
+    Args:
+        queries: Textos já normalizados (prepare)
+        choices: Textos já normalizados (prepare)
+        scorer: Scorer do rapidfuzz (fuzz.token_sort_ratio, fuzz.partial_ratio, ...)
+        workers: Threads do cdist (-1 = todos os núcleos)
+
+    Returns:
+        Matriz len(queries)×len(choices) de scores 0-100 (float32)
+    """
+    if not len(queries) or not len(choices):
+        return np.zeros((len(queries), len(choices)), dtype=np.float32)
+    return process.cdist(queries, choices, scorer=scorer, dtype=np.float32, workers=workers)
+
+
+def title_word_bonus(catalog_titles: Sequence[str],
+                     doc_titles: Sequence[str],
+                     workers: int = -1) -> np.ndarray:
+    """
+    Bônus das palavras importantes de cada título do catálogo nos títulos do documento
+
+    Para cada palavra do título do catálogo com mais de MIN_WORD_LENGTH
+    letras: EXACT_WORD_BONUS se ela ocorre no título do documento, senão
+    SIMILAR_WORD_BONUS se alguma palavra do título do documento tem
+    fuzz.ratio > SIMILAR_WORD_THRESHOLD com ela.
+
+    Args:
+        catalog_titles: Títulos do catálogo já normalizados (prepare)
+        doc_titles: Títulos do documento já normalizados (prepare)
+        workers: Threads do cdist (-1 = todos os núcleos)
+
+    Returns:
+        Matriz C×D de bônus
+    """
+    # Vocabulários: palavras importantes do catálogo e palavras dos títulos do documento
+    words: Dict[str, int] = {}
+    occurrences = []
+    for c, title in enumerate(catalog_titles):
+        for word in title.split():
+            if len(word) > MIN_WORD_LENGTH:
+                occurrences.append((c, words.setdefault(word, len(words))))
+    catalog_words = np.zeros((len(catalog_titles), len(words)))
+    for c, w in occurrences:
+        # Palavra repetida no título conta de novo
+        catalog_words[c, w] += 1
+
+    doc_vocab: Dict[str, int] = {}
+    doc_words = []
+    for title in doc_titles:
+        doc_words.append({doc_vocab.setdefault(word, len(doc_vocab)) for word in title.split()})
+    doc_incidence = np.zeros((len(doc_vocab), len(doc_titles)), dtype=bool)
+    for d, ids in enumerate(doc_words):
+        doc_incidence[list(ids), d] = True
+
+    vocab = list(words)
+    similar_words = fuzzy_matrix(vocab, list(doc_vocab), scorer=fuzz.ratio, workers=workers) > SIMILAR_WORD_THRESHOLD
+    similar = (similar_words.astype(np.float32) @ doc_incidence.astype(np.float32)) > 0
+
+    # Ocorrência exata é por substring do título (como no laço original)
+    exact = np.zeros((len(vocab), len(doc_titles)), dtype=bool)
+    for w, word in enumerate(vocab):
+        exact[w] = [word in title for title in doc_titles]
+
+    bonus = np.where(exact, EXACT_WORD_BONUS, np.where(similar, SIMILAR_WORD_BONUS, 0)).astype(np.float64)
+    return catalog_words @ bonus
+
+
+class ClauseAssignment:
+    """Resultado da atribuição catálogo × documento"""
+
+    def __init__(self, pairs: List[Tuple[int, int, float]],
+                 unmatched_catalog: List[int], unmatched_document: List[int]):
+        self.pairs = pairs
+        self.unmatched_catalog = unmatched_catalog
+        self.unmatched_document = unmatched_document
+
+    def by_catalog(self) -> Dict[int, Tuple[int, float]]:
+        """Cláusula do catálogo -> (cláusula do documento, score)"""
+        return {c: (d, score) for c, d, score in self.pairs}
+
+
+def assign_clauses(scores: np.ndarray,
+                   max_per_doc: int = 1,
+                   min_score: float = 0.0) -> ClauseAssignment:
+    """
+    Atribuição globalmente ótima de cláusulas do catálogo a cláusulas do documento
+
+    Maximiza a soma dos scores dos pares. Cada cláusula do catálogo recebe no
+    máximo uma cláusula do documento; cada cláusula do documento atende até
+    max_per_doc cláusulas do catálogo (colunas replicadas max_per_doc vezes).
+    Pares com score <= min_score não são formados.
+
+    Args:
+        scores: Matriz C×D (catálogo × documento), maior = melhor
+        max_per_doc: Cláusulas do catálogo por cláusula do documento
+        min_score: Score mínimo (exclusivo) para formar um par
+
+    Returns:
+        ClauseAssignment com os pares (catálogo, documento, score) e as
+        cláusulas sem par de cada lado
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    num_catalog, num_document = scores.shape
+
+    pairs = []
+    if num_catalog and num_document:
+        # Pares abaixo do mínimo valem 0: nunca tiram um par válido de outra cláusula
+        gain = np.where(scores > min_score, scores, 0.0)
+        rows, cols = linear_sum_assignment(np.tile(gain, (1, max(1, max_per_doc))), maximize=True)
+        for c, col in zip(rows, cols):
+            d = col % num_document
+            if scores[c, d] > min_score:
+                pairs.append((int(c), int(d), float(scores[c, d])))
+
+    matched_catalog = {c for c, _, _ in pairs}
+    matched_document = {d for _, d, _ in pairs}
+    return ClauseAssignment(
+        pairs=pairs,
+        unmatched_catalog=[c for c in range(num_catalog) if c not in matched_catalog],
+        unmatched_document=[d for d in range(num_document) if d not in matched_document]
+    )
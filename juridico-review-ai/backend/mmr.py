@@ -0,0 +1,104 @@
+"""
+Maximal Marginal Relevance vetorizado.
+
+A diversidade de um candidato é 1 - (maior similaridade com os já
+selecionados). Com a matriz C×C de similaridade do catálogo calculada uma
+vez, cada passo do MMR só atualiza o máximo corrente com a linha do último
+selecionado, em vez de chamar cosine_similarity para cada candidato.
+"""
+
+from typing import List, Optional
+
+import numpy as np
+
+
+def similarity_matrix(embeddings: np.ndarray) -> np.ndarray:
+    """
+    Similaridade cosseno C×C entre as cláusulas do catálogo
+
+    Args:
+        embeddings: Matriz C×dim de embeddings
+
+    Returns:
+        Matriz C×C (float32)
+    """
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    normalized = embeddings / np.where(norms > 0, norms, 1.0)
+    return normalized @ normalized.T
+
+
+def mmr_select_batch(scores: np.ndarray,
+                     similarity: Optional[np.ndarray],
+                     lambda_param: float = 0.7,
+                     top_k: int = 5) -> np.ndarray:
+    """
+    MMR para várias queries de uma vez
+
+    Args:
+        scores: Matriz D×C de relevância (uma linha por cláusula do documento)
+        similarity: Matriz C×C de similarity_matrix, ou D×C×C com uma matriz
+            por query (ex: candidatas diferentes por query); None = sem diversidade
+        lambda_param: Trade-off relevância vs diversidade (0-1)
+        top_k: Número de resultados por query
+
+    Returns:
+        Matriz D×k de índices, na ordem de seleção (k = min(top_k, C))
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    num_queries, num_candidates = scores.shape
+    k = min(top_k, num_candidates)
+    selected = np.zeros((num_queries, k), dtype=np.intp)
+    if k == 0:
+        return selected
+
+    rows = np.arange(num_queries)
+    taken = np.zeros((num_queries, num_candidates), dtype=bool)
+    relevance = lambda_param * scores
+
+    # Primeiro: mais relevante
+    best = np.argmax(scores, axis=1)
+    selected[:, 0] = best
+    taken[rows, best] = True
+    per_query = similarity is not None and similarity.ndim == 3
+
+    def similarity_to(best):
+        return similarity[rows, best] if per_query else similarity[best]
+
+    max_sim = similarity_to(best).astype(np.float64) if similarity is not None else None
+
+    # Demais: relevância menos redundância com os já selecionados
+    for step in range(1, k):
+        if max_sim is not None:
+            mmr = relevance + (1 - lambda_param) * (1 - max_sim)
+        else:
+            mmr = relevance + (1 - lambda_param)
+        mmr[taken] = -np.inf
+        best = np.argmax(mmr, axis=1)
+        selected[:, step] = best
+        taken[rows, best] = True
+        if max_sim is not None:
+            np.maximum(max_sim, similarity_to(best), out=max_sim)
+
+    return selected
+
+
+def mmr_select(scores: np.ndarray,
+               similarity: Optional[np.ndarray],
+               lambda_param: float = 0.7,
+               top_k: int = 5) -> List[int]:
+    """
+    MMR para uma query
+
+    Args:
+        scores: Vetor de relevância (C)
+        similarity: Matriz C×C de similarity_matrix (None = sem diversidade)
+        lambda_param: Trade-off relevância vs diversidade (0-1)
+        top_k: Número de resultados
+
+    Returns:
+        Índices dos top-k resultados diversificados
+    """
+    if len(scores) == 0:
+        return []
+    return mmr_select_batch(np.asarray(scores)[None, :], similarity, lambda_param, top_k)[0].tolist()
@@ -0,0 +1,180 @@
+"""
+Cache em disco de documentos parseados, endereçado pelo conteúdo do arquivo.
+
+A chave combina o SHA-256 do arquivo, a versão do parser e as opções de
+parsing. Assim, a mesma minuta revisada várias vezes ao dia é parseada uma
+única vez, e qualquer mudança no arquivo ou no parser invalida a entrada.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from .source import is_path, source_buffer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = "data/cache/parsed"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB
+
+
+def compute_file_hash(filepath, chunk_size: int = 1 << 20) -> str:
+    """
+    Calcula SHA-256 de um arquivo lendo em chunks
+
+    Args:
+        filepath: Caminho do arquivo, ou conteúdo em memória (bytes,
+            memoryview, BytesIO/upload), que é hasheado sem cópia
+        chunk_size: Tamanho de cada leitura em bytes
+
+    Returns:
+        Hash hexadecimal
+    """
+    if not is_path(filepath):
+        with source_buffer(filepath) as view:
+            return hashlib.sha256(view).hexdigest()
+
+    sha256 = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+class ParseCache:
+    """Cache de documentos parseados com despejo por tamanho (LRU por mtime)"""
+
+    SUFFIX = '.json.gz'
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Inicializa o cache
+
+        Args:
+            cache_dir: Diretório onde as entradas são gravadas
+            max_bytes: Tamanho máximo total do cache (0 = sem limite)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(file_hash: str, parser_version: str, options: Optional[Dict] = None) -> str:
+        """
+        Monta a chave de cache
+
+        Args:
+            file_hash: SHA-256 do arquivo
+            parser_version: Versão do parser (muda quando a segmentação muda)
+            options: Opções de parsing que alteram o resultado
+
+        Returns:
+            Chave hexadecimal
+        """
+        options_repr = json.dumps(options or {}, sort_keys=True, default=str)
+        raw = f"{file_hash}|{parser_version}|{options_repr}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.SUFFIX}"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Busca uma entrada no cache
+
+        Args:
+            key: Chave gerada por make_key
+
+        Returns:
+            Payload armazenado ou None se ausente/corrompido
+        """
+        path = self._path(key)
+        if not path.exists():
+            return None
+
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                payload = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Entrada de cache corrompida, descartando: {path.name} ({e})")
+            path.unlink(missing_ok=True)
+            return None
+
+        # Marca como usado recentemente (base do despejo LRU)
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+        return payload
+
+    def put(self, key: str, payload: Dict):
+        """
+        Grava uma entrada no cache (escrita atômica) e aplica o limite de tamanho
+
+        Args:
+            key: Chave gerada por make_key
+            payload: Dados serializáveis em JSON
+        """
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+        try:
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Falha ao gravar cache: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        self.evict()
+
+    def evict(self):
+        """Remove as entradas menos usadas até respeitar max_bytes"""
+        if not self.max_bytes:
+            return
+
+        entries = []
+        total = 0
+        for path in self.cache_dir.glob(f"*{self.SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            logger.debug(f"Cache: removida entrada {path.name} ({size} bytes)")
+
+    def clear(self):
+        """Remove todas as entradas do cache"""
+        for path in self.cache_dir.glob(f"*{self.SUFFIX}"):
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict:
+        """
+        Estatísticas do cache
+
+        Returns:
+            Dict com número de entradas e tamanho total
+        """
+        sizes = [p.stat().st_size for p in self.cache_dir.glob(f"*{self.SUFFIX}")]
+        return {
+            'entradas': len(sizes),
+            'tamanho_bytes': sum(sizes),
+            'limite_bytes': self.max_bytes
+        }
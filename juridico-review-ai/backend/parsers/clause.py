@@ -0,0 +1,240 @@
+"""
+Representação compacta de cláusulas parseadas.
+
+O texto de todas as cláusulas de um documento fica em um único buffer
+(TextBuffer); cada Clause guarda apenas offsets nesse buffer, os campos
+curtos (seção, origem, índice) e visões derivadas calculadas sob demanda
+(minúsculas, normalizada, prévia). O acesso por chave continua funcionando
+(clause['title'], clause.get('content')), então o código que trata
+cláusulas como dicts não precisa mudar.
+
+clause_full_text, clause_normalized e clause_preview usam as visões (com
+cache) de uma Clause e calculam o mesmo texto para um dict simples (ex:
+cláusulas lidas do store), para o ranker e os relatórios não montarem
+"título conteúdo" ou a prévia cada um à sua maneira.
+"""
+
+from collections.abc import Mapping
+from typing import Dict, List, Optional
+
+try:
+    from ..utils.text_norm import normalize
+except ImportError:
+    from utils.text_norm import normalize
+
+# Separador entre título e conteúdo no texto completo ("título conteúdo",
+# igual à query do ranker)
+TITLE_SEP = ' '
+
+# Tamanho padrão da prévia do conteúdo
+PREVIEW_CHARS = 200
+
+FIELDS = ('title', 'content', 'section', 'source', 'index')
+
+
+def _is_narrow(text: str) -> bool:
+    """Texto cabe em 1 byte por caractere (latin-1)"""
+    if text.isascii():
+        return True
+    try:
+        text.encode('latin-1')
+        return True
+    except UnicodeEncodeError:
+        return False
+
+
+class _Segment:
+    """Trecho contínuo de texto só de acréscimo"""
+
+    __slots__ = ('parts', 'length', 'text')
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.length = 0
+        self.text: Optional[str] = ''
+
+    def append(self, text: str) -> int:
+        start = self.length
+        self.parts.append(text)
+        self.length += len(text)
+        self.text = None
+        return start
+
+    def get(self) -> str:
+        # Junta os trechos pendentes uma única vez
+        if self.text is None:
+            self.text = ''.join(self.parts)
+            self.parts = [self.text]
+        return self.text
+
+
+class TextBuffer:
+    """
+    Buffer de texto só de acréscimo, compartilhado pelas cláusulas de um documento
+
+    Textos latin-1 e textos com caracteres mais largos (travessão, aspas
+    curvas) ficam em segmentos separados: o CPython guarda cada string com a
+    largura do maior caractere, então um único "–" não dobra o tamanho do
+    buffer inteiro. Referências >= 0 apontam para o segmento estreito e < 0
+    para o largo.
+    """
+
+    __slots__ = ('_narrow', '_wide')
+
+    def __init__(self):
+        self._narrow = _Segment()
+        self._wide = _Segment()
+
+    def append(self, text: str) -> int:
+        """Acrescenta texto e devolve sua referência"""
+        if _is_narrow(text):
+            return self._narrow.append(text)
+        return -1 - self._wide.append(text)
+
+    def get(self, ref: int, length: int) -> str:
+        """Texto de tamanho length na referência ref"""
+        if ref >= 0:
+            return self._narrow.get()[ref:ref + length]
+        start = -1 - ref
+        return self._wide.get()[start:start + length]
+
+    def __len__(self) -> int:
+        return self._narrow.length + self._wide.length
+
+
+class Clause(Mapping):
+    """
+    Cláusula com texto no buffer do documento
+
+    Campos: title, content, section, source, index (mais chaves extras
+    atribuídas depois, ex: page). Visões derivadas ficam em cache.
+    """
+
+    __slots__ = ('_buffer', '_title_ref', '_title_len', '_content_ref', '_content_len',
+                 'section', 'source', 'index', '_lower', '_normalized', '_preview', '_extra')
+
+    def __init__(self, buffer: TextBuffer, title: str, content: str,
+                 section: Optional[str] = None, source: str = "paragraph", index: int = 0):
+        self._buffer = buffer
+        self._title_ref = buffer.append(title)
+        self._title_len = len(title)
+        self._content_ref = buffer.append(content)
+        self._content_len = len(content)
+
+        self.section = section
+        self.source = source
+        self.index = index
+
+        self._lower = None
+        self._normalized = None
+        self._preview = None
+        self._extra = None
+
+    @property
+    def title(self) -> str:
+        return self._buffer.get(self._title_ref, self._title_len)
+
+    @property
+    def content(self) -> str:
+        return self._buffer.get(self._content_ref, self._content_len)
+
+    @property
+    def full_text(self) -> str:
+        """Título e conteúdo ("título conteúdo")"""
+        return f"{self.title}{TITLE_SEP}{self.content}"
+
+    @property
+    def lower(self) -> str:
+        """full_text em minúsculas (cache)"""
+        if self._lower is None:
+            self._lower = self.full_text.lower()
+        return self._lower
+
+    @property
+    def normalized(self) -> str:
+        """full_text sem acentos, minúsculo e com espaços normalizados (cache)"""
+        if self._normalized is None:
+            self._normalized = normalize(self.full_text)
+        return self._normalized
+
+    def preview(self, max_chars: int = PREVIEW_CHARS) -> str:
+        """Início do conteúdo, com '...' se truncado (cache para o tamanho padrão)"""
+        if max_chars == PREVIEW_CHARS and self._preview is not None:
+            return self._preview
+
+        content = self._buffer.get(self._content_ref, min(self._content_len, max_chars))
+        preview = content + '...' if self._content_len > max_chars else content
+        if max_chars == PREVIEW_CHARS:
+            self._preview = preview
+        return preview
+
+    # ------------------------------------------------------------------
+    # Adaptador de dict
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, key):
+        if key == 'title':
+            return self.title
+        if key == 'content':
+            return self.content
+        if key == 'section':
+            return self.section
+        if key == 'source':
+            return self.source
+        if key == 'index':
+            return self.index
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in ('title', 'content'):
+            raise TypeError(f"'{key}' da cláusula é somente leitura")
+        if key in ('section', 'source', 'index'):
+            setattr(self, key, value)
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __iter__(self):
+        yield from FIELDS
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return len(FIELDS) + (len(self._extra) if self._extra else 0)
+
+    def __repr__(self) -> str:
+        return f"Clause(index={self.index}, title={self.title[:60]!r})"
+
+    def to_dict(self) -> Dict:
+        """Cópia como dict simples (serialização)"""
+        return dict(self.items())
+
+
+
+# ----------------------------------------------------------------------
+# Visões para Clause ou dict simples
+# ----------------------------------------------------------------------
+
+def clause_full_text(clause) -> str:
+    """Título e conteúdo ("título conteúdo") de uma Clause ou dict"""
+    if isinstance(clause, Clause):
+        return clause.full_text
+    return f"{clause['title']}{TITLE_SEP}{clause['content']}"
+
+
+def clause_normalized(clause) -> str:
+    """Texto completo normalizado (utils.text_norm.normalize) de uma Clause (cache) ou dict"""
+    if isinstance(clause, Clause):
+        return clause.normalized
+    return normalize(clause_full_text(clause))
+
+
+def clause_preview(clause, max_chars: int = PREVIEW_CHARS) -> str:
+    """Início do conteúdo de uma Clause ou dict, com '...' se truncado"""
+    if isinstance(clause, Clause):
+        return clause.preview(max_chars)
+    content = clause['content']
+    return content[:max_chars] + '...' if len(content) > max_chars else content
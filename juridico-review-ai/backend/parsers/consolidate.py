@@ -0,0 +1,146 @@
+"""
+Consolidação de fragmentos de cláusulas de PDF.
+
+O segmentador de PDF abre uma cláusula nova para qualquer linha numerada,
+então subitens ("5.1", "5.1.2"), valores ("1.000.000,00") e datas viram
+"cláusulas" próprias, e cada uma vira uma chamada de LLM no Tier-1. Aqui
+esses fragmentos são devolvidos à cláusula-mãe:
+
+- subitem numerado cujo número começa pelo da cláusula aberta (5.1 em 5)
+- linha que começa com valor/data/ano em vez de numeração de cláusula
+- corpo muito curto (menos de MIN_BODY_CHARS) sob título sem numeração de
+  cláusula, ou sob numeração mais profunda que não é da cláusula aberta
+  (7.1 de uma linha dentro de 6)
+
+Títulos por palavra-chave (CLÁUSULA, CAPÍTULO, SEÇÃO, ANEXO), numeração do
+mesmo nível ou acima da cláusula aberta ("6. PRAZO" depois de 5, mesmo com
+corpo curto) e tabelas nunca são mesclados. Os fragmentos mesclados são
+contados por motivo em stats['motivos'].
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+# Corpo abaixo disso é fragmento (mesclado na cláusula anterior), exceto sob
+# título por palavra-chave ou numeração irmã
+MIN_BODY_CHARS = 60
+
+# Motivos de mescla (chaves de stats['motivos'])
+REASON_SUBITEM = 'subitem'
+REASON_VALUE = 'valor'
+REASON_SHORT = 'corpo_curto'
+
+KEYWORD_PATTERN = re.compile(r'^(cl[áa]usula|se[çc][ãa]o|cap[íi]tulo|anexo)\s+(\d+(?:\.\d+)*)?', re.IGNORECASE)
+# Numeração de cláusula: até 3 dígitos por nível, seguida de fim/espaço/separador
+NUMBER_PATTERN = re.compile(r'^(\d{1,3}(?:\.\d{1,3})*)\.?(?=$|\s|[-–—)])')
+
+
+def numbering(title: str) -> Tuple[str, Optional[Tuple[int, ...]]]:
+    """
+    Classifica a numeração do título
+
+    Returns:
+        (tipo, níveis): tipo 'keyword', 'number', 'value' (começa com
+        dígitos que não são numeração: valor, data, ano) ou 'other'
+    """
+    match = KEYWORD_PATTERN.match(title)
+    if match:
+        parts = match.group(2)
+        return 'keyword', tuple(int(p) for p in parts.split('.')) if parts else None
+
+    match = NUMBER_PATTERN.match(title)
+    if match:
+        return 'number', tuple(int(p) for p in match.group(1).split('.'))
+
+    if title[:1].isdigit():
+        return 'value', None
+
+    return 'other', None
+
+
+class FragmentConsolidator:
+    """
+    Mescla fragmentos na cláusula-mãe em streaming
+
+    Mantém aberta só a cláusula atual; ela é emitida quando chega a
+    próxima cláusula que não é fragmento. Contagens em self.stats (com os
+    fragmentos por motivo em self.stats['motivos']).
+    """
+
+    def __init__(self, min_body_chars: int = MIN_BODY_CHARS):
+        self.min_body_chars = min_body_chars
+        self.stats = {
+            'clausulas_antes': 0,
+            'clausulas_depois': 0,
+            'fragmentos_mesclados': 0,
+            'motivos': {REASON_SUBITEM: 0, REASON_VALUE: 0, REASON_SHORT: 0}
+        }
+
+    def _fragment_reason(self, clause: Dict, kind: str, parts, parent_parts) -> Optional[str]:
+        """Motivo pelo qual a cláusula é fragmento da cláusula aberta (None = cláusula própria)"""
+        if kind == 'keyword':
+            return None
+        if kind == 'value':
+            return REASON_VALUE
+        if kind == 'number':
+            if parent_parts is None:
+                # Sob "CLÁUSULA PRIMEIRA" (sem número) aceita qualquer subitem
+                return REASON_SUBITEM if len(parts) > 1 else None
+            if len(parts) <= len(parent_parts):
+                # Mesmo nível ou acima da cláusula aberta: cláusula irmã, nunca fragmento
+                return None
+            if parts[:len(parent_parts)] == parent_parts:
+                # Subitem: 5.1 pertence a 5
+                return REASON_SUBITEM
+            # Mais profundo mas de outra cláusula (7.1 sob 6): só se o corpo for curto
+        if len(clause['content']) < self.min_body_chars:
+            return REASON_SHORT
+        return None
+
+    def __call__(self, clauses: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Consolida um fluxo de cláusulas (formato de parsing.iter_pdf_clauses)
+
+        Args:
+            clauses: Cláusulas com title, content, section, source
+
+        Yields:
+            Cláusulas consolidadas, reindexadas na ordem de emissão
+        """
+        parent = None
+        parent_parts = None
+        index = 0
+
+        for clause in clauses:
+            self.stats['clausulas_antes'] += 1
+
+            if clause['source'] == 'table':
+                # Tabelas seguem à parte, sem fechar a cláusula aberta
+                self.stats['clausulas_depois'] += 1
+                yield {**clause, 'index': index}
+                index += 1
+                continue
+
+            kind, parts = numbering(clause['title'])
+
+            reason = self._fragment_reason(clause, kind, parts, parent_parts) if parent is not None else None
+            if reason is not None:
+                fragment = clause['title'] if not clause['content'] else f"{clause['title']}\n{clause['content']}"
+                parent['content'] = f"{parent['content']}\n{fragment}" if parent['content'] else fragment
+                self.stats['fragmentos_mesclados'] += 1
+                self.stats['motivos'][reason] += 1
+                continue
+
+            if parent is not None:
+                parent['index'] = index
+                index += 1
+                yield parent
+
+            parent = dict(clause)
+            self.stats['clausulas_depois'] += 1
+            # Número de referência para subitens (keyword sem número -> None)
+            parent_parts = parts if kind in ('keyword', 'number') else None
+
+        if parent is not None:
+            parent['index'] = index
+            yield parent
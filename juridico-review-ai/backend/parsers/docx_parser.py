@@ -1,61 +1,93 @@
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from docx import Document
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+from docx.oxml.ns import qn
+
+from .source import open_source
+from .sections import SectionTree
 
 # estilos comuns de heading em PT/EN
 HEADING_STYLES = {f'Heading {i}' for i in range(1,10)} | {'Título 1','Título 2','Título 3','Título 4','Título 5'}
 
-def extract_blocks_docx(path: str) -> List[Dict]:
+def heading_level(style: str) -> int:
+    """Nível do estilo de heading ("Heading 2" -> 2); 1 se não houver número"""
+    suffix = style.rsplit(' ', 1)[-1]
+    return int(suffix) if suffix.isdigit() else 1
+
+def iter_body(doc):
+    """Parágrafos e tabelas do corpo na ordem do documento"""
+    for child in doc.element.body.iterchildren():
+        if child.tag == qn('w:p'):
+            yield Paragraph(child, doc)
+        elif child.tag == qn('w:tbl'):
+            yield Table(child, doc)
+
+def extract_sections_docx(path: str) -> Tuple[List[Dict], SectionTree]:
     """
-    Extrai blocos de texto de um arquivo DOCX preservando estrutura hierárquica.
+    Extrai blocos de texto de um arquivo DOCX e a árvore de seções.
 
-    Retorna blocos com section_path, para_idx, table_ref e text.
+    Cada heading abre uma seção no seu nível (um Heading 2 fecha o Heading 2
+    anterior e fica sob o Heading 1 aberto). Os blocos guardam o section_id
+    do nó e o section_path dele, montado uma vez por seção.
 
     Args:
-        path: Caminho para o arquivo DOCX
+        path: Caminho para o arquivo DOCX, ou conteúdo em memória (bytes,
+            memoryview, BytesIO)
 
     Returns:
-        Lista de dicionários com {mode, section_path, para_idx, table_ref, text}
+        (blocos, árvore de seções). Blocos com {mode, section_id,
+        section_path, para_idx | table_ref, text}, na ordem do documento
     """
-    doc = Document(path)
-    section_stack = []
+    doc = Document(open_source(path))
+    tree = SectionTree()
     blocks: List[Dict] = []
     para_counter = 0
+    table_counter = 0
 
-    def section_path() -> str:
-        return " > ".join(section_stack) if section_stack else ""
+    def add_block(**fields):
+        node = tree[tree.mark()]
+        blocks.append({"mode": "docx", "section_id": node.id, "section_path": node.path, **fields})
 
-    # percorre parágrafos em ordem
-    for p in doc.paragraphs:
-        style = (p.style.name if p.style else "") or ""
-        text = (p.text or "").strip()
+    # percorre parágrafos e tabelas em ordem
+    for item in iter_body(doc):
+        if isinstance(item, Table):
+            table_counter += 1
+            for ri, row in enumerate(item.rows):
+                for ci, cell in enumerate(row.cells):
+                    t = (cell.text or "").strip()
+                    if not t:
+                        continue
+                    add_block(table_ref=f"Tabela {table_counter} / R{ri+1}C{ci+1}", text=t)
+            continue
+
+        style = (item.style.name if item.style else "") or ""
+        text = (item.text or "").strip()
         if not text:
             continue
         if style in HEADING_STYLES:
-            # abre nova seção
-            section_stack.append(text)
+            # abre nova seção no nível do heading
+            tree.open(text, heading_level(style))
             para_counter = 0
             continue
         para_counter += 1
-        blocks.append({
-            "mode": "docx",
-            "section_path": section_path(),
-            "para_idx": para_counter,
-            "text": text
-        })
-
-    # percorre tabelas (se houver)
-    # obs: python-docx não preserva posição relativa perfeita; serve como evidência de conteúdo
-    for ti, table in enumerate(doc.tables):
-        for ri, row in enumerate(table.rows):
-            for ci, cell in enumerate(row.cells):
-                t = (cell.text or "").strip()
-                if not t:
-                    continue
-                blocks.append({
-                    "mode": "docx",
-                    "section_path": section_path(),
-                    "table_ref": f"Tabela {ti+1} / R{ri+1}C{ci+1}",
-                    "text": t
-                })
-
-    return blocks
+        add_block(para_idx=para_counter, text=text)
+
+    return blocks, tree.finish()
+
+def extract_blocks_docx(path: str) -> List[Dict]:
+    """
+    Extrai blocos de texto de um arquivo DOCX preservando estrutura hierárquica.
+
+    Retorna blocos com section_id, section_path, para_idx, table_ref e text.
+    Para consultar a hierarquia (blocos sob uma seção, título-pai), use
+    extract_sections_docx.
+
+    Args:
+        path: Caminho para o arquivo DOCX, ou conteúdo em memória (bytes,
+            memoryview, BytesIO)
+
+    Returns:
+        Lista de dicionários com {mode, section_id, section_path, para_idx, table_ref, text}
+    """
+    return extract_sections_docx(path)[0]
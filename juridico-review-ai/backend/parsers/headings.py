@@ -0,0 +1,105 @@
+"""
+Classificação de títulos/cláusulas compartilhada por parse_docx e parse_pdf.
+
+Uma única regex combinada (grupos nomeados) identifica a forma da linha
+(palavra-chave, numeração, alínea) e as estatísticas de tokens (palavras,
+maiúsculas, "Título:") são calculadas uma vez por linha. A decisão final
+segue as mesmas regras que cada parser aplicava antes, por formato.
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+# Palavras-chave reconhecidas nos dois formatos
+KEYWORDS = r'cl[áa]usula|se[çc][ãa]o|cap[íi]tulo|anexo'
+# Palavras-chave adicionais do DOCX
+KEYWORDS_DOCX = r'item|art|artigo|t[íi]tulo|par[áa]grafo'
+
+HEADING_PATTERN = re.compile(
+    r'(?i:(?P<keyword>' + KEYWORDS + r')|(?P<keyword_docx>' + KEYWORDS_DOCX + r'))\s+(?P<keyword_text>.+)'
+    r'|(?P<number>\d+(?:\.\d+){0,3})[\.\)\s]*[-–—]?\s*(?P<number_text>.*)'
+    r'|(?P<letter>[a-z]\)|[a-z]\.|[A-Z]\)|[A-Z]\.)\s+(?P<letter_text>.+)'
+)
+_match = HEADING_PATTERN.match
+
+FORMATS = ('docx', 'pdf')
+
+
+class HeadingVerdict(NamedTuple):
+    """Resultado da classificação de uma linha"""
+    is_title: bool
+    # Regra que decidiu: keyword, number, letter, style, bold, upper, colon ou None
+    kind: Optional[str]
+    # Nova seção aberta pela linha (None mantém a seção atual)
+    section: Optional[str]
+
+
+CONTENT = HeadingVerdict(False, None, None)
+NUMBERED = HeadingVerdict(True, 'number', None)
+
+
+@lru_cache(maxsize=256)
+def is_heading_style(style_name: str) -> bool:
+    """Estilo de parágrafo de título (Heading, Título, Title)"""
+    style = style_name.lower()
+    return 'heading' in style or 'título' in style or 'title' in style
+
+
+def classify_line(text: str, fmt: str = 'docx', bold: bool = False, style_name: str = '') -> HeadingVerdict:
+    """
+    Classifica uma linha já normalizada como título ou conteúdo
+
+    Args:
+        text: Linha normalizada (normalize_text), não vazia
+        fmt: 'docx' (usa formatação) ou 'pdf' (só texto)
+        bold: Parágrafo tem run em negrito (DOCX)
+        style_name: Nome do estilo do parágrafo (DOCX)
+
+    Returns:
+        HeadingVerdict
+    """
+    match = _match(text)
+    kind = match.lastgroup if match else None
+
+    if kind == 'keyword_text':
+        # PDF só reconhece as palavras-chave comuns
+        keyword = match['keyword'] or (match['keyword_docx'] if fmt == 'docx' else None)
+        if keyword:
+            return HeadingVerdict(True, 'keyword', f"{keyword.upper()}: {match['keyword_text']}")
+        kind = None
+
+    if fmt == 'pdf':
+        if kind == 'number_text':
+            return NUMBERED
+        if len(text) > 10 and text.isupper() and text.count(' ') <= 5:
+            return HeadingVerdict(False, 'upper', text)
+        return CONTENT
+
+    # Estatísticas de tokens, calculadas uma vez (texto normalizado: um espaço entre palavras)
+    words = text.count(' ') + 1
+    upper_shape = 3 <= words <= 15 and text.isupper()
+    heading_style = is_heading_style(style_name) if style_name else False
+
+    verdict_kind = None
+    if kind == 'number_text' and match['number_text']:
+        # Numeração só é título com formatação ou em maiúsculas
+        if len(match['number_text'].strip()) > 10 and (bold or heading_style or upper_shape):
+            verdict_kind = 'number'
+    elif kind == 'letter_text' and words >= 3:
+        verdict_kind = 'letter'
+    elif heading_style:
+        verdict_kind = 'style'
+    elif bold and 3 <= words <= 15:
+        verdict_kind = 'bold'
+    elif upper_shape and len(text) > 15:
+        verdict_kind = 'upper'
+    elif text[-1] == ':' and text.count(':') == 1 and len(text) <= 80 and words >= 2:
+        # "Título:" (um único dois-pontos, no fim da linha)
+        verdict_kind = 'colon'
+
+    if verdict_kind is None:
+        return CONTENT
+
+    section = text if upper_shape and words <= 6 else None
+    return HeadingVerdict(True, verdict_kind, section)
@@ -0,0 +1,145 @@
+"""
+Limpeza de layout de PDF antes da segmentação em cláusulas.
+
+Remove cabeçalhos e rodapés repetidos (ex: "Minuta – Versão para
+discussão", nome das partes), números de página ("12", "Página 3 de 40",
+"- 7 -") que o extrator de texto mistura ao conteúdo. Só são candidatas
+as linhas na margem superior/inferior da página, pela posição vertical
+extraída (page['lines']); um cabeçalho é uma candidata que se repete, com
+o mesmo texto a menos dos dígitos, em boa parte das páginas.
+"""
+
+import math
+import re
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from .headings import classify_line
+
+# Faixa do topo/rodapé (fração da altura da página) onde ficam cabeçalhos/rodapés
+MARGIN = 0.06
+
+# Sem posições (ex: páginas montadas à mão): linhas do topo/rodapé por índice
+ZONE_LINES = 2
+
+# Páginas usadas para aprender os cabeçalhos antes de começar a emitir
+SAMPLE_PAGES = 8
+
+# Fração mínima das páginas amostradas em que a linha precisa se repetir
+MIN_REPEAT_RATIO = 0.5
+
+PAGE_NUMBER_PATTERN = re.compile(
+    r'^(?:p[áa]g(?:ina)?\.?\s*)?[-–—(\[]?\s*\d{1,4}\s*(?:(?:de|/|of)\s*\d{1,4})?\s*[-–—)\]]?$',
+    re.IGNORECASE
+)
+DIGITS = re.compile(r'\d+')
+SPACES = re.compile(r'\s+')
+TOKENS = re.compile(r'\b\w+\b')
+
+
+def line_key(line: str) -> str:
+    """Texto comparável entre páginas: minúsculo, espaços colapsados, dígitos -> #"""
+    return DIGITS.sub('#', SPACES.sub(' ', line.strip().lower()))
+
+
+def _zones(page: Dict, lines: List[str]) -> Iterator[Tuple[int, str]]:
+    """(índice da linha, zona) das linhas não vazias na margem superior/inferior"""
+    positions = page.get('lines')
+    if positions and len(positions) == len(lines):
+        for i, (top, bottom) in enumerate(positions):
+            if not lines[i].strip():
+                continue
+            if top < MARGIN:
+                yield i, 'top'
+            elif bottom > 1 - MARGIN:
+                yield i, 'bottom'
+        return
+
+    filled = [i for i, line in enumerate(lines) if line.strip()]
+    for i in filled[:ZONE_LINES]:
+        yield i, 'top'
+    for i in filled[-ZONE_LINES:]:
+        yield i, 'bottom'
+
+
+class RepeatedLineStripper:
+    """
+    Remove cabeçalhos/rodapés repetidos e números de página de páginas de PDF
+
+    Funciona em streaming: aprende os cabeçalhos nas primeiras SAMPLE_PAGES
+    páginas e depois emite cada página já limpa. Estatísticas do que foi
+    removido ficam em self.stats.
+    """
+
+    def __init__(self, sample_pages: int = SAMPLE_PAGES, min_ratio: float = MIN_REPEAT_RATIO):
+        self.sample_pages = sample_pages
+        self.min_ratio = min_ratio
+        self.repeated = set()
+        self.stats = {
+            'linhas_removidas': 0,
+            'caracteres_removidos': 0,
+            'tokens_removidos': 0,
+            'cabecalhos_detectados': 0
+        }
+
+    def learn(self, pages: List[Dict]):
+        """Detecta as linhas (zona, texto) repetidas nas páginas amostradas"""
+        counts: Dict[Tuple[str, str], int] = {}
+        for page in pages:
+            lines = page['text'].split('\n')
+            seen = {(zone, line_key(lines[i])) for i, zone in _zones(page, lines)}
+            for key in seen:
+                counts[key] = counts.get(key, 0) + 1
+
+        threshold = max(2, math.ceil(self.min_ratio * len(pages)))
+        self.repeated = {key for key, n in counts.items() if n >= threshold}
+        self.stats['cabecalhos_detectados'] = len(self.repeated)
+
+    def clean(self, page: Dict) -> Dict:
+        """Devolve a página sem as linhas de cabeçalho/rodapé"""
+        lines = page['text'].split('\n')
+        drop = set()
+        for i, zone in _zones(page, lines):
+            text = lines[i].strip()
+            if PAGE_NUMBER_PATTERN.match(text):
+                drop.add(i)
+            elif (zone, line_key(text)) in self.repeated and classify_line(text, 'pdf').kind != 'keyword':
+                # Títulos "CLÁUSULA N – ..." no topo da página nunca são cabeçalho
+                drop.add(i)
+
+        if not drop:
+            return page
+
+        for i in drop:
+            self.stats['linhas_removidas'] += 1
+            self.stats['caracteres_removidos'] += len(lines[i])
+            self.stats['tokens_removidos'] += len(TOKENS.findall(lines[i]))
+
+        cleaned = {**page, 'text': '\n'.join(line for i, line in enumerate(lines) if i not in drop)}
+        if page.get('lines'):
+            cleaned['lines'] = [pos for i, pos in enumerate(page['lines']) if i not in drop]
+        return cleaned
+
+    def __call__(self, pages: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Limpa um fluxo de páginas (formato de parsing.iter_pdf_pages)
+
+        Args:
+            pages: Páginas com page, text, tables e lines (posição vertical
+                (topo, base) de cada linha de text, em fração da altura)
+
+        Yields:
+            Páginas limpas, na mesma ordem
+        """
+        pages = iter(pages)
+        sample = []
+        for page in pages:
+            sample.append(page)
+            if len(sample) >= self.sample_pages:
+                break
+
+        self.learn(sample)
+
+        for page in sample:
+            yield self.clean(page)
+        for page in pages:
+            yield self.clean(page)
@@ -0,0 +1,191 @@
+"""
+Leitor DOCX em streaming direto do OOXML (word/document.xml).
+
+Percorre o XML com iterparse, processando um elemento do corpo (parágrafo
+ou tabela) por vez e descartando-o em seguida. Produz os mesmos textos,
+estilos, negrito e células que o python-docx, em ordem de documento e em
+uma única passada, sem montar o modelo de objetos completo.
+"""
+
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterator, List, Optional
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+def _w(tag: str) -> str:
+    return f"{{{W_NS}}}{tag}"
+
+
+P, TBL, TR, TC, R, HYPERLINK = _w("p"), _w("tbl"), _w("tr"), _w("tc"), _w("r"), _w("hyperlink")
+BODY = _w("body")
+VAL = _w("val")
+FALSE_VALUES = {"0", "false", "off"}
+
+# Conteúdo de run -> texto equivalente (mesmo mapeamento do python-docx)
+RUN_TEXT = {
+    _w("tab"): "\t",
+    _w("ptab"): "\t",
+    _w("cr"): "\n",
+    _w("noBreakHyphen"): "-",
+}
+
+
+def load_style_names(zf: zipfile.ZipFile) -> Dict[Optional[str], str]:
+    """
+    Mapeia styleId -> nome do estilo de parágrafo
+
+    A chave None aponta para o estilo de parágrafo padrão, usado quando o
+    parágrafo não declara w:pStyle.
+
+    Args:
+        zf: Arquivo DOCX aberto
+
+    Returns:
+        Dicionário styleId -> nome
+    """
+    names: Dict[Optional[str], str] = {}
+    try:
+        root = ET.fromstring(zf.read("word/styles.xml"))
+    except KeyError:
+        return names
+
+    for style in root.iter(_w("style")):
+        if style.get(_w("type")) != "paragraph":
+            continue
+        name_el = style.find(_w("name"))
+        name = name_el.get(VAL, "") if name_el is not None else ""
+        names[style.get(_w("styleId"))] = name
+        if style.get(_w("default")) in ("1", "true", "on"):
+            names[None] = name
+    return names
+
+
+def _run_text(run: ET.Element) -> str:
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == _w("t"):
+            parts.append(child.text or "")
+        elif tag == _w("br"):
+            if child.get(_w("type"), "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag in RUN_TEXT:
+            parts.append(RUN_TEXT[tag])
+    return "".join(parts)
+
+
+def _is_bold(run: ET.Element) -> bool:
+    rpr = run.find(_w("rPr"))
+    if rpr is None:
+        return False
+    b = rpr.find(_w("b"))
+    return b is not None and b.get(VAL, "true").lower() not in FALSE_VALUES
+
+
+def paragraph_text(p: ET.Element) -> str:
+    """Texto do parágrafo: runs diretos e runs de hyperlinks"""
+    parts = []
+    for child in p:
+        if child.tag == R:
+            parts.append(_run_text(child))
+        elif child.tag == HYPERLINK:
+            parts.extend(_run_text(r) for r in child.findall(R))
+    return "".join(parts)
+
+
+def _paragraph_event(p: ET.Element, style_names: Dict[Optional[str], str]) -> Dict:
+    ppr = p.find(_w("pPr"))
+    style_el = ppr.find(_w("pStyle")) if ppr is not None else None
+    style_id = style_el.get(VAL) if style_el is not None else None
+    style = style_names.get(style_id, style_names.get(None, ""))
+
+    return {
+        "type": "paragraph",
+        "text": paragraph_text(p),
+        "style": style or "",
+        # Como em python-docx: negrito direto em algum run do parágrafo
+        "bold": any(_is_bold(r) for r in p.findall(R)),
+    }
+
+
+def _table_rows(tbl: ET.Element) -> List[List[str]]:
+    """
+    Linhas da tabela com uma célula por coluna da grade
+
+    Células com gridSpan se repetem em cada coluna coberta e células com
+    vMerge="continue" herdam o texto da célula acima, como em python-docx.
+    """
+    rows = []
+    above: Dict[int, str] = {}
+    for tr in tbl.findall(TR):
+        trpr = tr.find(_w("trPr"))
+        before = trpr.find(_w("gridBefore")) if trpr is not None else None
+        offset = int(before.get(VAL, "0")) if before is not None else 0
+
+        cells = []
+        current: Dict[int, str] = {}
+        for tc in tr.findall(TC):
+            tcpr = tc.find(_w("tcPr"))
+            span, vmerge = 1, None
+            if tcpr is not None:
+                span_el = tcpr.find(_w("gridSpan"))
+                if span_el is not None:
+                    span = int(span_el.get(VAL, "1"))
+                vmerge_el = tcpr.find(_w("vMerge"))
+                if vmerge_el is not None:
+                    vmerge = vmerge_el.get(VAL, "continue")
+
+            if vmerge == "continue":
+                text = above.get(offset, "")
+            else:
+                text = "\n".join(paragraph_text(p) for p in tc.findall(P))
+
+            for col in range(offset, offset + span):
+                current[col] = text
+                cells.append(text)
+            offset += span
+
+        above = current
+        rows.append(cells)
+    return rows
+
+
+def iter_docx_events(source) -> Iterator[Dict]:
+    """
+    Emite parágrafos e tabelas do corpo do DOCX em ordem de documento
+
+    Args:
+        source: Caminho do arquivo ou objeto file-like com o DOCX
+
+    Yields:
+        {'type': 'paragraph', 'text', 'style', 'bold'} ou
+        {'type': 'table', 'rows': [[texto da célula, ...], ...]}
+    """
+    with zipfile.ZipFile(source) as zf:
+        style_names = load_style_names(zf)
+
+        with zf.open("word/document.xml") as xml_file:
+            depth = 0
+            body = None
+            for event, elem in ET.iterparse(xml_file, events=("start", "end")):
+                if event == "start":
+                    depth += 1
+                    if elem.tag == BODY:
+                        body = elem
+                    continue
+
+                depth -= 1
+                # Só filhos diretos do corpo: document(1) > body(2) > p/tbl(3)
+                if body is None or depth != 2:
+                    continue
+
+                if elem.tag == P:
+                    yield _paragraph_event(elem, style_names)
+                elif elem.tag == TBL:
+                    yield {"type": "table", "rows": _table_rows(elem)}
+
+                # Libera o elemento já processado
+                elem.clear()
+                body.remove(elem)
@@ -0,0 +1,68 @@
+"""
+Extração paralela de páginas de PDF com pool de processos.
+
+Cada worker abre o próprio handle do documento e processa um intervalo
+contíguo de páginas; os resultados voltam na ordem das páginas, então a
+segmentação de cláusulas continua determinística.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterator, List, Tuple
+
+# Abaixo disso o custo de subir processos não compensa
+MIN_PAGES_PER_WORKER = 4
+
+
+def default_workers() -> int:
+    """Número de workers padrão (núcleos disponíveis)"""
+    return os.cpu_count() or 1
+
+
+def split_page_ranges(num_pages: int, workers: int, chunks_per_worker: int = 4) -> List[Tuple[int, int]]:
+    """
+    Divide [0, num_pages) em intervalos contíguos para os workers
+
+    Gera alguns intervalos por worker para balancear páginas com custos
+    diferentes (ex: páginas com tabelas).
+
+    Args:
+        num_pages: Total de páginas
+        workers: Número de processos
+        chunks_per_worker: Intervalos por worker
+
+    Returns:
+        Lista de (inicio, fim) em ordem, fim exclusivo
+    """
+    if num_pages <= 0:
+        return []
+
+    num_chunks = max(1, min(num_pages // MIN_PAGES_PER_WORKER, workers * chunks_per_worker))
+    size = -(-num_pages // num_chunks)  # divisão com teto
+    return [(start, min(start + size, num_pages)) for start in range(0, num_pages, size)]
+
+
+def map_page_ranges(func: Callable, path: str, num_pages: int, workers: int) -> Iterator:
+    """
+    Executa func(path, inicio, fim) em paralelo e devolve os resultados em ordem
+
+    Args:
+        func: Função de nível de módulo (picklable) que devolve lista por página
+        path: Caminho do PDF (cada worker abre seu próprio handle)
+        num_pages: Total de páginas
+        workers: Número de processos
+
+    Yields:
+        Itens de cada intervalo, na ordem das páginas
+    """
+    ranges = split_page_ranges(num_pages, workers)
+
+    if workers <= 1 or len(ranges) <= 1:
+        for start, end in ranges:
+            yield from func(path, start, end)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as pool:
+        futures = [pool.submit(func, path, start, end) for start, end in ranges]
+        for future in futures:
+            yield from future.result()
@@ -1,19 +1,29 @@
 import fitz  # PyMuPDF
-from typing import List, Dict
+from typing import List, Dict, Iterator
+from .parallel import map_page_ranges
+from .source import is_path, open_source, source_buffer
 
-def extract_blocks(pdf_path: str) -> List[Dict]:
+def open_pdf(source):
+    """Abre o PDF de um caminho ou do conteúdo em memória (sem copiar o buffer)"""
+    if is_path(source):
+        return fitz.open(source)
+    return fitz.open(stream=source_buffer(source), filetype="pdf")
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> List[Dict]:
     """
-    Extrai blocos de texto de um PDF usando PyMuPDF, preservando página e bbox.
+    Extrai blocos das páginas [start, end) com um handle próprio do documento.
 
     Args:
-        pdf_path: Caminho para o arquivo PDF
+        pdf_path: Caminho para o arquivo PDF ou conteúdo em memória
+        start: Primeira página (0-based)
+        end: Página final (exclusiva)
 
     Returns:
         Lista de dicionários com {page, bbox, text}
     """
-    doc = fitz.open(pdf_path)
+    doc = open_pdf(pdf_path)
     out = []
-    for pno in range(len(doc)):
+    for pno in range(start, end):
         page = doc[pno]
         # blocks: (x0, y0, x1, y1, "text", block_no, block_type, ...)
         for b in page.get_text("blocks", sort=True):
@@ -28,3 +38,130 @@ def extract_blocks(pdf_path: str) -> List[Dict]:
             })
     doc.close()
     return out
+
+def extract_blocks(pdf_path: str, workers: int = 1) -> List[Dict]:
+    """
+    Extrai blocos de texto de um PDF usando PyMuPDF, preservando página e bbox.
+
+    Args:
+        pdf_path: Caminho para o arquivo PDF, ou conteúdo em memória (bytes,
+            memoryview, BytesIO)
+        workers: Processos para extração paralela (1 = serial); a ordem dos
+            blocos é a mesma da extração serial. Conteúdo em memória é
+            extraído no próprio processo.
+
+    Returns:
+        Lista de dicionários com {page, bbox, text}
+    """
+    with open_pdf(pdf_path) as doc:
+        num_pages = len(doc)
+    if not is_path(pdf_path):
+        return _extract_page_range(pdf_path, 0, num_pages)
+    return list(map_page_ranges(_extract_page_range, str(pdf_path), num_pages, workers))
+
+def page_has_table_grid(page, min_lines: int = 3) -> bool:
+    """
+    Verificação barata de tabela: procura linhas de grade (réguas) na página.
+
+    Conta segmentos horizontais e verticais desenhados (linhas e retângulos).
+    Uma borda de página isolada não passa; uma tabela com células passa.
+
+    Args:
+        page: Página PyMuPDF
+        min_lines: Mínimo de réguas em cada direção
+
+    Returns:
+        True se a página provavelmente contém uma tabela com grade
+    """
+    horizontal = vertical = 0
+    for drawing in page.get_drawings():
+        for item in drawing["items"]:
+            kind = item[0]
+            if kind == "l":
+                p1, p2 = item[1], item[2]
+                if abs(p1.y - p2.y) < 1:
+                    horizontal += 1
+                elif abs(p1.x - p2.x) < 1:
+                    vertical += 1
+            elif kind == "re":
+                rect = item[1]
+                if rect.height < 2:
+                    horizontal += 1
+                elif rect.width < 2:
+                    vertical += 1
+                else:
+                    horizontal += 2
+                    vertical += 2
+            if horizontal >= min_lines and vertical >= min_lines:
+                return True
+    return False
+
+def _extract_pages_range(pdf_path: str, start: int, end: int) -> List[Dict]:
+    """
+    Extrai texto (blocos PyMuPDF) e tabelas das páginas [start, end).
+
+    O pdfplumber só é aberto para as páginas em que page_has_table_grid
+    indica uma tabela.
+
+    Args:
+        pdf_path: Caminho para o arquivo PDF ou conteúdo em memória
+        start: Primeira página (0-based)
+        end: Página final (exclusiva)
+
+    Returns:
+        Lista de {page, text, lines, tables}, no formato de parsing.iter_pdf_pages
+    """
+    doc = open_pdf(pdf_path)
+    pages = []
+    table_pages = []
+    for pno in range(start, end):
+        page = doc[pno]
+        height = float(page.rect.height) or 1.0
+        texts = []
+        lines = []
+        for b in page.get_text("blocks", sort=True):
+            text = (b[4] or "").strip()
+            if b[6] != 0 or not text:  # só blocos de texto
+                continue
+            texts.append(text)
+            # Posição do bloco para cada uma de suas linhas
+            lines.extend([(b[1] / height, b[3] / height)] * (text.count("\n") + 1))
+        pages.append({
+            "page": pno + 1,
+            "text": "\n".join(texts),
+            "lines": lines,
+            "tables": []
+        })
+        if page_has_table_grid(page):
+            table_pages.append(pno + 1)
+    doc.close()
+
+    if table_pages:
+        import pdfplumber
+
+        by_page = {p["page"]: p for p in pages}
+        with pdfplumber.open(open_source(pdf_path), pages=table_pages) as pdf:
+            for plumber_page in pdf.pages:
+                by_page[plumber_page.page_number]["tables"] = plumber_page.extract_tables() or []
+                plumber_page.close()
+
+    return pages
+
+def extract_pages(pdf_path: str, workers: int = 1) -> Iterator[Dict]:
+    """
+    Páginas de texto + tabelas via PyMuPDF, com pdfplumber só onde há tabela.
+
+    Args:
+        pdf_path: Caminho para o arquivo PDF ou conteúdo em memória
+        workers: Processos para extração paralela (1 = serial; conteúdo em
+            memória é sempre extraído no próprio processo)
+
+    Yields:
+        {page, text, lines, tables} em ordem de página
+    """
+    with open_pdf(pdf_path) as doc:
+        num_pages = len(doc)
+    if not is_path(pdf_path):
+        yield from _extract_pages_range(pdf_path, 0, num_pages)
+        return
+    yield from map_page_ranges(_extract_pages_range, str(pdf_path), num_pages, workers)
@@ -0,0 +1,172 @@
+"""
+Árvore de seções de um documento (títulos por nível).
+
+Os blocos extraídos referenciam o nó da seção em que estão (section_id).
+Como os blocos são emitidos na ordem do documento, os blocos de uma seção
+e de todas as subseções formam um intervalo contínuo [start, end), então
+"blocos sob a cláusula 5", "título-pai do bloco i" e "irmãos de uma
+seção" são respondidos sem percorrer a lista de blocos.
+"""
+
+from typing import Dict, List, Optional
+
+from .consolidate import numbering
+
+ROOT_ID = 0
+PATH_SEP = " > "
+
+
+def number_key(title: str) -> Optional[str]:
+    """Número do título para busca ("CLÁUSULA 5" -> "5", "5.1 Objeto" -> "5.1")"""
+    kind, parts = numbering(title)
+    if parts and kind in ('keyword', 'number'):
+        return '.'.join(str(p) for p in parts)
+    return None
+
+
+class SectionNode:
+    """Seção do documento (o nó 0 é a raiz, sem título)"""
+
+    __slots__ = ('id', 'level', 'title', 'parent', 'children', 'path', 'start', 'end')
+
+    def __init__(self, node_id: int, level: int, title: str, parent: Optional[int], path: str, start: int):
+        self.id = node_id
+        self.level = level
+        self.title = title
+        self.parent = parent
+        self.children: List[int] = []
+        self.path = path
+        self.start = start
+        self.end = start
+
+    def to_dict(self) -> Dict:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+class SectionTree:
+    """
+    Seções por nível, montada em streaming junto com a extração de blocos
+
+    open() recebe cada título com seu nível e fecha as seções de nível
+    igual ou maior; mark() informa que um bloco foi emitido na seção atual.
+    O caminho ("1 > 1.2 > Obrigações") é montado uma vez por seção, não
+    por bloco.
+    """
+
+    def __init__(self):
+        self.nodes: List[SectionNode] = [SectionNode(ROOT_ID, 0, "", None, "", 0)]
+        self.by_number: Dict[str, int] = {}
+        self._stack: List[int] = [ROOT_ID]
+        self._num_blocks = 0
+
+    @property
+    def current(self) -> int:
+        """Seção aberta (a mais profunda)"""
+        return self._stack[-1]
+
+    def open(self, title: str, level: int) -> int:
+        """
+        Abre uma seção
+
+        Args:
+            title: Texto do título
+            level: Nível (1 = Heading 1); seções abertas de nível >= são fechadas
+
+        Returns:
+            Id do nó criado
+        """
+        level = max(level, 1)
+        while len(self._stack) > 1 and self.nodes[self._stack[-1]].level >= level:
+            self._close()
+
+        parent = self.nodes[self._stack[-1]]
+        path = f"{parent.path}{PATH_SEP}{title}" if parent.path else title
+        node = SectionNode(len(self.nodes), level, title, parent.id, path, self._num_blocks)
+        self.nodes.append(node)
+        parent.children.append(node.id)
+        self._stack.append(node.id)
+
+        key = number_key(title)
+        if key:
+            self.by_number.setdefault(key, node.id)
+        return node.id
+
+    def mark(self) -> int:
+        """Registra um bloco na seção atual e devolve o id dela"""
+        self._num_blocks += 1
+        return self._stack[-1]
+
+    def _close(self):
+        self.nodes[self._stack.pop()].end = self._num_blocks
+
+    def finish(self) -> 'SectionTree':
+        """Fecha as seções abertas (ao fim do documento)"""
+        while len(self._stack) > 1:
+            self._close()
+        self.nodes[ROOT_ID].end = self._num_blocks
+        return self
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __getitem__(self, node_id: int) -> SectionNode:
+        return self.nodes[node_id]
+
+    def parent(self, node_id: int) -> Optional[SectionNode]:
+        """Seção-mãe (None para a raiz)"""
+        parent = self.nodes[node_id].parent
+        return self.nodes[parent] if parent is not None else None
+
+    def children(self, node_id: int) -> List[SectionNode]:
+        """Subseções diretas"""
+        return [self.nodes[c] for c in self.nodes[node_id].children]
+
+    def siblings(self, node_id: int) -> List[SectionNode]:
+        """Seções com a mesma mãe (sem a própria)"""
+        parent = self.nodes[node_id].parent
+        if parent is None:
+            return []
+        return [self.nodes[c] for c in self.nodes[parent].children if c != node_id]
+
+    def blocks_under(self, node_id: int) -> range:
+        """Índices dos blocos da seção e de todas as subseções"""
+        node = self.nodes[node_id]
+        return range(node.start, node.end)
+
+    def own_blocks(self, node_id: int) -> range:
+        """Índices dos blocos da seção antes da primeira subseção"""
+        node = self.nodes[node_id]
+        end = self.nodes[node.children[0]].start if node.children else node.end
+        return range(node.start, end)
+
+    def section_of(self, block: Dict) -> SectionNode:
+        """Seção de um bloco (pelo section_id)"""
+        return self.nodes[block['section_id']]
+
+    def find(self, number: str) -> Optional[SectionNode]:
+        """Seção pelo número do título ("5" para CLÁUSULA 5, "5.1")"""
+        node_id = self.by_number.get(number)
+        return self.nodes[node_id] if node_id is not None else None
+
+    def to_dict(self) -> Dict:
+        return {'nodes': [node.to_dict() for node in self.nodes]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'SectionTree':
+        tree = cls()
+        tree.nodes = []
+        for item in data['nodes']:
+            node = SectionNode(item['id'], item['level'], item['title'], item['parent'],
+                               item['path'], item['start'])
+            node.children = list(item['children'])
+            node.end = item['end']
+            tree.nodes.append(node)
+            key = number_key(node.title) if node.id != ROOT_ID else None
+            if key:
+                tree.by_number.setdefault(key, node.id)
+        tree._num_blocks = tree.nodes[ROOT_ID].end
+        return tree
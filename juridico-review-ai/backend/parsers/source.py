@@ -0,0 +1,72 @@
+"""
+Origem do documento: caminho em disco ou conteúdo em memória.
+
+Uploads (Streamlit, API) já chegam como bytes/BytesIO; gravar em arquivo
+temporário só para reabrir faz o conteúdo passar duas vezes pela memória e
+cria colisão de nomes entre usuários. Os leitores (pdfplumber, PyMuPDF,
+python-docx, zipfile) aceitam objetos file-like, então aqui só se adapta a
+origem sem copiar o buffer.
+"""
+
+import io
+import os
+from typing import Union
+
+BUFFER_TYPES = (bytes, bytearray, memoryview)
+
+Source = Union[str, os.PathLike, bytes, bytearray, memoryview, io.IOBase]
+
+
+def is_path(source) -> bool:
+    """A origem é um caminho de arquivo"""
+    return isinstance(source, (str, os.PathLike))
+
+
+def source_name(source) -> str:
+    """Nome do arquivo de origem, se houver (caminho ou atributo name do upload)"""
+    if is_path(source):
+        return os.fspath(source)
+    return getattr(source, 'name', '') or ''
+
+
+def source_buffer(source) -> memoryview:
+    """
+    Visão sem cópia do conteúdo em memória
+
+    Args:
+        source: bytes, bytearray, memoryview ou file-like (BytesIO/upload)
+
+    Returns:
+        memoryview do conteúdo
+    """
+    if isinstance(source, BUFFER_TYPES):
+        return memoryview(source)
+    if hasattr(source, 'getbuffer'):
+        return source.getbuffer()
+    # File-like genérico: não há buffer para expor, lê uma vez
+    source.seek(0)
+    return memoryview(source.read())
+
+
+def open_source(source):
+    """
+    Origem no formato aceito pelos leitores (pdfplumber, python-docx, zipfile)
+
+    Args:
+        source: Caminho, bytes/bytearray/memoryview ou file-like
+
+    Returns:
+        Caminho (str) ou file-like posicionado no início. bytes e memoryview
+        de bytes inteiros viram um BytesIO que compartilha o buffer.
+    """
+    if is_path(source):
+        return os.fspath(source)
+
+    if isinstance(source, memoryview) and isinstance(source.obj, bytes) \
+            and source.nbytes == len(source.obj):
+        source = source.obj
+    if isinstance(source, BUFFER_TYPES):
+        return io.BytesIO(source)
+
+    source.seek(0)
+    return source
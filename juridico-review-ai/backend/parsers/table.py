@@ -0,0 +1,188 @@
+"""
+Modelo colunar de tabelas extraídas de DOCX/PDF.
+
+Cronogramas de amortização e tabelas de pagamento chegam a centenas de
+linhas; como texto corrido ("célula | célula" por linha) viram cláusulas
+enormes que são embedadas, pontuadas no BM25 e truncadas nos prompts. A
+tabela fica guardada por colunas (cabeçalho + colunas tipadas) e expõe:
+
+- summary(): visão compacta para ranking e prompts (cabeçalho, número de
+  linhas, mínimo/máximo das colunas numéricas e de datas)
+- text() / rows(): linhas completas, para relatórios
+"""
+
+import re
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Sequence
+
+# Tabelas com mais linhas de dados que isso viram resumo no conteúdo da cláusula
+COMPACT_MIN_ROWS = 10
+
+# Fração mínima de células não vazias que precisam ser do tipo da coluna
+MIN_TYPED_RATIO = 0.9
+
+CELL_SEP = ' | '
+
+NUMBER_PATTERN = re.compile(
+    r'^(?:R\$\s*)?-?(?:\d{1,3}(?:\.\d{3})+|\d+)(?:,\d+)?\s*%?$'
+)
+DATE_PATTERN = re.compile(r'^(\d{1,2})/(\d{1,2})/(\d{2}|\d{4})$')
+ISO_DATE_PATTERN = re.compile(r'^(\d{4})-(\d{2})-(\d{2})$')
+
+KIND_LABELS = {'number': 'número', 'date': 'data'}
+
+
+def parse_number(text: str) -> Optional[float]:
+    """Número no formato brasileiro ("R$ 1.234,56", "12,5%") ou None"""
+    if not NUMBER_PATTERN.match(text):
+        return None
+    digits = text.replace('R$', '').replace('%', '').replace('.', '').replace(',', '.')
+    return float(digits.replace(' ', ''))
+
+
+def parse_date(text: str) -> Optional[date]:
+    """Data dd/mm/aaaa (ou dd/mm/aa, aaaa-mm-dd) ou None"""
+    match = DATE_PATTERN.match(text)
+    if match:
+        day, month, year = (int(g) for g in match.groups())
+        if year < 100:
+            year += 2000
+    else:
+        match = ISO_DATE_PATTERN.match(text)
+        if not match:
+            return None
+        year, month, day = (int(g) for g in match.groups())
+
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+PARSERS = {'number': parse_number, 'date': parse_date}
+
+
+def _clean_cell(cell) -> str:
+    return ' '.join(str(cell).split()) if cell else ''
+
+
+def infer_kind(values: Sequence[str]) -> str:
+    """
+    Tipo de uma coluna a partir das células não vazias
+
+    Returns:
+        'number', 'date' ou 'text'
+    """
+    filled = [v for v in values if v]
+    if not filled:
+        return 'text'
+
+    for kind in ('date', 'number'):
+        parser = PARSERS[kind]
+        typed = sum(1 for v in filled if parser(v) is not None)
+        if typed >= MIN_TYPED_RATIO * len(filled):
+            return kind
+    return 'text'
+
+
+class Table:
+    """
+    Tabela guardada por colunas
+
+    Células ficam como texto (já normalizado) em uma lista por coluna; o
+    tipo de cada coluna é inferido na construção.
+    """
+
+    __slots__ = ('header', 'columns', 'kinds')
+
+    def __init__(self, header: List[str], columns: List[List[str]], kinds: Optional[List[str]] = None):
+        self.header = header
+        self.columns = columns
+        self.kinds = kinds if kinds is not None else [infer_kind(col) for col in columns]
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Sequence]) -> Optional['Table']:
+        """
+        Monta a tabela a partir das linhas extraídas
+
+        Args:
+            rows: Linhas como listas de células (None/'' para vazias); a
+                primeira linha não vazia é o cabeçalho
+
+        Returns:
+            Table ou None se a tabela estiver vazia
+        """
+        cleaned = []
+        for row in rows:
+            cells = [_clean_cell(cell) for cell in row or ()]
+            if any(cells):
+                cleaned.append(cells)
+
+        if not cleaned:
+            return None
+
+        width = max(len(cells) for cells in cleaned)
+        header = cleaned[0] + [''] * (width - len(cleaned[0]))
+        columns = [[] for _ in range(width)]
+        for cells in cleaned[1:]:
+            for i in range(width):
+                columns[i].append(cells[i] if i < len(cells) else '')
+
+        return cls(header, columns)
+
+    @property
+    def n_rows(self) -> int:
+        """Linhas de dados (sem o cabeçalho)"""
+        return len(self.columns[0]) if self.columns else 0
+
+    @property
+    def n_columns(self) -> int:
+        return len(self.columns)
+
+    def rows(self) -> Iterator[List[str]]:
+        """Linhas de dados completas (sem o cabeçalho)"""
+        return (list(cells) for cells in zip(*self.columns))
+
+    def text(self) -> str:
+        """Tabela completa como texto, uma linha por linha da tabela"""
+        lines = [CELL_SEP.join(c for c in self.header if c)]
+        lines.extend(CELL_SEP.join(c for c in cells if c) for cells in zip(*self.columns))
+        return '\n'.join(lines)
+
+    def column_range(self, i: int):
+        """(menor, maior) célula de uma coluna numérica/de datas, no texto original"""
+        parser = PARSERS.get(self.kinds[i])
+        if parser is None:
+            return None
+
+        typed = [(parser(v), v) for v in self.columns[i] if v]
+        typed = [(value, v) for value, v in typed if value is not None]
+        if not typed:
+            return None
+        return min(typed)[1], max(typed)[1]
+
+    def summary(self) -> str:
+        """Visão compacta: cabeçalho, tamanho e intervalos das colunas tipadas"""
+        lines = [
+            f"Tabela com {self.n_rows} linhas e {self.n_columns} colunas",
+            f"Colunas: {CELL_SEP.join(h or f'Coluna {i + 1}' for i, h in enumerate(self.header))}"
+        ]
+        for i, kind in enumerate(self.kinds):
+            value_range = self.column_range(i)
+            if value_range:
+                name = self.header[i] or f"Coluna {i + 1}"
+                lines.append(f"{name} ({KIND_LABELS[kind]}): {value_range[0]} a {value_range[1]}")
+        return '\n'.join(lines)
+
+    def content(self, compact_min_rows: int = COMPACT_MIN_ROWS) -> str:
+        """Conteúdo da cláusula: texto completo, ou resumo se a tabela for grande"""
+        if self.n_rows > compact_min_rows:
+            return self.summary()
+        return self.text()
+
+    def to_dict(self) -> Dict:
+        return {'header': self.header, 'columns': self.columns, 'kinds': self.kinds}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Table':
+        return cls(data['header'], data['columns'], data.get('kinds'))
@@ -4,31 +4,101 @@ Suporta: CLÁUSULA, CAPÍTULO, ANEXO, tabelas e placeholders
 """
 
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional, Iterable, Iterator
 import docx
 import PyPDF2
 import pdfplumber
 import re
 
+try:
+    from .parsers.cache import ParseCache, compute_file_hash
+    from .parsers.parallel import map_page_ranges
+    from .parsers.ooxml import iter_docx_events as iter_ooxml_events
+    from .parsers.headings import classify_line
+    from .parsers.layout import RepeatedLineStripper
+    from .parsers.consolidate import FragmentConsolidator
+    from .parsers.table import Table, CELL_SEP
+    from .parsers.source import is_path, open_source, source_name
+    from .parsers.clause import Clause, TextBuffer, FIELDS as CLAUSE_FIELDS
+except ImportError:
+    from parsers.cache import ParseCache, compute_file_hash
+    from parsers.parallel import map_page_ranges
+    from parsers.ooxml import iter_docx_events as iter_ooxml_events
+    from parsers.headings import classify_line
+    from parsers.layout import RepeatedLineStripper
+    from parsers.consolidate import FragmentConsolidator
+    from parsers.table import Table, CELL_SEP
+    from parsers.source import is_path, open_source, source_name
+    from parsers.clause import Clause, TextBuffer, FIELDS as CLAUSE_FIELDS
+
+# Incrementar sempre que a segmentação mudar (invalida o cache de parsing)
+PARSER_VERSION = "5"
+
+PDF_BACKENDS = ('pdfplumber', 'pymupdf')
+
 
 class Document:
     """Representa um documento parseado"""
 
-    def __init__(self, filepath: str):
+    def __init__(self, filepath: str, source=None):
         self.filepath = Path(filepath)
         self.filename = self.filepath.name
-        self.clauses = []
+        # O que os parsers leem: o próprio caminho ou o conteúdo em memória
+        self.source = filepath if source is None else source
+        self.clauses: List[Clause] = []
         self.metadata = {}
+        self.from_cache = False
+        # Texto de todas as cláusulas; cada Clause guarda só offsets
+        self.text_buffer = TextBuffer()
 
-    def add_clause(self, title: str, content: str, section: str = None, source: str = "paragraph"):
+    def add_clause(self, title: str, content: str, section: str = None, source: str = "paragraph") -> Clause:
         """Adiciona uma cláusula ao documento"""
-        self.clauses.append({
-            'title': title,
-            'content': content,
-            'section': section,
-            'source': source,  # paragraph, table, anexo, capitulo
-            'index': len(self.clauses)
-        })
+        clause = Clause(
+            self.text_buffer,
+            title,
+            content,
+            section=section,
+            source=source,  # paragraph, table, anexo, capitulo
+            index=len(self.clauses)
+        )
+        self.clauses.append(clause)
+        return clause
+
+    def to_dict(self) -> Dict:
+        """Serializa o documento (cláusulas + metadata) para JSON"""
+        return {
+            'parser_version': PARSER_VERSION,
+            'filename': self.filename,
+            'clauses': [clause.to_dict() for clause in self.clauses],
+            'metadata': self.metadata
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, filepath: str) -> 'Document':
+        """
+        Reconstrói um documento serializado por to_dict
+
+        Args:
+            data: Payload de to_dict
+            filepath: Caminho atual do arquivo (o nome pode ter mudado)
+
+        Returns:
+            Document sem reler o arquivo original
+        """
+        doc = cls(filepath)
+        for data_clause in data.get('clauses', []):
+            doc.add_clause(
+                data_clause['title'],
+                data_clause['content'],
+                data_clause.get('section'),
+                source=data_clause.get('source', 'paragraph')
+            )
+            # Chaves extras (ex: page)
+            for key, value in data_clause.items():
+                if key not in CLAUSE_FIELDS:
+                    doc.clauses[-1][key] = value
+        doc.metadata = data.get('metadata', {})
+        return doc
 
 
 def normalize_text(text: str) -> str:
@@ -45,38 +115,94 @@ def normalize_text(text: str) -> str:
     return text.strip()
 
 
-def parse_document(filepath: str) -> Document:
+def parse_document(filepath, cache: Optional[ParseCache] = None, workers: int = 1,
+                   pdf_backend: str = 'pdfplumber', docx_reader: str = 'ooxml',
+                   strip_layout: bool = True, consolidate: bool = True,
+                   filename: Optional[str] = None, file_hash: Optional[str] = None) -> Document:
     """
     Parse de documento DOCX ou PDF
 
     Args:
-        filepath: Caminho para o arquivo
+        filepath: Caminho para o arquivo, ou o conteúdo em memória (bytes,
+            memoryview, BytesIO/upload do Streamlit), lido sem arquivo
+            temporário
+        cache: Cache de parsing (opcional). Se informado, documentos já
+            parseados são devolvidos sem reabrir o arquivo original.
+        workers: Processos para extração paralela de páginas do PDF
+            (não altera o resultado, apenas o tempo)
+        pdf_backend: Backend de extração de PDF: 'pdfplumber' ou 'pymupdf'
+        docx_reader: Leitor de DOCX: 'ooxml' (streaming) ou 'python-docx'
+        strip_layout: Remove cabeçalhos/rodapés repetidos e números de
+            página do PDF antes da segmentação
+        consolidate: Mescla subitens, valores/datas e corpos curtos do PDF
+            na cláusula-mãe
+        filename: Nome do arquivo, para conteúdo em memória sem atributo
+            name (define o formato pela extensão)
+        file_hash: SHA-256 já calculado do conteúdo (evita hashear de novo)
 
     Returns:
         Objeto Document com cláusulas extraídas
     """
-    path = Path(filepath)
-    doc = Document(filepath)
-
-    if path.suffix.lower() == '.docx':
-        return parse_docx(doc)
-    elif path.suffix.lower() == '.pdf':
-        return parse_pdf(doc)
+    if is_path(filepath):
+        path = Path(filepath)
     else:
+        path = Path(filename or source_name(filepath))
+        if not path.name:
+            raise ValueError("Informe filename para documentos em memória")
+    suffix = path.suffix.lower()
+
+    if suffix not in ('.docx', '.pdf'):
         raise ValueError(f"Formato não suportado: {path.suffix}")
 
+    cache_key = None
+    if cache is not None:
+        file_hash = file_hash or compute_file_hash(filepath)
+        options = {'format': suffix}
+        if suffix == '.pdf':
+            options['pdf_backend'] = pdf_backend
+            options['strip_layout'] = strip_layout
+            options['consolidate'] = consolidate
+        else:
+            options['docx_reader'] = docx_reader
+        cache_key = cache.make_key(file_hash, PARSER_VERSION, options)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            doc = Document.from_dict(cached, str(path))
+            doc.from_cache = True
+            return doc
+
+    doc = Document(str(path), source=filepath)
+
+    if suffix == '.docx':
+        doc = parse_docx(doc, reader=docx_reader)
+    else:
+        doc = parse_pdf(doc, workers=workers, backend=pdf_backend, strip_layout=strip_layout,
+                        consolidate=consolidate)
 
-def extract_table_content(table) -> List[Dict]:
+    if file_hash is not None:
+        doc.metadata['sha256'] = file_hash
+    if cache is not None:
+        cache.put(cache_key, doc.to_dict())
+
+    return doc
+
+
+def table_rows_content(rows: List[List[str]]) -> List[Dict]:
     """
-    Extrai conteúdo de tabelas do DOCX
-    Retorna lista de células relevantes
+    Junta as células de cada linha de uma tabela DOCX
+
+    Args:
+        rows: Linhas da tabela como listas de textos de célula
+
+    Returns:
+        Lista de {'row_index', 'text'} das linhas não vazias
     """
     table_data = []
 
-    for i, row in enumerate(table.rows):
+    for i, row in enumerate(rows):
         row_text = []
-        for cell in row.cells:
-            cell_text = normalize_text(cell.text)
+        for cell in row:
+            cell_text = normalize_text(cell)
             if cell_text:
                 row_text.append(cell_text)
 
@@ -91,7 +217,62 @@ def extract_table_content(table) -> List[Dict]:
     return table_data
 
 
-def parse_docx(doc: Document) -> Document:
+def extract_table_content(table) -> List[Dict]:
+    """
+    Extrai conteúdo de tabelas do DOCX
+    Retorna lista de células relevantes
+    """
+    return table_rows_content([[cell.text for cell in row.cells] for row in table.rows])
+
+
+DOCX_READERS = ('python-docx', 'ooxml')
+
+
+def iter_python_docx_events(filepath) -> Iterator[Dict]:
+    """
+    Eventos de parágrafo/tabela via python-docx (parágrafos, depois tabelas)
+
+    Mesmo formato de parsers.ooxml.iter_docx_events.
+    """
+    docx_file = docx.Document(open_source(filepath))
+
+    for para in docx_file.paragraphs:
+        style_name = ''
+        is_bold = False
+        try:
+            style_name = getattr(para.style, 'name', '') or ''
+
+            # Verifica se tem runs em negrito
+            for run in para.runs:
+                if run.bold:
+                    is_bold = True
+                    break
+        except:
+            pass
+
+        yield {'type': 'paragraph', 'text': para.text, 'style': style_name, 'bold': is_bold}
+
+    for table in docx_file.tables:
+        yield {'type': 'table', 'rows': [[cell.text for cell in row.cells] for row in table.rows]}
+
+
+def iter_docx_events(filepath, reader: str = 'ooxml') -> Iterator[Dict]:
+    """
+    Escolhe o leitor de DOCX
+
+    Args:
+        filepath: Caminho do arquivo ou conteúdo em memória
+        reader: 'ooxml' (streaming do XML, padrão) ou 'python-docx'
+    """
+    if reader not in DOCX_READERS:
+        raise ValueError(f"Leitor de DOCX desconhecido: {reader}")
+
+    if reader == 'python-docx':
+        return iter_python_docx_events(filepath)
+    return iter_ooxml_events(open_source(filepath))
+
+
+def parse_docx(doc: Document, reader: str = 'ooxml') -> Document:
     """
     Parse ULTRA ROBUSTO para arquivos DOCX
 
@@ -103,87 +284,39 @@ def parse_docx(doc: Document) -> Document:
     - Títulos com formatação (Bold, Heading)
     - Texto em MAIÚSCULAS como título
     - Conteúdo de TABELAS
-    """
-    docx_file = docx.Document(doc.filepath)
 
+    Lê o documento em uma única passada (parágrafos, estilos, negrito e
+    tabelas); ver iter_docx_events para os leitores disponíveis.
+    """
     current_clause = None
     current_content = []
     current_section = None
 
-    # Processa PARÁGRAFOS
-    for idx, para in enumerate(docx_file.paragraphs):
-        text = normalize_text(para.text)
+    # Coletados na mesma passada: parágrafos para o fallback e tabelas
+    all_paragraphs = []
+    tables = []
+    num_paragraphs = 0
 
-        if not text or len(text) < 3:
+    # Processa PARÁGRAFOS
+    for event in iter_docx_events(doc.source, reader):
+        if event['type'] == 'table':
+            tables.append(event['rows'])
             continue
 
-        # ====== DETECÇÃO DE TÍTULOS/CLÁUSULAS ======
-        
-        # 1. REGEX para palavras-chave comuns
-        heading_match = re.match(
-            r'^(cl[áa]usula|se[çc][ãa]o|cap[íi]tulo|anexo|item|art|artigo|t[íi]tulo|par[áa]grafo)\s+(.+)$',
-            text,
-            re.IGNORECASE
-        )
-
-        # 2. Numeração com ou sem título (muito flexível)
-        number_match = re.match(
-            r'^(\d+(\.\d+){0,3})[\.\)\s]*[-–—]?\s*(.*)$',
-            text
-        )
-
-        # 3. Letras (a), (b), etc.
-        letter_match = re.match(
-            r'^([a-z]\)|[a-z]\.|[A-Z]\)|[A-Z]\.)\s+(.+)$',
-            text
-        )
-
-        # 4. Verifica formatação (Bold, Heading, etc.)
-        is_bold = False
-        is_heading_style = False
-        try:
-            style_name = getattr(para.style, 'name', '').lower()
-            is_heading_style = 'heading' in style_name or 'título' in style_name or 'title' in style_name
-            
-            # Verifica se tem runs em negrito
-            for run in para.runs:
-                if run.bold:
-                    is_bold = True
-                    break
-        except:
-            pass
+        num_paragraphs += 1
+        text = normalize_text(event['text'])
 
-        # 5. Texto em MAIÚSCULAS (possível título)
-        is_upper = text.isupper() and len(text.split()) >= 3 and len(text.split()) <= 15
+        if text and len(text) > 30:  # Ignora linhas muito curtas no fallback
+            all_paragraphs.append(text)
 
-        # 6. Linha curta seguida de dois pontos (ex: "Prazo:")
-        colon_match = re.match(r'^([^:]+):\s*$', text)
+        if not text or len(text) < 3:
+            continue
 
-        # ====== DECIDE SE É TÍTULO ======
-        is_title = False
-        
-        if heading_match:
-            is_title = True
-        elif number_match and number_match.group(3):  # Tem número E texto
-            # É título se: tem formatação E (texto razoável OU maiúsculas)
-            has_text = len(number_match.group(3).strip()) > 10
-            is_short = len(text.split()) <= 20
-            # Só considera título se tiver formatação OU for maiúsculas
-            if has_text and (is_bold or is_heading_style or (is_upper and is_short)):
-                is_title = True
-        elif letter_match and len(text.split()) >= 3:  # Letras só se tiver texto razoável
-            is_title = True
-        elif is_heading_style:
-            is_title = True
-        elif is_bold and len(text.split()) >= 3 and len(text.split()) <= 15:  # Bold + comprimento razoável
-            is_title = True
-        elif is_upper and len(text) > 15 and len(text.split()) >= 3:  # MAIÚSCULAS com mínimo de palavras
-            is_title = True
-        elif colon_match and len(text) <= 80 and len(text.split()) >= 2:  # "Título:" com mínimo palavras
-            is_title = True
+        # ====== DETECÇÃO DE TÍTULOS/CLÁUSULAS ======
+        verdict = classify_line(text, 'docx', bold=event['bold'], style_name=event['style'])
 
         # ====== PROCESSA COMO TÍTULO OU CONTEÚDO ======
-        if is_title:
+        if verdict.is_title:
             # Salva cláusula anterior
             if current_clause:
                 doc.add_clause(
@@ -198,11 +331,8 @@ def parse_docx(doc: Document) -> Document:
             current_content = []
 
             # Determina seção
-            if heading_match:
-                tipo = heading_match.group(1).upper()
-                current_section = f"{tipo}: {heading_match.group(2)}"
-            elif is_upper and len(text.split()) <= 6:
-                current_section = text
+            if verdict.section:
+                current_section = verdict.section
 
         # Conteúdo da cláusula atual
         else:
@@ -226,13 +356,6 @@ def parse_docx(doc: Document) -> Document:
     # ====== FALLBACK: Se encontrou poucas cláusulas, divide por parágrafos grandes ======
     min_expected_clauses = 5
     if len(doc.clauses) < min_expected_clauses:
-        # Junta todos os parágrafos
-        all_paragraphs = []
-        for para in docx_file.paragraphs:
-            text = normalize_text(para.text)
-            if text and len(text) > 30:  # Ignora linhas muito curtas
-                all_paragraphs.append(text)
-        
         # Divide em chunks de ~500 palavras
         chunk_size = 100  # palavras por chunk
         current_chunk = []
@@ -272,149 +395,375 @@ def parse_docx(doc: Document) -> Document:
             )
 
     # Processa TABELAS
-    for table_idx, table in enumerate(docx_file.tables):
-        table_content = extract_table_content(table)
+    for table_idx, rows in enumerate(tables):
+        table = Table.from_rows([[normalize_text(cell) for cell in row] for row in rows])
 
-        if not table_content:
+        if table is None:
             continue
 
         # Primeira linha geralmente é cabeçalho/título
-        first_row = table_content[0]['text']
-
-        # Junta todas as linhas
-        all_rows = '\n'.join([row['text'] for row in table_content])
+        first_row = CELL_SEP.join(c for c in table.header if c)
 
-        # Adiciona como cláusula (com título da primeira linha)
-        doc.add_clause(
+        # Conteúdo: linhas completas ou resumo (tabelas grandes); as linhas
+        # ficam em clause['table'] para os relatórios
+        clause = doc.add_clause(
             title=f"TABELA {table_idx + 1}: {first_row[:80]}",
-            content=all_rows,
+            content=table.content(),
             section="TABELAS",
             source="table"
         )
+        clause['table'] = table.to_dict()
 
     # Metadata
     doc.metadata['total_clauses'] = len(doc.clauses)
-    doc.metadata['has_tables'] = len(docx_file.tables) > 0
-    doc.metadata['num_paragraphs'] = len(docx_file.paragraphs)
-    doc.metadata['num_tables'] = len(docx_file.tables)
+    doc.metadata['has_tables'] = len(tables) > 0
+    doc.metadata['num_paragraphs'] = num_paragraphs
+    doc.metadata['num_tables'] = len(tables)
 
     return doc
 
 
-def parse_pdf(doc: Document) -> Document:
+class PdfClauseSegmenter:
     """
-    Parse específico para arquivos PDF
-    Usa pdfplumber para melhor extração de texto e tabelas
-    """
-    with pdfplumber.open(doc.filepath) as pdf:
-        full_text = []
-        all_tables = []
-
-        for page_num, page in enumerate(pdf.pages):
-            # Extrai texto
-            text = page.extract_text()
-            if text:
-                full_text.append(text)
-
-            # Extrai tabelas
-            tables = page.extract_tables()
-            if tables:
-                for table_idx, table in enumerate(tables):
-                    all_tables.append({
-                        'page': page_num + 1,
-                        'table_idx': table_idx,
-                        'data': table
-                    })
-
-    # Processa texto completo
-    content = '\n'.join(full_text)
-    lines = content.split('\n')
+    Segmentação incremental de cláusulas em texto de PDF
 
-    current_clause = None
-    current_content = []
-    current_section = None
+    Recebe linhas uma a uma e devolve cada cláusula assim que o próximo
+    título a fecha. Mantém em memória apenas a cláusula em aberto. A página
+    de cada cláusula é a do seu título (onde ela começa), mesmo que o
+    conteúdo continue nas páginas seguintes.
+    """
 
-    for line in lines:
+    def __init__(self):
+        self.current_clause = None
+        self.current_content = []
+        self.current_section = None
+        self.current_page = None
+
+    def _close(self) -> Optional[Dict]:
+        if not self.current_clause:
+            return None
+        return {
+            'title': self.current_clause,
+            'content': '\n'.join(self.current_content),
+            'section': self.current_section,
+            'source': 'paragraph',
+            'page': self.current_page
+        }
+
+    def feed(self, line: str, page: Optional[int] = None) -> Optional[Dict]:
+        """
+        Processa uma linha
+
+        Args:
+            line: Linha de texto extraída do PDF
+            page: Página da linha (vira a página da cláusula que ela abre)
+
+        Returns:
+            Cláusula finalizada (dict) ou None
+        """
         text = normalize_text(line)
 
         if not text or len(text) < 3:
-            continue
+            return None
 
-        # REGEX EXPANDIDA: CLÁUSULA | CAPÍTULO | ANEXO | SEÇÃO
-        heading_match = re.match(
-            r'^(cl[áa]usula|se[çc][ãa]o|cap[íi]tulo|anexo)\s+(.+)$',
-            text,
-            re.IGNORECASE
-        )
+        verdict = classify_line(text, 'pdf')
+        finished = None
 
-        # Numeração
-        number_match = re.match(
-            r'^(\d+(\.\d+){0,2})\s*[-–—]?\s*(.+)$',
-            text
-        )
+        if verdict.is_title:
+            finished = self._close()
 
-        if heading_match or number_match:
-            if current_clause:
-                doc.add_clause(
-                    current_clause,
-                    '\n'.join(current_content),
-                    current_section,
-                    source="paragraph"
-                )
+            self.current_clause = text
+            self.current_content = []
+            self.current_page = page
 
-            current_clause = text
-            current_content = []
+            if verdict.section:
+                self.current_section = verdict.section
 
-            if heading_match:
-                tipo = heading_match.group(1).upper()
-                current_section = f"{tipo}: {heading_match.group(2)}"
+        elif verdict.section:
+            self.current_section = verdict.section
 
-        elif text.isupper() and len(text.split()) <= 6 and len(text) > 10:
-            current_section = text
+        elif self.current_clause:
+            self.current_content.append(text)
 
-        elif current_clause:
-            current_content.append(text)
+        return finished
 
-    if current_clause:
-        doc.add_clause(
-            current_clause,
-            '\n'.join(current_content),
-            current_section,
-            source="paragraph"
+    def finish(self) -> Optional[Dict]:
+        """Fecha a última cláusula em aberto"""
+        finished = self._close()
+        self.current_clause = None
+        self.current_content = []
+        self.current_page = None
+        return finished
+
+
+def _extract_page(page, page_num: int) -> Dict:
+    """Extrai texto (com a posição de cada linha) e tabelas de uma página pdfplumber e libera seu cache"""
+    # Mesmo texto de extract_text, linha a linha, com a posição vertical
+    lines = page.extract_text_lines(strip=False, return_chars=False)
+    height = float(page.height) or 1.0
+    result = {
+        'page': page_num,
+        'text': '\n'.join(line['text'] for line in lines),
+        'lines': [(line['top'] / height, line['bottom'] / height) for line in lines],
+        'tables': page.extract_tables() or []
+    }
+    page.close()
+    return result
+
+
+def _extract_pdf_page_range(filepath: str, start: int, end: int) -> List[Dict]:
+    """
+    Extrai as páginas [start, end) com um handle próprio (executado nos workers)
+
+    Args:
+        filepath: Caminho do PDF
+        start: Primeira página (0-based)
+        end: Página final (exclusiva)
+
+    Returns:
+        Lista de páginas no formato de iter_pdf_pages
+    """
+    with pdfplumber.open(open_source(filepath), pages=list(range(start + 1, end + 1))) as pdf:
+        return [_extract_page(page, page.page_number) for page in pdf.pages]
+
+
+def count_pdf_pages(filepath) -> int:
+    """Conta páginas sem montar o layout (PyPDF2)"""
+    return len(PyPDF2.PdfReader(filepath).pages)
+
+
+def iter_pdf_pages(filepath, workers: int = 1, backend: str = 'pdfplumber') -> Iterator[Dict]:
+    """
+    Lê o PDF página a página, liberando o cache de cada página após o uso
+
+    Args:
+        filepath: Caminho do PDF ou conteúdo em memória
+        workers: Processos para extração paralela (1 = serial). Com mais de
+            um worker, cada processo abre o PDF e extrai um intervalo de
+            páginas; a ordem de saída é sempre a ordem das páginas. Conteúdo
+            em memória é sempre extraído no próprio processo.
+        backend: 'pdfplumber' (padrão) ou 'pymupdf' (texto via blocos
+            PyMuPDF; pdfplumber só nas páginas com grade de tabela)
+
+    Yields:
+        Dict com page (1-based), text, lines (topo/base de cada linha de
+        text, em fração da altura da página) e tables
+    """
+    if backend not in PDF_BACKENDS:
+        raise ValueError(f"Backend de PDF desconhecido: {backend}")
+
+    if backend == 'pymupdf':
+        # Import tardio: PyMuPDF é opcional para quem usa só pdfplumber
+        if __package__:
+            from .parsers.pdf_pymupdf import extract_pages
+        else:
+            from parsers.pdf_pymupdf import extract_pages
+        yield from extract_pages(filepath, workers=workers)
+        return
+
+    if workers > 1 and is_path(filepath):
+        yield from map_page_ranges(
+            _extract_pdf_page_range,
+            str(filepath),
+            count_pdf_pages(filepath),
+            workers
         )
+        return
 
-    # Processa TABELAS do PDF
-    for table_info in all_tables:
-        table_data = table_info['data']
-        page = table_info['page']
+    with pdfplumber.open(open_source(filepath)) as pdf:
+        for page_num, page in enumerate(pdf.pages):
+            yield _extract_page(page, page_num + 1)
 
-        # Junta linhas da tabela
-        table_text = []
-        for row in table_data:
-            if row:
-                row_text = ' | '.join([str(cell) if cell else '' for cell in row])
-                if row_text.strip():
-                    table_text.append(row_text)
 
-        if table_text:
-            first_row = table_text[0]
-            all_text = '\n'.join(table_text)
+def table_to_clause(table_data: List, page: int) -> Optional[Dict]:
+    """
+    Converte uma tabela extraída do PDF em cláusula
 
-            doc.add_clause(
-                title=f"TABELA Pág.{page}: {first_row[:80]}",
-                content=all_text,
-                section="TABELAS",
-                source="table"
-            )
+    Args:
+        table_data: Linhas da tabela (lista de células)
+        page: Página de origem (1-based)
+
+    Returns:
+        Cláusula (dict, com a tabela colunar em 'table') ou None se a
+        tabela estiver vazia
+    """
+    table = Table.from_rows(table_data)
+
+    if table is None:
+        return None
+
+    first_row = CELL_SEP.join(c for c in table.header if c)
+
+    return {
+        'title': f"TABELA Pág.{page}: {first_row[:80]}",
+        'content': table.content(),
+        'section': "TABELAS",
+        'source': "table",
+        'table': table.to_dict()
+    }
+
+
+def iter_pdf_clauses(filepath, pages: Iterable[Dict] = None, workers: int = 1,
+                     backend: str = 'pdfplumber') -> Iterator[Dict]:
+    """
+    Parse em streaming de PDF: devolve cláusulas à medida que as páginas são lidas
+
+    Cada cláusula é emitida assim que o título seguinte a fecha, e as tabelas
+    são emitidas ao final da página em que aparecem. A memória fica constante
+    em relação ao número de páginas, e o consumidor pode começar o ranking
+    antes da última página ser lida.
+
+    Args:
+        filepath: Caminho do PDF ou conteúdo em memória
+        pages: Iterador de páginas já extraídas (default: iter_pdf_pages)
+        workers: Processos para extração paralela de páginas
+        backend: Backend de extração (ver iter_pdf_pages)
+
+    Yields:
+        Dicts com title, content, section, source, page e index
+    """
+    segmenter = PdfClauseSegmenter()
+    index = 0
+
+    if pages is None:
+        pages = iter_pdf_pages(filepath, workers=workers, backend=backend)
+
+    for page in pages:
+        for line in page['text'].split('\n'):
+            finished = segmenter.feed(line, page['page'])
+            if finished:
+                finished['index'] = index
+                index += 1
+                yield finished
+
+        for table in page['tables']:
+            clause = table_to_clause(table, page['page'])
+            if clause:
+                clause['page'] = page['page']
+                clause['index'] = index
+                index += 1
+                yield clause
+
+    finished = segmenter.finish()
+    if finished:
+        finished['index'] = index
+        yield finished
+
+
+def iter_pdf_document(source, workers: int = 1, backend: str = 'pdfplumber',
+                      strip_layout: bool = True, consolidate: bool = True,
+                      stats: Optional[Dict] = None) -> Iterator[Dict]:
+    """
+    Cláusulas do PDF em streaming, com limpeza de layout e consolidação
+
+    Args:
+        source: Caminho do PDF ou conteúdo em memória
+        workers: Processos para extração paralela de páginas (1 = serial)
+        backend: 'pdfplumber' ou 'pymupdf' (ver iter_pdf_pages)
+        strip_layout: Remove cabeçalhos/rodapés repetidos e números de página
+        consolidate: Mescla fragmentos na cláusula-mãe
+        stats: Dict que recebe as estatísticas de layout_cleaning e
+            consolidation (atualizadas durante o streaming)
+
+    Yields:
+        Cláusulas (dicts) em ordem de documento, tabelas no ponto em que aparecem
+    """
+    pages = iter_pdf_pages(source, workers=workers, backend=backend)
+    if strip_layout:
+        stripper = RepeatedLineStripper()
+        pages = stripper(pages)
+        if stats is not None:
+            stats['layout_cleaning'] = stripper.stats
+
+    clauses = iter_pdf_clauses(source, pages=pages)
+    if consolidate:
+        consolidator = FragmentConsolidator()
+        clauses = consolidator(clauses)
+        if stats is not None:
+            stats['consolidation'] = consolidator.stats
+
+    yield from clauses
+
+
+def parse_pdf(doc: Document, workers: int = 1, backend: str = 'pdfplumber',
+              strip_layout: bool = True, consolidate: bool = True) -> Document:
+    """
+    Parse específico para arquivos PDF
+    Usa pdfplumber para melhor extração de texto e tabelas
+
+    Args:
+        doc: Documento a preencher
+        workers: Processos para extração paralela de páginas (1 = serial)
+        backend: 'pdfplumber' ou 'pymupdf' (ver iter_pdf_pages)
+        strip_layout: Remove cabeçalhos/rodapés repetidos e números de página
+            antes da segmentação (estatísticas em metadata['layout_cleaning'])
+        consolidate: Mescla fragmentos (subitens "5.1", valores, datas, corpos
+            curtos) na cláusula-mãe (contagens em metadata['consolidation'])
+    """
+    table_clauses = []
+    num_tables = 0
+    stats = {}
+
+    for clause in iter_pdf_document(doc.source, workers, backend, strip_layout, consolidate, stats):
+        if clause['source'] == 'table':
+            # Tabelas vão para o final, como no documento consolidado
+            table_clauses.append(clause)
+            continue
+        doc.add_clause(clause['title'], clause['content'], clause['section'], source="paragraph")
+
+    for clause in table_clauses:
+        added = doc.add_clause(
+            title=clause['title'],
+            content=clause['content'],
+            section=clause['section'],
+            source="table"
+        )
+        added['table'] = clause['table']
+        num_tables += 1
 
     # Metadata
     doc.metadata['total_clauses'] = len(doc.clauses)
-    doc.metadata['has_tables'] = len(all_tables) > 0
-    doc.metadata['num_tables'] = len(all_tables)
+    doc.metadata['has_tables'] = num_tables > 0
+    doc.metadata['num_tables'] = num_tables
+    doc.metadata['pdf_backend'] = backend
+    doc.metadata.update(stats)
 
     return doc
 
 
+def iter_document_clauses(filepath, pdf_backend: str = 'pdfplumber', docx_reader: str = 'ooxml',
+                          strip_layout: bool = True, consolidate: bool = True,
+                          filename: Optional[str] = None, stats: Optional[Dict] = None) -> Iterator[Dict]:
+    """
+    Cláusulas de um DOCX/PDF sem manter o Document inteiro (ex: para o ReviewStore)
+
+    O PDF é lido em streaming e as tabelas saem no ponto em que aparecem
+    (parse_pdf as move para o final). O DOCX ainda é parseado inteiro: a
+    segmentação de fallback precisa de todos os parágrafos.
+
+    Args:
+        filepath: Caminho ou conteúdo em memória (ver parse_document)
+        pdf_backend, docx_reader, strip_layout, consolidate: ver parse_document
+        filename: Nome do arquivo, para conteúdo em memória
+        stats: Dict que recebe as estatísticas de parsing
+
+    Yields:
+        Cláusulas (dicts com title, content, section, source, index e extras)
+    """
+    suffix = Path(filepath if is_path(filepath) else filename or source_name(filepath)).suffix.lower()
+
+    if suffix == '.pdf':
+        yield from iter_pdf_document(filepath, backend=pdf_backend, strip_layout=strip_layout,
+                                     consolidate=consolidate, stats=stats)
+        return
+
+    doc = parse_document(filepath, docx_reader=docx_reader, filename=filename)
+    if stats is not None:
+        stats.update(doc.metadata)
+    for clause in doc.clauses:
+        yield clause.to_dict()
+
+
 def extract_paragraphs(text: str) -> List[str]:
     """Divide texto em parágrafos mantendo estrutura"""
     paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
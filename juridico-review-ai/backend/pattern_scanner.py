@@ -0,0 +1,256 @@
+"""
+Varredura única dos regex_patterns do catálogo.
+
+O componente regex do HybridRanker fazia um re.search por pattern, por
+cláusula do catálogo, por cláusula do documento (e reencontrava os mesmos
+patterns inválidos a cada chamada). Aqui os patterns são compilados uma vez,
+na carga do catálogo, em um scanner:
+
+- Patterns literais (a grande maioria nos catálogos: "(?i)Capítulo\\ Despesas")
+  viram uma trie compilada em uma única regex, com um grupo nomeado vazio
+  marcando o fim de cada pattern:
+
+      (?=capítulo\\ (?:despesas(?P<p3>)|remuneração(?P<p7>)))
+
+  Uma passada de finditer pelo texto devolve todos os patterns que começam
+  em cada posição, inclusive os que são prefixo de outro. Sem a trie, a
+  alternação com grupos nomeados é mais lenta que as buscas separadas.
+- Os demais patterns entram em uma alternação sem grupos, usada como filtro
+  de uma passada; só se ela encontrar algo os patterns são buscados um a um.
+  Flags globais no início ("(?s)a.b") viram grupos com escopo ("(?s:a.b)")
+  para poderem ficar no meio da alternação.
+
+Patterns inválidos são reportados uma vez, na construção, e continuam
+contando no denominador do score, como no antigo HybridRanker.regex_score
+(um re.search por pattern).
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLAGS = re.IGNORECASE | re.MULTILINE
+
+GLOBAL_FLAGS_PATTERN = re.compile(r'^\(\?([aiLmsux]+)\)')
+# Só caracteres sem significado especial ou escapes de não-alfanuméricos
+LITERAL_PATTERN = re.compile(r'^(?:\\[^\w]|[^\\.^$*+?{}\[\]|()])+$')
+
+# Flags que não mudam o significado de um literal em um scanner com IGNORECASE
+LITERAL_SAFE_FLAGS = set('imsu')
+
+
+def scope_flags(pattern: str) -> str:
+    """Converte flags globais iniciais em grupo com escopo: (?i)abc -> (?i:abc)"""
+    match = GLOBAL_FLAGS_PATTERN.match(pattern)
+    if not match:
+        return pattern
+    return f"(?{match.group(1)}:{pattern[match.end():]})"
+
+
+def literal_text(pattern: str, flags: int = DEFAULT_FLAGS) -> Optional[str]:
+    """
+    Texto do pattern, se ele for um literal
+
+    Args:
+        pattern: regex_pattern do catálogo
+        flags: Flags do scanner (literais só são extraídos com IGNORECASE)
+
+    Returns:
+        Texto sem escapes, ou None se o pattern usar recursos de regex
+    """
+    if not flags & re.IGNORECASE:
+        return None
+
+    body = pattern
+    match = GLOBAL_FLAGS_PATTERN.match(pattern)
+    if match:
+        if not set(match.group(1)) <= LITERAL_SAFE_FLAGS:
+            return None
+        body = pattern[match.end():]
+
+    if not LITERAL_PATTERN.match(body):
+        return None
+    return re.sub(r'\\(.)', r'\1', body)
+
+
+class _TrieNode:
+    __slots__ = ('children', 'ends')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.ends: List[int] = []
+
+
+def _trie_regex(node: _TrieNode) -> str:
+    """Regex de um nó da trie: marcadores dos patterns que terminam aqui + continuações"""
+    markers = ''.join(f"(?P<p{u}>)" for u in node.ends)
+    branches = [re.escape(ch) + _trie_regex(child) for ch, child in sorted(node.children.items())]
+    if not branches:
+        return markers
+    continuation = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    if markers:
+        # Continuação opcional: o pattern mais curto já casou
+        return f"{markers}(?:{continuation})?"
+    return continuation
+
+
+class PatternScanner:
+    """Patterns de todas as cláusulas do catálogo compilados em um scanner"""
+
+    def __init__(self,
+                 pattern_lists: Sequence[Sequence[str]],
+                 flags: int = DEFAULT_FLAGS,
+                 known_invalid: Optional[Sequence[Optional[Dict[str, str]]]] = None):
+        """
+        Compila os patterns e reporta os inválidos uma vez
+
+        Args:
+            pattern_lists: regex_patterns de cada cláusula do catálogo, na ordem
+            flags: Flags aplicadas a todos os patterns
+            known_invalid: Por cláusula, posição -> erro dos patterns já
+                sabidamente inválidos (índice do catálogo); não são recompilados
+        """
+        self.flags = flags
+        self.num_clauses = len(pattern_lists)
+        # Denominador do score: inválidos continuam contando
+        self.counts = np.array([len(p) for p in pattern_lists], dtype=np.float64)
+        self.invalid: List[Dict] = []
+
+        unique: Dict[str, int] = {}
+        owners: List[List[int]] = []
+        for c, patterns in enumerate(pattern_lists):
+            bad = (known_invalid[c] or {}) if known_invalid is not None else {}
+            for i, pattern in enumerate(patterns):
+                error = bad.get(str(i))
+                if error is None:
+                    try:
+                        re.compile(pattern, flags)
+                    except re.error as e:
+                        error = str(e)
+                if error is not None:
+                    self.invalid.append({'clausula': c, 'pattern': pattern, 'erro': error})
+                    continue
+                if pattern not in unique:
+                    unique[pattern] = len(unique)
+                    owners.append([])
+                owners[unique[pattern]].append(c)
+
+        for item in self.invalid:
+            logger.warning(f"regex_pattern inválido ignorado (cláusula {item['clausula']}): "
+                           f"{item['pattern']!r} ({item['erro']})")
+
+        self.patterns = list(unique)
+        # Incidência pattern -> cláusulas (um pattern repetido conta em cada dona)
+        self.incidence = np.zeros((len(self.patterns), self.num_clauses), dtype=np.float64)
+        clause_patterns: List[List[int]] = [[] for _ in range(self.num_clauses)]
+        for u, clauses in enumerate(owners):
+            for c in clauses:
+                self.incidence[u, c] += 1
+                clause_patterns[c].append(u)
+
+        # Patterns de cada cláusula, C×M preenchida com len(patterns) (coluna sempre falsa)
+        width = max((len(p) for p in clause_patterns), default=0)
+        self.clause_patterns = np.full((self.num_clauses, width), len(self.patterns), dtype=np.intp)
+        for c, patterns in enumerate(clause_patterns):
+            self.clause_patterns[c, :len(patterns)] = patterns
+
+        root = _TrieNode()
+        self.regexes: Dict[int, re.Pattern] = {}
+        for u, pattern in enumerate(self.patterns):
+            text = literal_text(pattern, flags)
+            if not text:
+                self.regexes[u] = re.compile(pattern, flags)
+                continue
+            node = root
+            for ch in text.lower():
+                node = node.children.setdefault(ch, _TrieNode())
+            node.ends.append(u)
+
+        self.literal_scanner = re.compile(f"(?={_trie_regex(root)})", flags) if root.children else None
+        self.regex_filter = self._alternation(list(self.regexes.values()))
+
+    def _alternation(self, compiled: List[re.Pattern]) -> Optional[re.Pattern]:
+        """Alternação sem grupos dos patterns não literais (filtro de uma passada)"""
+        if not compiled:
+            return None
+        try:
+            return re.compile('|'.join(f"(?:{scope_flags(p.pattern)})" for p in compiled), self.flags)
+        except re.error as e:
+            # Ex: referência numérica a grupo (\1) deixa de valer na alternação
+            logger.debug(f"Alternação de regex_patterns não compilou ({e}); sem filtro")
+            return None
+
+    def matched(self, text: str, clauses: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        Patterns distintos que ocorrem no texto
+
+        Args:
+            text: Texto da cláusula do documento
+            clauses: Se informado, só os patterns não literais dessas
+                cláusulas do catálogo são buscados (os demais ficam False)
+
+        Returns:
+            Vetor booleano (um por pattern distinto)
+        """
+        hits = np.zeros(len(self.patterns), dtype=bool)
+
+        if self.literal_scanner is not None:
+            for match in self.literal_scanner.finditer(text):
+                for name, value in match.groupdict().items():
+                    if value is not None:
+                        hits[int(name[1:])] = True
+
+        if clauses is not None:
+            for u in np.unique(self.clause_patterns[clauses]):
+                regex = self.regexes.get(u)
+                if regex is not None and regex.search(text):
+                    hits[u] = True
+        elif self.regexes and (self.regex_filter is None or self.regex_filter.search(text)):
+            for u, regex in self.regexes.items():
+                if regex.search(text):
+                    hits[u] = True
+        return hits
+
+    def scores(self, text: str) -> np.ndarray:
+        """Proporção de patterns de cada cláusula do catálogo que ocorrem no texto (0-1)"""
+        return self.score_matrix([text])[0]
+
+    def score_matrix(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Scores regex D×C (textos × cláusulas do catálogo)
+
+        Args:
+            texts: Textos das cláusulas do documento
+
+        Returns:
+            Matriz com a proporção de patterns de cada cláusula que ocorrem
+        """
+        hits = np.zeros((len(texts), len(self.patterns)), dtype=np.float64)
+        for d, text in enumerate(texts):
+            hits[d] = self.matched(text)
+        counts = hits @ self.incidence
+        return np.divide(counts, self.counts, out=np.zeros_like(counts), where=self.counts > 0)
+
+    def score_pairs(self, texts: Sequence[str], clause_indices: np.ndarray) -> np.ndarray:
+        """
+        Scores regex só das cláusulas candidatas de cada texto
+
+        Args:
+            texts: Textos das cláusulas do documento
+            clause_indices: Matriz D×N de índices de cláusulas do catálogo
+
+        Returns:
+            Matriz D×N com a proporção de patterns de cada candidata que ocorrem
+        """
+        hits = np.zeros((len(texts), len(self.patterns) + 1), dtype=bool)
+        for d, text in enumerate(texts):
+            hits[d, :-1] = self.matched(text, clause_indices[d])
+
+        rows = np.arange(len(texts))[:, None, None]
+        counts = hits[rows, self.clause_patterns[clause_indices]].sum(axis=2).astype(np.float64)
+        totals = self.counts[clause_indices]
+        return np.divide(counts, totals, out=np.zeros_like(counts), where=totals > 0)
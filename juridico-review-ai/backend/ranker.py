@@ -4,10 +4,16 @@ Módulo para ranking de cláusulas usando fuzzy matching, embeddings e MMR
 
 from typing import List, Dict, Tuple
 import numpy as np
-from rapidfuzz import fuzz
 from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
 
+try:
+    from .mmr import similarity_matrix, mmr_select
+    from .matching import prepare, fuzzy_matrix
+except ImportError:
+    from mmr import similarity_matrix, mmr_select
+    from matching import prepare, fuzzy_matrix
+
 
 class ClauseRanker:
     """Rankeador de cláusulas usando múltiplas estratégias"""
@@ -21,7 +27,9 @@ class ClauseRanker:
         """
         self.embedding_model = SentenceTransformer(model_name)
         self.catalog_embeddings = None
+        self.catalog_similarity = None
         self.catalog_clauses = None
+        self.catalog_texts = []
 
     def encode_catalog(self, catalog: Dict):
         """
@@ -46,6 +54,10 @@ class ClauseRanker:
         # Gera embeddings
         texts = [f"{c['title']} {c['content']}" for c in self.catalog_clauses]
         self.catalog_embeddings = self.embedding_model.encode(texts)
+        self.catalog_similarity = similarity_matrix(self.catalog_embeddings)
+
+        # Textos normalizados para o fuzzy matching, uma vez por catálogo
+        self.catalog_texts = prepare(texts)
 
     def fuzzy_match(self, query: str, candidates: List[str]) -> List[float]:
         """
@@ -54,7 +66,19 @@ class ClauseRanker:
         Returns:
             Lista de scores (0-100)
         """
-        return [fuzz.token_sort_ratio(query, candidate) for candidate in candidates]
+        return fuzzy_matrix(prepare([query]), prepare(candidates))[0].tolist()
+
+    def fuzzy_scores(self, queries: List[str]) -> np.ndarray:
+        """
+        Fuzzy matching (token_sort_ratio) de várias queries contra o catálogo
+
+        Args:
+            queries: Textos das cláusulas do documento
+
+        Returns:
+            Matriz D×C de scores (0-1)
+        """
+        return fuzzy_matrix(prepare(queries), self.catalog_texts).astype(np.float64) / 100.0
 
     def semantic_match(self, query: str) -> np.ndarray:
         """
@@ -82,46 +106,7 @@ class ClauseRanker:
         Returns:
             Índices dos top-k resultados diversificados
         """
-        selected = []
-        candidates = list(range(len(scores)))
-
-        # Primeiro: mais relevante
-        first_idx = np.argmax(scores)
-        selected.append(first_idx)
-        candidates.remove(first_idx)
-
-        # Demais: balancear relevância e diversidade
-        for _ in range(top_k - 1):
-            if not candidates:
-                break
-
-            mmr_scores = []
-            for idx in candidates:
-                # Relevância
-                relevance = scores[idx]
-
-                # Diversidade (menor similaridade com já selecionados)
-                if self.catalog_embeddings is not None:
-                    selected_embeddings = self.catalog_embeddings[selected]
-                    candidate_embedding = self.catalog_embeddings[idx:idx+1]
-                    max_sim = cosine_similarity(
-                        candidate_embedding,
-                        selected_embeddings
-                    ).max()
-                    diversity = 1 - max_sim
-                else:
-                    diversity = 1.0
-
-                # MMR score
-                mmr = lambda_param * relevance + (1 - lambda_param) * diversity
-                mmr_scores.append(mmr)
-
-            # Seleciona melhor MMR
-            best_idx = candidates[np.argmax(mmr_scores)]
-            selected.append(best_idx)
-            candidates.remove(best_idx)
-
-        return selected
+        return mmr_select(scores, self.catalog_similarity, lambda_param, top_k)
 
 
 def rank_clauses(document,
@@ -145,18 +130,16 @@ def rank_clauses(document,
 
     results = []
 
-    for clause in document.clauses:
-        query = f"{clause['title']} {clause['content']}"
+    # Fuzzy de todas as cláusulas contra o catálogo em uma chamada (cdist)
+    queries = [f"{clause['title']} {clause['content']}" for clause in document.clauses]
+    fuzzy_matrix_scores = ranker.fuzzy_scores(queries)
 
+    for d, (clause, query) in enumerate(zip(document.clauses, queries)):
         # Scores semânticos
         semantic_scores = ranker.semantic_match(query)
 
         # Fuzzy scores
-        catalog_texts = [
-            f"{c['title']} {c['content']}"
-            for c in ranker.catalog_clauses
-        ]
-        fuzzy_scores = np.array(ranker.fuzzy_match(query, catalog_texts)) / 100.0
+        fuzzy_scores = fuzzy_matrix_scores[d]
 
         # Combina scores (média ponderada)
         combined_scores = 0.7 * semantic_scores + 0.3 * fuzzy_scores
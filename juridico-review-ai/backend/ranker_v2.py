@@ -2,30 +2,71 @@
 Rankeador Híbrido v2: BM25 + Embeddings + Regex + MMR
 """
 
-from typing import List, Dict, Tuple
-import re
+from typing import List, Dict, Tuple, Iterable, Iterator
+from itertools import islice
 import numpy as np
 from rapidfuzz import fuzz
 from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
-from rank_bm25 import BM25Okapi
+
+try:
+    from .catalog_index import CatalogIndex, clause_text
+    from .mmr import similarity_matrix, mmr_select, mmr_select_batch
+    from .pattern_scanner import PatternScanner
+    from .keyword_index import KeywordIndex
+    from .bm25 import BM25Index, tokenize
+    from .parsers.clause import TITLE_SEP, clause_full_text
+except ImportError:
+    from catalog_index import CatalogIndex, clause_text
+    from mmr import similarity_matrix, mmr_select, mmr_select_batch
+    from pattern_scanner import PatternScanner
+    from keyword_index import KeywordIndex
+    from bm25 import BM25Index, tokenize
+    from parsers.clause import TITLE_SEP, clause_full_text
+
+
+DEFAULT_WEIGHTS = {
+    'bm25': 0.25,
+    'semantic': 0.40,
+    'regex': 0.20,
+    'keyword': 0.15
+}
+
+# Cláusulas do documento por lote no ranking em matriz (D×C por lote)
+RANK_BATCH_SIZE = 256
+
+# No streaming o primeiro lote é pequeno (primeiro resultado sem esperar o
+# parsing) e cresce ×RANK_BATCH_GROWTH até RANK_BATCH_SIZE: 1, 8, 64, 256
+RANK_FIRST_BATCH_SIZE = 1
+RANK_BATCH_GROWTH = 8
+
+# Componentes baratos, calculados para todo o catálogo no ranking em dois estágios
+LEXICAL_COMPONENTS = ('bm25', 'keyword')
 
 
 class HybridRanker:
     """Rankeador híbrido usando múltiplas estratégias"""
 
-    def __init__(self, embedding_model: str = 'all-MiniLM-L6-v2'):
+    def __init__(self, embedding_model: str = 'all-MiniLM-L6-v2', index_dir: str = None):
         """
         Inicializa o rankeador híbrido
 
         Args:
             embedding_model: Modelo de embeddings da Sentence Transformers
+            index_dir: Diretório do índice persistente do catálogo
+                (catalog_index); None recodifica o catálogo a cada carga
         """
         self.embedding_model = SentenceTransformer(embedding_model)
+        self.index = CatalogIndex(index_dir, embedding_model) if index_dir else None
+        self.index_stats = None
         self.bm25 = None
         self.catalog_clauses = []
         self.catalog_embeddings = None
+        self.catalog_similarity = None
+        self.catalog_normalized = None
         self.corpus_tokenized = []
+        self.pattern_scanner = None
+        self.keyword_index = None
 
     def encode_catalog(self, catalog: Dict):
         """
@@ -36,113 +77,167 @@ class HybridRanker:
         """
         self.catalog_clauses = catalog.get('clausulas', [])
 
-        # Textos para indexação
-        texts = []
-        self.corpus_tokenized = []
-
-        for clause in self.catalog_clauses:
-            # Combina título + keywords + template
-            text_parts = [
-                clause.get('titulo', ''),
-                ' '.join(clause.get('keywords', [])),
-                clause.get('template', '')
-            ]
-            full_text = ' '.join(text_parts)
-            texts.append(full_text)
+        if self.index is not None:
+            # Embeddings por mmap e tokens salvos; só cláusulas novas/editadas são codificadas
+            indexed = self.index.load(self.catalog_clauses, self.embedding_model.encode, self._tokenize)
+            self.corpus_tokenized = indexed.corpus_tokenized
+            self.catalog_embeddings = indexed.embeddings
+            invalid = indexed.invalid
+            self.index_stats = indexed.stats
+        else:
+            # Textos para indexação: título + keywords + template
+            texts = [clause_text(clause) for clause in self.catalog_clauses]
 
             # Tokenização simples para BM25
-            tokens = self._tokenize(full_text)
-            self.corpus_tokenized.append(tokens)
+            self.corpus_tokenized = [self._tokenize(text) for text in texts]
+
+            # Embeddings semânticos
+            self.catalog_embeddings = self.embedding_model.encode(texts)
+            invalid = [None] * len(self.catalog_clauses)
 
-        # Índice BM25
-        self.bm25 = BM25Okapi(self.corpus_tokenized)
+        # Similaridade C×C do catálogo, usada pelo MMR
+        self.catalog_similarity = similarity_matrix(self.catalog_embeddings)
 
-        # Embeddings semânticos
-        self.catalog_embeddings = self.embedding_model.encode(texts)
+        # Embeddings normalizados: cosseno só dos pares da shortlist (dois estágios)
+        self.catalog_normalized = self._normalize_rows(self.catalog_embeddings)
+
+        # Índice invertido BM25
+        self.bm25 = BM25Index(self.corpus_tokenized)
+
+        # regex_patterns de todo o catálogo em um scanner (inválidos reportados uma vez)
+        self.pattern_scanner = PatternScanner(
+            [clause.get('regex_patterns', []) for clause in self.catalog_clauses],
+            known_invalid=invalid
+        )
+
+        # Keywords de todo o catálogo em um autômato (sem acentos, uma passada por query)
+        self.keyword_index = KeywordIndex(
+            [clause.get('keywords', []) for clause in self.catalog_clauses]
+        )
 
     def _tokenize(self, text: str) -> List[str]:
-        """Tokenização simples"""
-        # Remove pontuação e lowercase
-        text = text.lower()
-        tokens = re.findall(r'\b\w+\b', text)
-        return tokens
+        """Tokenização do BM25 (sem acentos, minúsculas)"""
+        return tokenize(text)
+
+    @staticmethod
+    def _normalize_rows(embeddings) -> np.ndarray:
+        """Linhas com norma 1 (linhas nulas ficam nulas)"""
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.where(norms > 0, norms, 1.0)
 
-    def regex_score(self, query: str, clause: Dict) -> float:
+    def score_matrices(self, queries: List[str]) -> Dict[str, np.ndarray]:
         """
-        Score baseado em regex patterns
+        Scores de todas as queries contra todo o catálogo, por estratégia
+
+        Os embeddings das queries são calculados em uma única chamada em
+        lote; cada componente é uma matriz D×C (queries × cláusulas do
+        catálogo), da qual o breakdown de cada match é só uma fatia.
 
         Args:
-            query: Texto da cláusula do documento
-            clause: Cláusula do catálogo
+            queries: Textos das cláusulas do documento
 
         Returns:
-            Score (0-1)
+            {'bm25', 'semantic', 'regex', 'keyword'}: matrizes D×C
         """
-        patterns = clause.get('regex_patterns', [])
-        if not patterns:
-            return 0.0
-
-        matches = 0
-        for pattern in patterns:
-            try:
-                if re.search(pattern, query, re.IGNORECASE | re.MULTILINE):
-                    matches += 1
-            except re.error:
-                continue
-
-        # Retorna proporção de patterns que matcharam
-        return matches / len(patterns) if patterns else 0.0
-
-    def bm25_score(self, query: str) -> np.ndarray:
+        num_queries, num_clauses = len(queries), len(self.catalog_clauses)
+        if num_queries == 0:
+            empty = np.zeros((0, num_clauses))
+            return {'bm25': empty, 'semantic': empty, 'regex': empty, 'keyword': empty}
+
+        lexical = self.lexical_matrices(queries)
+
+        query_embeddings = self.embedding_model.encode(queries, batch_size=64)
+        semantic = cosine_similarity(query_embeddings, self.catalog_embeddings)
+
+        # Uma varredura por query para todos os regex_patterns do catálogo
+        regex = self.pattern_scanner.score_matrix(queries)
+
+        return {'bm25': lexical['bm25'], 'semantic': semantic, 'regex': regex, 'keyword': lexical['keyword']}
+
+    def lexical_matrices(self, queries: List[str]) -> Dict[str, np.ndarray]:
         """
-        Score BM25 para ranking lexical
+        Componentes lexicais (baratos) de todas as queries contra todo o catálogo
 
         Args:
-            query: Texto da query
+            queries: Textos das cláusulas do documento
 
         Returns:
-            Array de scores BM25
+            {'bm25', 'keyword'}: matrizes D×C
         """
-        query_tokens = self._tokenize(query)
-        scores = self.bm25.get_scores(query_tokens)
-        # Normaliza para 0-1
-        if scores.max() > 0:
-            scores = scores / scores.max()
-        return scores
-
-    def semantic_score(self, query: str) -> np.ndarray:
+        # BM25 normalizado por linha (0-1)
+        bm25 = self.bm25.score_matrix([self._tokenize(q) for q in queries])
+        row_max = bm25.max(axis=1, keepdims=True)
+        bm25 = np.divide(bm25, row_max, out=bm25, where=row_max > 0)
+
+        # Uma passada do autômato por query para as keywords de todo o catálogo
+        keyword = self.keyword_index.score_matrix(queries)
+
+        return {'bm25': bm25, 'keyword': keyword}
+
+    def shortlist(self,
+                  queries: List[str],
+                  candidates: int,
+                  weights: Dict[str, float] = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
         """
-        Score semântico usando embeddings
+        Primeiro estágio: candidatas de cada query pelos componentes lexicais
 
         Args:
-            query: Texto da query
+            queries: Textos das cláusulas do documento
+            candidates: Candidatas por query (N)
+            weights: Pesos (só bm25 e keyword são usados aqui)
 
         Returns:
-            Array de similaridades cosseno
+            (índices D×N das candidatas, em ordem decrescente de score lexical;
+             matrizes lexicais D×C)
         """
-        query_embedding = self.embedding_model.encode([query])
-        similarities = cosine_similarity(query_embedding, self.catalog_embeddings)[0]
-        return similarities
-
-    def keyword_score(self, query: str, clause: Dict) -> float:
+        if weights is None:
+            weights = DEFAULT_WEIGHTS
+        lexical = self.lexical_matrices(queries)
+        scores = sum(weights[name] * lexical[name] for name in LEXICAL_COMPONENTS)
+
+        candidates = min(candidates, scores.shape[1])
+        if candidates < scores.shape[1]:
+            indices = np.argpartition(-scores, candidates - 1, axis=1)[:, :candidates]
+        else:
+            indices = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+        order = np.argsort(-np.take_along_axis(scores, indices, axis=1), axis=1, kind='stable')
+        return np.take_along_axis(indices, order, axis=1), lexical
+
+    def candidate_matrices(self, queries: List[str], candidates: int,
+                           weights: Dict[str, float] = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
         """
-        Score baseado em presença de keywords
+        Ranking em dois estágios: componentes caros só para a shortlist
+
+        O BM25 e as keywords são calculados para todo o catálogo (índice
+        invertido e autômato); similaridade semântica e regex_patterns só
+        para as N candidatas de cada query.
 
         Args:
-            query: Texto da cláusula
-            clause: Cláusula do catálogo
+            queries: Textos das cláusulas do documento
+            candidates: Candidatas por query (N)
+            weights: Pesos para cada estratégia
 
         Returns:
-            Score (0-1)
+            (índices D×N das candidatas; {'bm25', 'semantic', 'regex', 'keyword'}:
+             matrizes D×N alinhadas aos índices)
         """
-        keywords = clause.get('keywords', [])
-        if not keywords:
-            return 0.0
+        indices, lexical = self.shortlist(queries, candidates, weights)
 
-        query_lower = query.lower()
-        matches = sum(1 for kw in keywords if kw.lower() in query_lower)
+        query_embeddings = self._normalize_rows(self.embedding_model.encode(queries, batch_size=64))
+        semantic = np.einsum('dk,dnk->dn', query_embeddings, self.catalog_normalized[indices])
 
-        return matches / len(keywords)
+        matrices = {name: np.take_along_axis(lexical[name], indices, axis=1) for name in LEXICAL_COMPONENTS}
+        matrices['semantic'] = semantic.astype(np.float64)
+        matrices['regex'] = self.pattern_scanner.score_pairs(queries, indices)
+        return indices, matrices
+
+    @staticmethod
+    def combine_scores(matrices: Dict[str, np.ndarray], weights: Dict[str, float] = None) -> np.ndarray:
+        """Soma ponderada das matrizes de score_matrices"""
+        if weights is None:
+            weights = DEFAULT_WEIGHTS
+        return sum(weights[name] * matrices[name] for name in ('bm25', 'semantic', 'regex', 'keyword'))
 
     def hybrid_score(self,
                      query: str,
@@ -157,38 +252,7 @@ class HybridRanker:
         Returns:
             Array de scores combinados
         """
-        if weights is None:
-            weights = {
-                'bm25': 0.25,
-                'semantic': 0.40,
-                'regex': 0.20,
-                'keyword': 0.15
-            }
-
-        # Calcula scores individuais
-        bm25_scores = self.bm25_score(query)
-        semantic_scores = self.semantic_score(query)
-
-        # Regex e keyword para cada cláusula
-        regex_scores = np.array([
-            self.regex_score(query, clause)
-            for clause in self.catalog_clauses
-        ])
-
-        keyword_scores = np.array([
-            self.keyword_score(query, clause)
-            for clause in self.catalog_clauses
-        ])
-
-        # Combina com pesos
-        combined = (
-            weights['bm25'] * bm25_scores +
-            weights['semantic'] * semantic_scores +
-            weights['regex'] * regex_scores +
-            weights['keyword'] * keyword_scores
-        )
-
-        return combined
+        return self.combine_scores(self.score_matrices([query]), weights)[0]
 
     def mmr_rerank(self,
                    scores: np.ndarray,
@@ -205,46 +269,75 @@ class HybridRanker:
         Returns:
             Índices dos top-k resultados diversificados
         """
-        if len(scores) == 0:
-            return []
-
-        selected = []
-        candidates = list(range(len(scores)))
-
-        # Primeiro: mais relevante
-        first_idx = np.argmax(scores)
-        selected.append(first_idx)
-        candidates.remove(first_idx)
-
-        # Demais: balancear relevância e diversidade
-        for _ in range(min(top_k - 1, len(candidates))):
-            if not candidates:
-                break
-
-            mmr_scores = []
-            for idx in candidates:
-                # Relevância
-                relevance = scores[idx]
-
-                # Diversidade (menor similaridade com já selecionados)
-                selected_embeddings = self.catalog_embeddings[selected]
-                candidate_embedding = self.catalog_embeddings[idx:idx+1]
-                max_sim = cosine_similarity(
-                    candidate_embedding,
-                    selected_embeddings
-                ).max()
-                diversity = 1 - max_sim
-
-                # MMR score
-                mmr = lambda_param * relevance + (1 - lambda_param) * diversity
-                mmr_scores.append(mmr)
-
-            # Seleciona melhor MMR
-            best_idx = candidates[np.argmax(mmr_scores)]
-            selected.append(best_idx)
-            candidates.remove(best_idx)
-
-        return selected
+        return mmr_select(scores, self.catalog_similarity, lambda_param, top_k)
+
+    def rank_queries(self,
+                     queries: List[str],
+                     top_k: int = 5,
+                     lambda_param: float = 0.7,
+                     weights: Dict[str, float] = None,
+                     candidates: int = None) -> List[List[Dict]]:
+        """
+        Rankeia várias queries contra o catálogo de uma vez
+
+        Args:
+            queries: Textos das cláusulas ("título conteúdo")
+            top_k: Quantos matches por query
+            lambda_param: Parâmetro MMR
+            weights: Pesos para cada estratégia
+            candidates: Ranking em dois estágios com N candidatas lexicais
+                por query (None = todos os componentes para todo o catálogo)
+
+        Returns:
+            Uma lista de matches (ordenados) por query
+        """
+        if candidates is not None and candidates < 1:
+            raise ValueError(f"candidates deve ser >= 1: {candidates}")
+        if candidates is not None and candidates < len(self.catalog_clauses):
+            return self._rank_candidates(queries, top_k, lambda_param, weights, candidates)
+
+        matrices = self.score_matrices(queries)
+        combined = self.combine_scores(matrices, weights)
+
+        # MMR para diversidade, todas as queries de uma vez
+        top_indices = mmr_select_batch(combined, self.catalog_similarity, lambda_param, top_k)
+
+        return [
+            [self._match(idx, combined[d, idx], {name: matrices[name][d, idx] for name in matrices})
+             for idx in top_indices[d]]
+            for d in range(len(queries))
+        ]
+
+    def _rank_candidates(self, queries: List[str], top_k: int, lambda_param: float,
+                         weights: Dict[str, float], candidates: int) -> List[List[Dict]]:
+        """rank_queries em dois estágios: MMR só entre as candidatas de cada query"""
+        indices, matrices = self.candidate_matrices(queries, candidates, weights)
+        combined = self.combine_scores(matrices, weights)
+
+        # Similaridade N×N entre as candidatas de cada query (D×N×N)
+        similarity = self.catalog_similarity[indices[:, :, None], indices[:, None, :]]
+        selected = mmr_select_batch(combined, similarity, lambda_param, top_k)
+
+        return [
+            [self._match(indices[d, n], combined[d, n], {name: matrices[name][d, n] for name in matrices})
+             for n in selected[d]]
+            for d in range(len(queries))
+        ]
+
+    def _match(self, idx: int, combined: float, breakdown: Dict[str, float]) -> Dict:
+        """Match no formato de rank_queries"""
+        clause = self.catalog_clauses[idx]
+        return {
+            'catalog_clause': clause,
+            'combined_score': float(combined),
+            'scores_breakdown': {
+                name: float(breakdown[name])
+                for name in ('bm25', 'semantic', 'regex', 'keyword')
+            },
+            'clause_id': clause.get('id'),
+            'importance': clause.get('importancia'),
+            'mandatory': clause.get('obrigatoria', False)
+        }
 
     def rank_clause(self,
                     clause_text: str,
@@ -263,47 +356,16 @@ class HybridRanker:
         Returns:
             Lista de matches ordenados
         """
-        # Query completa
-        query = f"{clause_title} {clause_text}"
-
-        # Score híbrido
-        scores = self.hybrid_score(query)
-
-        # MMR para diversidade
-        top_indices = self.mmr_rerank(scores, lambda_param, top_k)
-
-        # Monta resultado
-        matches = []
-        for idx in top_indices:
-            clause = self.catalog_clauses[idx]
-
-            # Decompõe scores individuais para debug
-            bm25_s = self.bm25_score(query)[idx]
-            semantic_s = self.semantic_score(query)[idx]
-            regex_s = self.regex_score(query, clause)
-            keyword_s = self.keyword_score(query, clause)
-
-            matches.append({
-                'catalog_clause': clause,
-                'combined_score': float(scores[idx]),
-                'scores_breakdown': {
-                    'bm25': float(bm25_s),
-                    'semantic': float(semantic_s),
-                    'regex': float(regex_s),
-                    'keyword': float(keyword_s)
-                },
-                'clause_id': clause.get('id'),
-                'importance': clause.get('importancia'),
-                'mandatory': clause.get('obrigatoria', False)
-            })
-
-        return matches
+        return self.rank_queries([f"{clause_title}{TITLE_SEP}{clause_text}"], top_k, lambda_param)[0]
 
 
 def rank_document_clauses(document,
                           catalog: Dict,
                           top_k: int = 5,
-                          lambda_param: float = 0.7) -> List[Dict]:
+                          lambda_param: float = 0.7,
+                          clauses: Iterable[Dict] = None,
+                          index_dir: str = None,
+                          candidates: int = None) -> List[Dict]:
     """
     Rankeia todas as cláusulas do documento contra o catálogo
 
@@ -312,26 +374,64 @@ def rank_document_clauses(document,
         catalog: Catálogo v2
         top_k: Quantas sugestões por cláusula
         lambda_param: Parâmetro MMR
+        clauses: Subconjunto das cláusulas a rankear (default: todas),
+            ex: só as alteradas em uma revisão incremental
+        index_dir: Diretório do índice persistente do catálogo (opcional)
+        candidates: Candidatas lexicais por cláusula no ranking em dois
+            estágios (None = scoring completo)
 
     Returns:
         Lista de cláusulas com rankings
     """
-    ranker = HybridRanker()
+    if clauses is None:
+        clauses = document.clauses
+
+    ranker = HybridRanker(index_dir=index_dir)
     ranker.encode_catalog(catalog)
 
-    results = []
+    return list(rank_clause_stream(clauses, ranker, top_k, lambda_param, candidates=candidates))
 
-    for clause in document.clauses:
-        matches = ranker.rank_clause(
-            clause_text=clause['content'],
-            clause_title=clause['title'],
-            top_k=top_k,
-            lambda_param=lambda_param
-        )
 
-        results.append({
-            'clause': clause,
-            'matches': matches
-        })
+def rank_clause_stream(clauses: Iterable[Dict],
+                       ranker: HybridRanker,
+                       top_k: int = 5,
+                       lambda_param: float = 0.7,
+                       batch_size: int = RANK_BATCH_SIZE,
+                       candidates: int = None,
+                       first_batch_size: int = RANK_FIRST_BATCH_SIZE) -> Iterator[Dict]:
+    """
+    Rankeia cláusulas à medida que chegam (ex: parsing.iter_pdf_clauses)
+
+    Permite começar o ranking antes do documento inteiro ser parseado. As
+    cláusulas são rankeadas em lotes (embeddings em lote e scores em matriz
+    por lote) que começam em first_batch_size e crescem ×RANK_BATCH_GROWTH
+    até batch_size, então o primeiro resultado sai após a primeira cláusula.
 
-    return results
+    Args:
+        clauses: Iterável de cláusulas (dicts com title e content)
+        ranker: HybridRanker com catálogo já codificado
+        top_k: Quantas sugestões por cláusula
+        lambda_param: Parâmetro MMR
+        batch_size: Tamanho máximo do lote
+        candidates: Candidatas lexicais por cláusula no ranking em dois
+            estágios (None = scoring completo)
+        first_batch_size: Tamanho do primeiro lote
+
+    Yields:
+        Dicts no mesmo formato de rank_document_clauses
+    """
+    clauses = iter(clauses)
+    size = max(1, min(first_batch_size, batch_size))
+    while True:
+        batch = list(islice(clauses, size))
+        if not batch:
+            return
+        size = min(size * RANK_BATCH_GROWTH, batch_size)
+
+        queries = [clause_full_text(clause) for clause in batch]
+        for clause, matches in zip(batch, ranker.rank_queries(queries, top_k, lambda_param,
+                                                                    candidates=candidates)):
+            yield {
+                'clause': clause,
+                'matches': matches
+            }
@@ -11,6 +11,11 @@ from docx.enum.text import WD_ALIGN_PARAGRAPH
 import openpyxl
 from openpyxl.styles import Font, PatternFill, Alignment
 
+try:
+    from .parsers.clause import clause_preview
+except ImportError:
+    from parsers.clause import clause_preview
+
 
 def generate_excel_report(reviews: List[Dict], output_path: Path):
     """
@@ -45,7 +50,7 @@ def generate_excel_report(reviews: List[Dict], output_path: Path):
             'Prioridade': priority,
             'Categoria Referência': best_match['catalog_clause']['category'] if best_match else '',
             'Importância': best_match['catalog_clause']['importance'] if best_match else '',
-            'Conteúdo Original': clause['content'][:500] + '...' if len(clause['content']) > 500 else clause['content'],
+            'Conteúdo Original': clause_preview(clause, 500),
             'Análise': review_text
         })
 
@@ -14,13 +14,19 @@ from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 import logging
 from datetime import datetime
 
+try:
+    from .parsers.table import Table
+except ImportError:
+    from parsers.table import Table
+
 logger = logging.getLogger(__name__)
 
 
 def generate_excel_report(tier1_results: List[Dict],
                           tier2_results: List[Dict],
                           output_path: Path,
-                          timestamp: str = None):
+                          timestamp: str = None,
+                          document_info=None):
     """
     Gera Excel com múltiplas abas
 
@@ -29,6 +35,7 @@ def generate_excel_report(tier1_results: List[Dict],
     2. Cláusulas OK (Tier-1)
     3. Sugestões (Tier-2)
     4. Detalhamento Completo
+    5. Tabelas do documento, com todas as linhas (se document_info for informado)
     """
 
     if not timestamp:
@@ -132,6 +139,15 @@ def generate_excel_report(tier1_results: List[Dict],
             df_all = pd.DataFrame(all_data)
             df_all.to_excel(writer, sheet_name='Detalhamento', index=False)
 
+        # ====== ABA 5: TABELAS (linhas completas) ======
+        if document_info is not None:
+            table_clauses = [c for c in document_info.clauses if c.get('table')]
+            for n, clause in enumerate(table_clauses, 1):
+                table = Table.from_dict(clause['table'])
+                header = [h or f'Coluna {i + 1}' for i, h in enumerate(table.header)]
+                df_table = pd.DataFrame(list(table.rows()), columns=header)
+                df_table.to_excel(writer, sheet_name=f'Tabela {n}', index=False)
+
     # Formatação
     _format_excel(excel_file)
 
@@ -347,7 +363,8 @@ def generate_comprehensive_reports(tier1_results: List[Dict],
     # Unified timestamp to avoid name collisions and permission issues
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
 
-    excel_path = generate_excel_report(tier1_results, tier2_results, output_path, timestamp=timestamp)
+    excel_path = generate_excel_report(tier1_results, tier2_results, output_path, timestamp=timestamp,
+                                       document_info=document_info)
     docx_path = generate_docx_report(tier1_results, tier2_results, document_info, catalog_info, output_path, timestamp=timestamp)
 
     if audit_trail:
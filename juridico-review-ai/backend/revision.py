@@ -0,0 +1,341 @@
+"""
+Revisão incremental de minutas revisadas (diff por cláusula).
+
+Cada execução do pipeline salva um estado de revisão (revisao_estado.json)
+com o hash de conteúdo, o título, a classificação Tier-1, os matches e a
+sugestão Tier-2 de cada cláusula. Na rodada seguinte as cláusulas da nova
+versão são alinhadas às da anterior:
+
+1. hash de conteúdo igual -> cláusula inalterada, veredito reaproveitado
+2. título parecido (fuzzy) -> cláusula alterada, reprocessada
+3. sem correspondência -> cláusula nova, processada
+
+Só as cláusulas alteradas/novas passam por ranking, Tier-1 e Tier-2, além
+das inalteradas cujos matches apontam para cláusulas que saíram do catálogo
+(reavaliadas). Sugestões Tier-2 reaproveitadas seguem para o relatório e o
+próximo estado mesmo quando o Tier-2 é pulado.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from rapidfuzz import fuzz
+
+try:
+    from .utils.text_norm import normalize
+except ImportError:
+    from utils.text_norm import normalize
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 1
+STATE_FILENAME = 'revisao_estado.json'
+
+# Similaridade mínima de título (0-100) para considerar a mesma cláusula
+TITLE_SIMILARITY = 85
+
+# Configurações que invalidam os vereditos Tier-1 / Tier-2 anteriores
+TIER1_SETTINGS = ('catalog_hash', 'tier1_model', 'top_k', 'candidates')
+TIER2_SETTINGS = ('tier2_provider', 'tier2_model')
+
+
+def clause_hash(clause) -> str:
+    """
+    Hash de conteúdo da cláusula (título + texto normalizados)
+
+    Mudanças só de espaços, acentuação ou caixa não alteram o hash.
+    """
+    text = normalize(clause['title']) + '\n' + normalize(clause['content'])
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def slim_matches(matches: List[Dict]) -> List[Dict]:
+    """Matches sem a cláusula do catálogo completa (guarda só o id)"""
+    slim = []
+    for match in matches:
+        item = {k: v for k, v in match.items() if k != 'catalog_clause'}
+        item['clause_id'] = match.get('clause_id') or match['catalog_clause'].get('id')
+        slim.append(item)
+    return slim
+
+
+def restore_matches(matches: List[Dict], catalog_by_id: Dict[str, Dict]) -> Optional[List[Dict]]:
+    """Reconstrói os matches com as cláusulas do catálogo atual (None se alguma sumiu)"""
+    restored = []
+    for match in matches:
+        catalog_clause = catalog_by_id.get(match.get('clause_id'))
+        if catalog_clause is None:
+            return None
+        restored.append({**match, 'catalog_clause': catalog_clause})
+    return restored
+
+
+def save_review_state(output_path: Path,
+                      document,
+                      classifications: List[Dict],
+                      tier2_results: List[Dict],
+                      settings: Dict) -> Path:
+    """
+    Salva o estado da revisão para a próxima rodada
+
+    Args:
+        output_path: Diretório de saída
+        document: Documento parseado
+        classifications: Resultado do Tier-1 (todas as cláusulas)
+        tier2_results: Resultado do Tier-2
+        settings: Configurações da execução (catalog_hash, tier1_model, top_k,
+            candidates, tier2_provider, tier2_model)
+
+    Returns:
+        Caminho do arquivo salvo
+    """
+    tier2_by_index = {item['clause']['index']: item for item in tier2_results}
+
+    clauses = []
+    for item in classifications:
+        clause = item['clause']
+        entry = {
+            'index': clause['index'],
+            'hash': clause_hash(clause),
+            'title': clause['title'],
+            'classification': item['classification'],
+            'matches': slim_matches(item.get('all_matches', []))
+        }
+
+        tier2 = tier2_by_index.get(clause['index'])
+        if tier2 is not None:
+            entry['tier2'] = {
+                'suggestion': tier2.get('suggestion'),
+                'skipped': tier2.get('skipped', False),
+                'reason': tier2.get('reason')
+            }
+        clauses.append(entry)
+
+    state = {
+        'version': STATE_VERSION,
+        'timestamp': datetime.now().isoformat(),
+        'documento': document.filename,
+        'hash_sha256': document.metadata.get('sha256'),
+        'settings': settings,
+        'clauses': clauses
+    }
+
+    state_file = Path(output_path) / STATE_FILENAME
+    with open(state_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2, ensure_ascii=False, default=str)
+
+    logger.info(f"Estado de revisão salvo em: {state_file}")
+    return state_file
+
+
+def load_review_state(path) -> Optional[Dict]:
+    """
+    Carrega o estado de uma revisão anterior
+
+    Args:
+        path: Arquivo de estado, diretório de saída anterior ou JSON de
+            auditoria (que referencia o arquivo de estado)
+
+    Returns:
+        Estado ou None se não encontrado/incompatível
+    """
+    path = Path(path)
+    if path.is_dir():
+        path = path / STATE_FILENAME
+
+    if not path.exists():
+        logger.warning(f"Estado de revisão não encontrado: {path}")
+        return None
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    # JSON de auditoria: segue a referência ao estado
+    if 'clauses' not in data:
+        ref = data.get('metadata', {}).get('estado_revisao')
+        if not ref:
+            logger.warning(f"Auditoria sem estado de revisão: {path}")
+            return None
+        return load_review_state(path.parent / ref)
+
+    if data.get('version') != STATE_VERSION:
+        logger.warning(f"Versão de estado incompatível: {data.get('version')}")
+        return None
+
+    return data
+
+
+def align_clauses(previous: List[Dict], clauses: List) -> Dict[str, List]:
+    """
+    Alinha as cláusulas da nova versão às da revisão anterior
+
+    Args:
+        previous: Entradas do estado anterior (state['clauses'])
+        clauses: Cláusulas do documento atual
+
+    Returns:
+        Dict com:
+        - unchanged: [(cláusula, entrada anterior)]
+        - modified: [(cláusula, entrada anterior, similaridade do título)]
+        - added: [cláusula]
+        - removed: [entrada anterior]
+    """
+    by_hash: Dict[str, List[Dict]] = {}
+    for entry in previous:
+        by_hash.setdefault(entry['hash'], []).append(entry)
+
+    unchanged = []
+    pending = []
+    for clause in clauses:
+        candidates = by_hash.get(clause_hash(clause))
+        if candidates:
+            unchanged.append((clause, candidates.pop(0)))
+        else:
+            pending.append(clause)
+
+    # Entradas anteriores ainda livres, em ordem de documento
+    remaining = [entry for entries in by_hash.values() for entry in entries]
+    remaining.sort(key=lambda e: e['index'])
+    remaining_titles = [normalize(entry['title']) for entry in remaining]
+
+    modified = []
+    added = []
+    for clause in pending:
+        title = normalize(clause['title'])
+        best_pos, best_score = None, 0.0
+        for pos, prev_title in enumerate(remaining_titles):
+            if prev_title is None:
+                continue
+            score = fuzz.ratio(title, prev_title)
+            if score > best_score:
+                best_pos, best_score = pos, score
+
+        if best_pos is not None and best_score >= TITLE_SIMILARITY:
+            modified.append((clause, remaining[best_pos], best_score))
+            remaining_titles[best_pos] = None
+        else:
+            added.append(clause)
+
+    removed = [entry for entry, title in zip(remaining, remaining_titles) if title is not None]
+
+    return {
+        'unchanged': unchanged,
+        'modified': modified,
+        'added': added,
+        'removed': removed
+    }
+
+
+def _settings_match(state: Dict, settings: Dict, keys) -> bool:
+    previous = state.get('settings', {})
+    return all(previous.get(key) == settings.get(key) for key in keys)
+
+
+def plan_revision(state: Optional[Dict], document, catalog: Dict, settings: Dict) -> Dict:
+    """
+    Decide o que reprocessar na nova versão do documento
+
+    Args:
+        state: Estado anterior (load_review_state) ou None
+        document: Documento atual parseado
+        catalog: Catálogo carregado
+        settings: Configurações da execução atual
+
+    Returns:
+        Dict com:
+        - carried: resultados Tier-1 reaproveitados (mesmo formato do
+          classificador, com 'carried_forward': True)
+        - carried_tier2: {índice da cláusula: resultado Tier-2 anterior}
+        - to_review: cláusulas a reprocessar
+        - diff: contagens de inalteradas/alteradas/novas/removidas e de
+          reavaliadas (inalteradas com match fora do catálogo atual)
+    """
+    clauses = list(document.clauses)
+
+    if state is None or not _settings_match(state, settings, TIER1_SETTINGS):
+        if state is not None:
+            logger.warning("Catálogo/modelo/top-k/candidatas mudaram: revisão completa")
+        return {
+            'carried': [],
+            'carried_tier2': {},
+            'to_review': clauses,
+            'diff': {'inalteradas': 0, 'alteradas': 0, 'novas': len(clauses), 'removidas': 0,
+                     'reavaliadas': 0}
+        }
+
+    alignment = align_clauses(state['clauses'], clauses)
+    catalog_by_id = {c.get('id'): c for c in catalog.get('clausulas', [])}
+    reuse_tier2 = _settings_match(state, settings, TIER2_SETTINGS)
+
+    carried = []
+    carried_tier2 = {}
+    reassessed = 0
+    to_review = [clause for clause, _, _ in alignment['modified']] + alignment['added']
+
+    for clause, entry in alignment['unchanged']:
+        matches = restore_matches(entry['matches'], catalog_by_id)
+        if matches is None:
+            # Cláusula do catálogo removida: reprocessa
+            to_review.append(clause)
+            reassessed += 1
+            continue
+
+        carried.append({
+            'clause': clause,
+            'classification': entry['classification'],
+            'all_matches': matches,
+            'carried_forward': True
+        })
+
+        tier2 = entry.get('tier2')
+        if reuse_tier2 and tier2 is not None:
+            carried_tier2[clause['index']] = {
+                'clause': clause,
+                'classification': entry['classification'],
+                'catalog_clause': matches[0]['catalog_clause'] if matches else None,
+                **tier2
+            }
+
+    to_review.sort(key=lambda c: c['index'])
+
+    diff = {
+        'inalteradas': len(carried),
+        'alteradas': len(alignment['modified']),
+        'novas': len(alignment['added']),
+        'removidas': len(alignment['removed']),
+        'reavaliadas': reassessed
+    }
+    logger.info(f"Diff de revisão: {diff}")
+
+    return {
+        'carried': carried,
+        'carried_tier2': carried_tier2,
+        'to_review': to_review,
+        'diff': diff
+    }
+
+
+def split_tier2(needs_tier2: List[Dict], carried_tier2: Dict[int, Dict]) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Separa as cláusulas encaminhadas ao Tier-2 entre reaproveitadas e a gerar
+
+    Args:
+        needs_tier2: Resultados roteados para o Tier-2
+        carried_tier2: plan_revision()['carried_tier2']
+
+    Returns:
+        (sugestões Tier-2 anteriores reaproveitadas, resultados sem sugestão)
+    """
+    reused = [carried_tier2[item['clause']['index']] for item in needs_tier2
+              if item['clause']['index'] in carried_tier2]
+    pending = [item for item in needs_tier2 if item['clause']['index'] not in carried_tier2]
+    return reused, pending
+
+
+def merge_results(carried: List[Dict], reviewed: List[Dict]) -> List[Dict]:
+    """Junta resultados reaproveitados e reprocessados em ordem de documento"""
+    return sorted(carried + reviewed, key=lambda item: item['clause']['index'])
@@ -0,0 +1,274 @@
+"""
+Armazenamento em disco (SQLite) de cláusulas e resultados da revisão.
+
+Para minutas muito grandes (data rooms), Document.clauses e as listas de
+resultados com all_matches (cláusulas do catálogo inteiras) ficariam todos
+em memória até os relatórios. O ReviewStore grava cada etapa em uma tabela
+à medida que as cláusulas passam:
+
+    parsing -> clauses -> ranking -> matches -> Tier-1 -> results -> Tier-2 -> suggestions
+
+Cada etapa lê a anterior por cursor, e os relatórios recebem visões
+(ResultView) que relêem o banco a cada iteração e respondem len() com
+COUNT. Os matches são gravados só com o id da cláusula do catálogo e
+reconstruídos com o catálogo carregado.
+"""
+
+import json
+import logging
+import sqlite3
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional
+
+try:
+    from .revision import slim_matches, restore_matches
+except ImportError:
+    from revision import slim_matches, restore_matches
+
+logger = logging.getLogger(__name__)
+
+STORE_FILENAME = 'revisao.sqlite'
+
+# Linhas por transação nas inserções em streaming
+BATCH_SIZE = 500
+
+CLAUSE_FIELDS = ('title', 'content', 'section', 'source', 'index')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS clauses (
+    idx INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    section TEXT,
+    source TEXT,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS matches (
+    idx INTEGER PRIMARY KEY REFERENCES clauses (idx),
+    matches TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    idx INTEGER PRIMARY KEY REFERENCES clauses (idx),
+    classification TEXT NOT NULL,
+    status TEXT,
+    tier2 INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS suggestions (
+    idx INTEGER PRIMARY KEY REFERENCES clauses (idx),
+    result TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_tier2 ON results (tier2, idx);
+"""
+
+CLAUSE_COLUMNS = "c.idx, c.title, c.content, c.section, c.source, c.extra"
+
+
+class ResultView:
+    """
+    Resultado guardado no ReviewStore, relido por cursor
+
+    Pode ser iterado várias vezes (cada iteração abre um cursor novo) e
+    len() não carrega as linhas, então serve no lugar das listas que os
+    geradores de relatório recebem.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, query: str, loader: Callable, params: tuple = ()):
+        self._conn = conn
+        self._query = query
+        self._loader = loader
+        self._params = params
+
+    def __iter__(self) -> Iterator[Dict]:
+        for row in self._conn.execute(self._query, self._params):
+            yield self._loader(row)
+
+    def __len__(self) -> int:
+        return self._conn.execute(f"SELECT COUNT(*) FROM ({self._query})", self._params).fetchone()[0]
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+
+class StoredDocument:
+    """Visão de documento para os relatórios (filename, metadata, clauses por cursor)"""
+
+    def __init__(self, filename: str, clauses: ResultView, metadata: Optional[Dict] = None):
+        self.filename = filename
+        self.clauses = clauses
+        self.metadata = metadata or {}
+        self.from_cache = False
+
+
+class ReviewStore:
+    """Cláusulas e resultados de uma revisão em SQLite"""
+
+    def __init__(self, path=':memory:', catalog: Optional[Dict] = None):
+        """
+        Abre (ou cria) o banco
+
+        Args:
+            path: Arquivo SQLite (':memory:' para testes)
+            catalog: Catálogo carregado, para reconstruir os matches
+        """
+        self.path = str(path)
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.catalog_by_id = {c.get('id'): c for c in (catalog or {}).get('clausulas', [])}
+
+    # ------------------------------------------------------------------
+    # Escrita em streaming
+    # ------------------------------------------------------------------
+
+    def _insert(self, sql: str, rows: Iterable[tuple]) -> int:
+        """Insere em lotes de BATCH_SIZE, uma transação por lote"""
+        rows = iter(rows)
+        total = 0
+        while True:
+            batch = list(islice(rows, BATCH_SIZE))
+            if not batch:
+                return total
+            with self.conn:
+                self.conn.executemany(sql, batch)
+            total += len(batch)
+
+    def add_clauses(self, clauses: Iterable) -> int:
+        """
+        Grava cláusulas em ordem (parsing.iter_document_clauses ou Document.clauses)
+
+        O índice de cada cláusula passa a ser a ordem de gravação.
+
+        Returns:
+            Número de cláusulas gravadas
+        """
+        start = self.conn.execute("SELECT COUNT(*) FROM clauses").fetchone()[0]
+
+        def rows():
+            for i, clause in enumerate(clauses, start):
+                extra = {k: v for k, v in clause.items() if k not in CLAUSE_FIELDS}
+                yield (i, clause['title'], clause['content'], clause.get('section'),
+                       clause.get('source', 'paragraph'), json.dumps(extra, ensure_ascii=False) if extra else None)
+
+        return self._insert("INSERT INTO clauses VALUES (?, ?, ?, ?, ?, ?)", rows())
+
+    def add_ranked(self, ranked: Iterable[Dict]) -> int:
+        """Grava os matches do ranking (formato de ranker_v2.rank_clause_stream)"""
+        rows = ((item['clause']['index'], json.dumps(slim_matches(item['matches']), ensure_ascii=False))
+                for item in ranked)
+        return self._insert("INSERT OR REPLACE INTO matches VALUES (?, ?)", rows)
+
+    def add_classifications(self, classifications: Iterable[Dict], router=None) -> int:
+        """
+        Grava os resultados Tier-1 (os matches já estão na tabela matches)
+
+        Args:
+            classifications: Resultados de classifier_tier1_optimized.iter_classify_matches
+            router: ClauseRouter opcional; marca as cláusulas que precisam de Tier-2
+        """
+        def rows():
+            for item in classifications:
+                classification = item['classification']
+                tier2 = router.should_use_tier2(classification) if router is not None else False
+                yield (item['clause']['index'], json.dumps(classification, ensure_ascii=False, default=str),
+                       classification.get('classificacao'), int(tier2))
+
+        return self._insert("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)", rows())
+
+    def add_suggestions(self, suggestions: Iterable[Dict]) -> int:
+        """Grava os resultados Tier-2 (sem cláusula, classificação e catálogo, relidos nas junções)"""
+        rows = ((item['clause']['index'],
+                 json.dumps({k: v for k, v in item.items()
+                             if k not in ('clause', 'classification', 'catalog_clause')},
+                            ensure_ascii=False, default=str))
+                for item in suggestions)
+        return self._insert("INSERT OR REPLACE INTO suggestions VALUES (?, ?)", rows)
+
+    # ------------------------------------------------------------------
+    # Leitura por cursor
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _clause(row) -> Dict:
+        idx, title, content, section, source, extra = row[:6]
+        clause = {'title': title, 'content': content, 'section': section, 'source': source, 'index': idx}
+        if extra:
+            clause.update(json.loads(extra))
+        return clause
+
+    def _matches(self, text: str):
+        return restore_matches(json.loads(text), self.catalog_by_id) or []
+
+    def clauses(self) -> ResultView:
+        """Cláusulas em ordem"""
+        return ResultView(self.conn, f"SELECT {CLAUSE_COLUMNS} FROM clauses c ORDER BY c.idx", self._clause)
+
+    def ranked(self) -> ResultView:
+        """{'clause', 'matches'} de cada cláusula rankeada, para o Tier-1"""
+        def load(row):
+            return {'clause': self._clause(row), 'matches': self._matches(row[6])}
+
+        return ResultView(self.conn, f"SELECT {CLAUSE_COLUMNS}, m.matches FROM clauses c "
+                                     f"JOIN matches m ON m.idx = c.idx ORDER BY c.idx", load)
+
+    def results(self, tier2: Optional[bool] = None) -> ResultView:
+        """
+        Resultados Tier-1 ({'clause', 'classification', 'all_matches'})
+
+        Args:
+            tier2: True só as que precisam de Tier-2, False só as aprovadas
+                no Tier-1, None todas
+        """
+        def load(row):
+            return {
+                'clause': self._clause(row),
+                'classification': json.loads(row[6]),
+                'all_matches': self._matches(row[7])
+            }
+
+        query = (f"SELECT {CLAUSE_COLUMNS}, r.classification, COALESCE(m.matches, '[]') FROM clauses c "
+                 f"JOIN results r ON r.idx = c.idx LEFT JOIN matches m ON m.idx = c.idx")
+        params = ()
+        if tier2 is not None:
+            query += " WHERE r.tier2 = ?"
+            params = (int(tier2),)
+        return ResultView(self.conn, query + " ORDER BY c.idx", load, params)
+
+    def suggestions(self) -> ResultView:
+        """Resultados Tier-2, no formato de generator_tier2.iter_tier2_suggestions"""
+        def load(row):
+            item = {'clause': self._clause(row), 'classification': json.loads(row[6])}
+            item.update(json.loads(row[8]))
+            matches = self._matches(row[7])
+            if not item.get('skipped') and matches:
+                item['catalog_clause'] = matches[0]['catalog_clause']
+            return item
+
+        return ResultView(self.conn, f"SELECT {CLAUSE_COLUMNS}, r.classification, COALESCE(m.matches, '[]'), "
+                                     f"s.result FROM clauses c JOIN results r ON r.idx = c.idx "
+                                     f"JOIN suggestions s ON s.idx = c.idx LEFT JOIN matches m ON m.idx = c.idx "
+                                     f"ORDER BY c.idx", load)
+
+    def document(self, filename: str, metadata: Optional[Dict] = None) -> StoredDocument:
+        """Documento para os relatórios, com as cláusulas lidas do banco"""
+        return StoredDocument(filename, self.clauses(), metadata)
+
+    def status_counts(self) -> Dict[str, int]:
+        """Resultados Tier-1 por status (presente/parcial/ausente)"""
+        counts = {'presente': 0, 'parcial': 0, 'ausente': 0}
+        for status, n in self.conn.execute("SELECT status, COUNT(*) FROM results GROUP BY status"):
+            if status:
+                counts[status.lower()] = n
+        return counts
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self) -> 'ReviewStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -10,10 +10,16 @@ from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 
+import numpy as np
 import chromadb
 from chromadb.config import Settings
 from chromadb.api import EmbeddingFunction
 
+try:
+    from .bm25 import BM25Index, tokenize
+except ImportError:
+    from bm25 import BM25Index, tokenize
+
 
 def get_vector_client(embedding="sentence-transformers"):
     """
@@ -78,6 +84,9 @@ class DocumentVectorDB:
         except Exception as e:
             raise RuntimeError(f"Erro ao inicializar ChromaDB: {e}")
 
+        # Índice BM25 do histórico, construído na primeira busca lexical
+        self._lexical = None
+
     def add_document(self, document_name: str, clauses: List[Dict], catalog_name: str, is_gold: bool = False):
         """
         Adiciona um documento completo ao banco vetorial
@@ -113,7 +122,8 @@ class DocumentVectorDB:
             # ID único para cada cláusula
             clause_id = f"{doc_hash}_{idx}"
 
-            # Texto para embedding (título + conteúdo)
+            # Texto para embedding e para a busca lexical (título + até 1000
+            # caracteres do conteúdo; o restante da cláusula não é armazenado)
             text = f"{clause['title']}\n\n{clause['content'][:1000]}"
 
             # Metadata enriquecida
@@ -143,6 +153,7 @@ class DocumentVectorDB:
                 metadatas=metadatas,
                 ids=ids
             )
+            self._lexical = None
 
         gold_tag = " [GOLD⭐]" if is_gold else ""
         print(f"✅ Documento '{document_name}'{gold_tag} adicionado ao banco vetorial ({added_count}/{len(clauses)} cláusulas)")
@@ -174,6 +185,9 @@ class DocumentVectorDB:
             where["classification"] = filter_classification
         if filter_catalog:
             where["catalog"] = filter_catalog
+        # O ChromaDB exige $and para mais de um campo no filtro
+        if len(where) > 1:
+            where = {"$and": [{key: value} for key, value in where.items()]}
 
         # Busca semântica (busca o dobro para depois filtrar gold)
         search_limit = n_results * 3 if prioritize_gold else n_results
@@ -196,13 +210,73 @@ class DocumentVectorDB:
 
         # 🆕 PRIORIZA DOCUMENTOS GOLD
         if prioritize_gold:
-            # Separa gold vs normal
-            gold_results = [r for r in similar_clauses if r['metadata'].get('is_gold', False)]
-            normal_results = [r for r in similar_clauses if not r['metadata'].get('is_gold', False)]
+            return self._prioritize_gold(similar_clauses, n_results)
+
+        return similar_clauses[:n_results]
+
+    @staticmethod
+    def _prioritize_gold(results: List[Dict], n_results: int) -> List[Dict]:
+        """Primeiro todos os gold, depois normais (até completar n_results)"""
+        gold_results = [r for r in results if r['metadata'].get('is_gold', False)]
+        normal_results = [r for r in results if not r['metadata'].get('is_gold', False)]
+        return (gold_results + normal_results)[:n_results]
+
+    def _lexical_index(self) -> Tuple[List[str], List[Dict], BM25Index]:
+        """(documentos, metadatas, índice BM25) do histórico; reconstruído após inserções"""
+        if self._lexical is None:
+            data = self.collection.get(include=['documents', 'metadatas'])
+            documents = data['documents'] or []
+            self._lexical = (documents, data['metadatas'] or [], BM25Index.from_texts(documents))
+        return self._lexical
+
+    def search_lexical_clauses(
+        self,
+        query: str,
+        n_results: int = 5,
+        filter_classification: Optional[str] = None,
+        filter_catalog: Optional[str] = None,
+        prioritize_gold: bool = True
+    ) -> List[Dict]:
+        """
+        Busca cláusulas do histórico por BM25 (termos em comum, sem acentos)
 
-            # Retorna: primeiro todos os gold, depois normais (até completar n_results)
-            prioritized = gold_results + normal_results
-            return prioritized[:n_results]
+        Complementa a busca semântica quando o que importa é o vocabulário
+        exato (nomes de índices, tipos de garantia, artigos de lei). O índice
+        cobre o texto armazenado de cada cláusula (título + primeiros 1000
+        caracteres do conteúdo): termos que só aparecem depois disso não são
+        encontrados.
+
+        Args:
+            query: Texto da busca
+            n_results: Número de resultados
+            filter_classification: Filtrar por classificação (PRESENTE/PARCIAL/AUSENTE)
+            filter_catalog: Filtrar por catálogo específico
+            prioritize_gold: Se True, documentos GOLD aparecem primeiro
+
+        Returns:
+            Lista de cláusulas com metadata e score BM25
+        """
+        documents, metadatas, index = self._lexical_index()
+        if not documents:
+            return []
+
+        mask = np.array([
+            (not filter_classification or meta.get('classification') == filter_classification) and
+            (not filter_catalog or meta.get('catalog') == filter_catalog)
+            for meta in metadatas
+        ], dtype=bool)
+
+        search_limit = n_results * 3 if prioritize_gold else n_results
+        indices, scores = index.top_k([tokenize(query)], k=search_limit, mask=mask)
+
+        # Só documentos com algum termo em comum (score > 0)
+        similar_clauses = [
+            {'text': documents[i], 'metadata': metadatas[i], 'score': float(score)}
+            for i, score in zip(indices[0], scores[0]) if score > 0
+        ]
+
+        if prioritize_gold:
+            return self._prioritize_gold(similar_clauses, n_results)
 
         return similar_clauses[:n_results]
 
@@ -216,6 +290,10 @@ class DocumentVectorDB:
         """
         Busca os melhores exemplos de cláusulas similares classificadas como PRESENTE
 
+        Combina a busca semântica e a lexical (BM25), intercalando os dois
+        rankings, para que cláusulas com o mesmo vocabulário técnico entrem
+        nos exemplos mesmo quando o embedding as deixa mais abaixo.
+
         Args:
             clause_title: Título da cláusula a buscar
             clause_content: Conteúdo da cláusula
@@ -227,16 +305,36 @@ class DocumentVectorDB:
         """
         query = f"{clause_title}\n{clause_content[:500]}"
 
-        # Busca apenas cláusulas PRESENTE do mesmo catálogo (tipo de operação)
-        similar = self.search_similar_clauses(
-            query=query,
-            n_results=n_examples,
-            filter_classification="PRESENTE",
-            filter_catalog=catalog_name,  # 🆕 Filtra por tipo de operação
-            prioritize_gold=True  # 🆕 Gold tem prioridade
-        )
+        # Busca apenas cláusulas PRESENTE do mesmo catálogo (tipo de operação),
+        # por semântica e por BM25; gold tem prioridade no resultado combinado
+        filters = dict(filter_classification="PRESENTE", filter_catalog=catalog_name, prioritize_gold=False)
+        semantic = self.search_similar_clauses(query=query, n_results=n_examples * 3, **filters)
+        lexical = self.search_lexical_clauses(query=query, n_results=n_examples * 3, **filters)
+
+        return self._prioritize_gold(self._interleave(semantic, lexical), n_examples)
+
+    @staticmethod
+    def _interleave(*rankings: List[Dict]) -> List[Dict]:
+        """
+        Intercala rankings (1º de cada, 2º de cada, ...), sem repetir cláusulas
 
-        return similar
+        Args:
+            rankings: Listas de resultados em ordem decrescente de relevância
+
+        Returns:
+            Lista combinada; cada cláusula (documento, inserção e índice) aparece uma vez
+        """
+        merged, seen = [], set()
+        for position in range(max((len(r) for r in rankings), default=0)):
+            for ranking in rankings:
+                if position >= len(ranking):
+                    continue
+                meta = ranking[position]['metadata']
+                key = (meta.get('document_name'), meta.get('timestamp'), meta.get('clause_index'))
+                if key not in seen:
+                    seen.add(key)
+                    merged.append(ranking[position])
+        return merged
 
     def get_statistics(self) -> Dict:
         """
@@ -369,6 +467,7 @@ class DocumentVectorDB:
     def reset(self):
         """Reseta o banco de dados (use com cuidado!)"""
         self.client.reset()
+        self._lexical = None
         print("⚠️ Banco de dados resetado!")
 
 
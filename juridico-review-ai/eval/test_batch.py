@@ -0,0 +1,166 @@
+"""
+Testes da revisão em lote (main_batch): descoberta de minutas, saída por documento e resumo.
+"""
+import sys
+import os
+import json
+import math
+
+# Adiciona o diretório raiz e o backend (imports do main_batch) ao path
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+CATALOG_PATH = os.path.join(ROOT, 'data', 'catalogos', 'catalogo_cri_destinacao.yaml')
+
+CLAUSES = [
+    ("CLÁUSULA 1 – DO OBJETO", "A Emissora emitirá os CRI lastreados em créditos imobiliários."),
+    ("CLÁUSULA 2 – DO PRAZO", "O prazo de vencimento dos CRI é de 120 meses contados da data de emissão."),
+    ("CLÁUSULA 3 – DO FORO", "Fica eleito o foro da comarca de São Paulo para dirimir quaisquer dúvidas."),
+]
+
+
+def _write_minuta(path):
+    """Minuta DOCX com as cláusulas de CLAUSES"""
+    from docx import Document
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    doc = Document()
+    for title, content in CLAUSES:
+        doc.add_heading(title, level=2)
+        doc.add_paragraph(content)
+    doc.save(str(path))
+    return path
+
+
+def _stub_pipeline(monkeypatch):
+    """Ranker e Tier-1 fictícios no main_batch (sem modelo de embeddings nem Ollama)"""
+    import main_batch
+    from utils import load_catalog
+
+    catalog_clauses = load_catalog(CATALOG_PATH)['clausulas']
+
+    def rank_clause_stream(clauses, ranker, top_k=5, lambda_param=0.7, candidates=None):
+        for n, clause in enumerate(clauses):
+            catalog_clause = catalog_clauses[n % len(catalog_clauses)]
+            yield {'clause': clause, 'matches': [{
+                'catalog_clause': catalog_clause, 'clause_id': catalog_clause.get('id'),
+                'combined_score': 0.8, 'importance': catalog_clause.get('importancia'),
+                'mandatory': catalog_clause.get('obrigatoria', False),
+                'scores_breakdown': {'bm25': 0.8, 'semantic': 0.8, 'regex': 0.0, 'keyword': 0.5}
+            }]}
+
+    def iter_classify_matches(ranked_matches, model='qwen2:7b-instruct', total=None):
+        for item in ranked_matches:
+            yield {'clause': item['clause'], 'all_matches': item['matches'],
+                   'classification': {'classificacao': 'PRESENTE', 'confianca': 0.9,
+                                      'justificativa': 'Cláusula presente.'}}
+
+    monkeypatch.setattr(main_batch, 'get_ranker', lambda catalog_path, index_dir=None: None)
+    monkeypatch.setattr(main_batch, 'rank_clause_stream', rank_clause_stream)
+    monkeypatch.setattr(main_batch, 'iter_classify_matches', iter_classify_matches)
+    monkeypatch.setattr(main_batch, 'classify_document_matches_optimized',
+                        lambda ranked, model='qwen2:7b-instruct': list(iter_classify_matches(ranked, model)))
+    return main_batch
+
+
+def test_find_documents_directory_and_glob(tmp_path):
+    """
+    Testa a busca de minutas em um diretório (só o nível dele) e por glob recursivo.
+    """
+    from main_batch import find_documents
+
+    for name in ("b.docx", "a.pdf", "notas.txt", "sub/c.pdf", "sub/d.DOCX"):
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_bytes(b"")
+
+    assert find_documents(str(tmp_path)) == [tmp_path / "a.pdf", tmp_path / "b.docx"]
+    assert find_documents(str(tmp_path / "**" / "*.pdf")) == [tmp_path / "a.pdf", tmp_path / "sub" / "c.pdf"]
+    assert find_documents(str(tmp_path / "sub" / "*")) == [tmp_path / "sub" / "c.pdf", tmp_path / "sub" / "d.DOCX"]
+    assert find_documents(str(tmp_path / "nada" / "*.pdf")) == []
+    print("[OK] Busca de minutas por diretório e glob")
+
+
+def test_document_output_dir_is_unique_per_input(tmp_path):
+    """
+    Testa que minutas de mesmo nome (pastas ou extensões diferentes) não dividem a saída.
+    """
+    from main_batch import document_output_dir
+
+    a_pdf = str(tmp_path / "a" / "minuta.pdf")
+    b_pdf = str(tmp_path / "b" / "minuta.pdf")
+    a_docx = str(tmp_path / "a" / "minuta.docx")
+
+    dirs = [document_output_dir("saida", path) for path in (a_pdf, b_pdf, a_docx)]
+    assert len(set(dirs)) == 3
+    assert all(d.parent.name == "saida" for d in dirs)
+    assert dirs[0].name.startswith("minuta_pdf_") and dirs[2].name.startswith("minuta_docx_")
+
+    # Estável: o mesmo caminho (relativo ou absoluto) sempre cai no mesmo diretório
+    cwd = os.getcwd()
+    try:
+        os.chdir(tmp_path)
+        assert document_output_dir("saida", os.path.join("a", "minuta.pdf")) == dirs[0]
+    finally:
+        os.chdir(cwd)
+    print("[OK] Diretório de saída exclusivo por minuta")
+
+
+def _run_batch(entrada, output_dir, *extra):
+    """main_batch.main em processo (um worker, sem cache nem Tier-2)"""
+    from click.testing import CliRunner
+    import main_batch
+
+    result = CliRunner().invoke(main_batch.main, [
+        '--entrada', str(entrada), '--catalogo', CATALOG_PATH, '--output-dir', str(output_dir),
+        '--workers', '1', '--skip-tier2', '--no-cache', *extra
+    ])
+    assert result.exit_code == 0, result.output
+    with open(output_dir / 'resumo_lote.json', 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _check_summary(summary, files):
+    """Resumo do lote: uma linha OK por minuta, cada uma com seus relatórios no seu diretório"""
+    assert summary['documentos'] == summary['sucesso'] == len(files)
+    assert summary['erros'] == 0
+    assert summary['docs_por_minuto'] > 0
+    # docs/min × minutos ≈ minutas OK (tempo e taxa arredondados no JSON)
+    assert math.isclose(summary['docs_por_minuto'] * summary['tempo_total_segundos'] / 60, len(files), rel_tol=0.1)
+
+    rows = summary['resultados']
+    assert sorted(row['minuta'] for row in rows) == sorted(str(f) for f in files)
+    assert len({row['saida'] for row in rows}) == len(files)
+    for row in rows:
+        assert row['status'] == 'OK', row
+        assert row['clausulas'] >= len(CLAUSES)
+        assert row['presente'] == row['clausulas'] and row['tier2'] == 0
+        for report in (row['excel'], row['docx']):
+            assert os.path.dirname(report) == row['saida'] and os.path.getsize(report) > 0
+    return rows
+
+
+def test_batch_review_in_memory(tmp_path, monkeypatch):
+    """
+    Testa o lote em memória: minutas de mesmo nome em pastas diferentes, relatórios e docs/min.
+    """
+    _stub_pipeline(monkeypatch)
+    files = [_write_minuta(tmp_path / "entrada" / folder / "minuta.docx") for folder in ("a", "b")]
+
+    summary = _run_batch(tmp_path / "entrada" / "**" / "*.docx", tmp_path / "saida")
+    _check_summary(summary, files)
+    print("[OK] Lote em memória")
+
+
+def test_batch_review_spilled(tmp_path, monkeypatch):
+    """
+    Testa o lote com --spill: cada minuta com seu banco SQLite e relatórios lidos dele.
+    """
+    _stub_pipeline(monkeypatch)
+    files = [_write_minuta(tmp_path / "entrada" / folder / "minuta.docx") for folder in ("a", "b")]
+
+    summary = _run_batch(tmp_path / "entrada" / "**" / "*.docx", tmp_path / "saida", '--spill')
+    rows = _check_summary(summary, files)
+    for row in rows:
+        assert os.path.dirname(row['banco']) == row['saida'] and os.path.exists(row['banco'])
+    print("[OK] Lote com --spill")
@@ -0,0 +1,476 @@
+"""
+Testes do parsing de minutas (DOCX/PDF) gerando documentos sintéticos.
+"""
+import sys
+import os
+
+# Adiciona o diretório raiz ao path para imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+def _make_docx(path):
+    """Cria uma minuta DOCX pequena com títulos em negrito e uma tabela."""
+    import docx
+
+    d = docx.Document()
+    for n, titulo in enumerate(["DEFINIÇÕES", "APROVAÇÃO DA EMISSÃO", "OBJETO E CRÉDITOS IMOBILIÁRIOS",
+                                "SUBSCRIÇÃO E INTEGRALIZAÇÃO", "DESPESAS", "FORO"], 1):
+        p = d.add_paragraph()
+        p.add_run(f"CLÁUSULA {n} – {titulo}").bold = True
+        d.add_paragraph(f"Texto da cláusula {n} com conteúdo suficiente para o teste de parsing.")
+    table = d.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Data"
+    table.cell(0, 1).text = "Valor"
+    table.cell(1, 0).text = "10/01/2025"
+    table.cell(1, 1).text = "1.000,00"
+    d.save(str(path))
+    return path
+
+
+def _make_pdf(path, pages=3):
+    """Cria um PDF com cláusulas numeradas em várias páginas."""
+    import fitz
+
+    doc = fitz.open()
+    n = 1
+    for _ in range(pages):
+        page = doc.new_page()
+        y = 60
+        for _ in range(4):
+            page.insert_text((50, y), f"CLAUSULA {n} - OBJETO {n}", fontsize=11)
+            page.insert_text((50, y + 16), f"Texto da clausula {n} com conteudo.", fontsize=10)
+            y += 40
+            n += 1
+    doc.save(str(path))
+    return path
+
+
+def test_parse_cache_roundtrip(tmp_path):
+    """
+    Testa que o cache devolve o mesmo documento sem reprocessar o arquivo.
+    """
+    from backend.parsing import parse_document
+    from backend.parsers.cache import ParseCache
+
+    path = _make_docx(tmp_path / "minuta.docx")
+    cache = ParseCache(tmp_path / "cache")
+
+    first = parse_document(str(path), cache=cache)
+    second = parse_document(str(path), cache=cache)
+
+    assert not first.from_cache
+    assert second.from_cache
+    assert second.clauses == first.clauses
+    assert second.metadata['sha256'] == first.metadata['sha256']
+    print("[OK] Cache de parsing devolve documento idêntico")
+
+
+def test_parse_cache_eviction(tmp_path):
+    """
+    Testa o despejo por tamanho do cache.
+    """
+    from backend.parsers.cache import ParseCache
+
+    cache = ParseCache(tmp_path / "cache", max_bytes=1)
+    cache.put("a", {"x": "a" * 1000})
+    cache.put("b", {"x": "b" * 1000})
+
+    assert cache.stats()['entradas'] == 0
+    print("[OK] Cache respeita limite de tamanho")
+
+
+def test_pdf_streaming_yields_before_last_page():
+    """
+    Testa que o parse em streaming emite cláusulas antes de ler todas as páginas.
+    """
+    from backend.parsing import iter_pdf_clauses
+
+    consumed = []
+
+    def pages():
+        for n in range(1, 4):
+            consumed.append(n)
+            yield {
+                'page': n,
+                'text': f"CLÁUSULA {n} – OBJETO\nConteúdo da cláusula {n}.",
+                'tables': []
+            }
+
+    stream = iter_pdf_clauses(None, pages=pages())
+    first = next(stream)
+
+    assert first['title'] == "CLÁUSULA 1 – OBJETO"
+    assert first['content'] == "Conteúdo da cláusula 1."
+    assert consumed == [1, 2]
+
+    rest = list(stream)
+    assert [c['index'] for c in rest] == [1, 2]
+    print("[OK] Streaming de PDF emite cláusulas incrementalmente")
+
+
+def test_pdf_streaming_page_is_where_clause_starts():
+    """
+    Testa que a página de cada cláusula é a do título, inclusive na última (fechada no fim).
+    """
+    from backend.parsing import iter_pdf_clauses
+
+    pages = [
+        {'page': 1, 'text': "CLÁUSULA 1 – OBJETO\nInício da cláusula 1.", 'tables': []},
+        {'page': 2, 'text': "Continuação da cláusula 1.\nCLÁUSULA 2 – PRAZO\nPrazo de 120 meses.", 'tables': []},
+        {'page': 3, 'text': "Continuação da cláusula 2.", 'tables': [[["Série", "Valor"], ["1", "100"]]]},
+    ]
+    clauses = list(iter_pdf_clauses(None, pages=pages))
+
+    assert [(c['title'][:10], c['page']) for c in clauses] == [
+        ("CLÁUSULA 1", 1), ("TABELA Pág", 3), ("CLÁUSULA 2", 2)
+    ]
+    assert clauses[0]['content'].endswith("Continuação da cláusula 1.")
+    assert [c['index'] for c in clauses] == [0, 1, 2]
+    print("[OK] Página de início de cada cláusula no streaming")
+
+
+def test_pdf_parallel_matches_serial(tmp_path):
+    """
+    Testa que a extração paralela de páginas produz as mesmas cláusulas.
+    """
+    from backend.parsing import parse_document
+    from backend.parsers.pdf_pymupdf import extract_blocks
+
+    path = str(_make_pdf(tmp_path / "minuta.pdf", pages=10))
+
+    serial = parse_document(path).clauses
+    parallel = parse_document(path, workers=2).clauses
+
+    assert len(serial) == 40
+    assert parallel == serial
+    assert extract_blocks(path, workers=2) == extract_blocks(path)
+    print("[OK] Extração paralela determinística")
+
+
+def test_pdf_pymupdf_backend(tmp_path):
+    """
+    Testa o backend PyMuPDF do parse_document contra o pdfplumber.
+    """
+    from backend.parsing import parse_document
+
+    path = str(_make_pdf(tmp_path / "minuta.pdf", pages=2))
+
+    plumber = parse_document(path, pdf_backend='pdfplumber')
+    fast = parse_document(path, pdf_backend='pymupdf')
+
+    assert [c['title'] for c in fast.clauses] == [c['title'] for c in plumber.clauses]
+    assert fast.metadata['pdf_backend'] == 'pymupdf'
+    print("[OK] Backend PyMuPDF segmenta como o pdfplumber")
+
+
+def test_docx_ooxml_reader_matches_python_docx(tmp_path):
+    """
+    Testa que o leitor OOXML em streaming produz as mesmas cláusulas que o python-docx.
+    """
+    from backend.parsing import Document, parse_docx
+
+    path = str(_make_docx(tmp_path / "minuta.docx"))
+
+    ooxml = parse_docx(Document(path), reader='ooxml')
+    legacy = parse_docx(Document(path), reader='python-docx')
+
+    assert ooxml.clauses == legacy.clauses
+    assert ooxml.metadata == legacy.metadata
+    assert ooxml.metadata['num_tables'] == 1
+    print("[OK] Leitor OOXML equivalente ao python-docx")
+
+
+def test_heading_classifier():
+    """
+    Testa o classificador de títulos compartilhado por DOCX e PDF.
+    """
+    from backend.parsers.headings import classify_line
+
+    verdict = classify_line("CLÁUSULA 1 – OBJETO", 'docx')
+    assert verdict.is_title and verdict.kind == 'keyword'
+    assert verdict.section == "CLÁUSULA: 1 – OBJETO"
+
+    # Numeração no DOCX exige formatação; no PDF basta o número
+    assert not classify_line("1.1 O prazo de vencimento será de 10 anos", 'docx').is_title
+    assert classify_line("1.1 O prazo de vencimento será de 10 anos", 'docx', bold=True).kind == 'number'
+    assert classify_line("1.1 O prazo de vencimento será de 10 anos", 'pdf').kind == 'number'
+
+    assert classify_line("Prazo de vencimento:", 'docx').kind == 'colon'
+    assert classify_line("Texto corrido", 'docx', style_name='Heading 2').kind == 'style'
+    assert classify_line("DAS OBRIGAÇÕES", 'pdf') == (False, 'upper', "DAS OBRIGAÇÕES")
+    assert not classify_line("Artigo 5 da lei", 'pdf').is_title
+    print("[OK] Classificador de títulos")
+
+
+def test_clause_buffer_and_dict_adapter():
+    """
+    Testa a Clause compacta: texto no buffer do documento, visões em cache e acesso como dict.
+    """
+    from backend.parsing import Document
+
+    doc = Document("minuta.docx")
+    doc.add_clause("CLÁUSULA 1 – OBJETO", "A Emissora emitirá os “CRI”.", "CLÁUSULA: 1 – OBJETO")
+    doc.add_clause("CLÁUSULA 2 – PRAZO", "Prazo de 10 anos.")
+    clause = doc.clauses[0]
+
+    assert clause['title'] == "CLÁUSULA 1 – OBJETO"
+    assert clause.get('content') == "A Emissora emitirá os “CRI”."
+    assert doc.clauses[1]['index'] == 1
+    assert clause.full_text == "CLÁUSULA 1 – OBJETO A Emissora emitirá os “CRI”."
+    assert clause.lower is clause.lower
+    assert clause.normalized.startswith("clausula 1")
+    assert clause.preview(9) == "A Emissor..."
+
+    # Mesmas visões para a Clause e para um dict simples (ex: cláusula do store)
+    from backend.parsers.clause import clause_full_text, clause_normalized, clause_preview
+    plain = clause.to_dict()
+    for view in (clause_full_text, clause_normalized):
+        assert view(clause) == view(plain)
+    assert clause_preview(clause, 9) == clause_preview(plain, 9) == "A Emissor..."
+    assert clause_preview(plain) == plain['content']
+
+    clause['page'] = 3
+    assert dict(clause) == {
+        'title': "CLÁUSULA 1 – OBJETO",
+        'content': "A Emissora emitirá os “CRI”.",
+        'section': "CLÁUSULA: 1 – OBJETO",
+        'source': "paragraph",
+        'index': 0,
+        'page': 3
+    }
+    assert Document.from_dict(doc.to_dict(), "minuta.docx").clauses == doc.clauses
+    print("[OK] Clause compacta com adaptador de dict")
+
+
+def test_pdf_strips_repeated_headers():
+    """
+    Testa a remoção de cabeçalhos/rodapés repetidos e números de página antes da segmentação.
+    """
+    from backend.parsing import iter_pdf_clauses
+    from backend.parsers.layout import RepeatedLineStripper
+
+    pages = [{
+        'page': n,
+        'text': f"Minuta – Versão para discussão\nCLÁUSULA {n} – OBJETO\nConteúdo da cláusula {n}.\nPágina {n} de 3",
+        'lines': [(0.03, 0.04), (0.08, 0.09), (0.10, 0.11), (0.95, 0.96)],
+        'tables': []
+    } for n in range(1, 4)]
+
+    stripper = RepeatedLineStripper()
+    clauses = list(iter_pdf_clauses(None, pages=stripper(pages)))
+
+    assert [c['content'] for c in clauses] == [f"Conteúdo da cláusula {n}." for n in range(1, 4)]
+    assert stripper.stats['linhas_removidas'] == 6
+    assert stripper.stats['caracteres_removidos'] == 3 * len("Minuta – Versão para discussão") + 3 * len("Página 1 de 3")
+    print("[OK] Cabeçalhos e números de página removidos")
+
+
+def test_pdf_fragment_consolidation():
+    """
+    Testa a mescla de subitens, valores e corpos curtos na cláusula-mãe.
+    """
+    from backend.parsing import iter_pdf_clauses
+    from backend.parsers.consolidate import FragmentConsolidator, numbering
+
+    assert numbering("CLÁUSULA 5 – PRAZO") == ('keyword', (5,))
+    assert numbering("5.1 O prazo será de 10 anos") == ('number', (5, 1))
+    assert numbering("1.000.000,00 (um milhão de reais)")[0] == 'value'
+    assert numbering("10/01/2025 data de emissão")[0] == 'value'
+
+    body = "Texto corrido da cláusula com palavras suficientes para não ser fragmento."
+    text = "\n".join([
+        "CLÁUSULA 5 – PRAZO", body,
+        "5.1 O prazo será de 10 anos", "contados da emissão.",
+        "5.1.1 Prorrogável uma vez.",
+        "1.000.000,00 (um milhão de reais)",
+        "CLÁUSULA 6 – JUROS", body,
+        "7.1 Item de outra cláusula", body,
+    ])
+    pages = [{'page': 1, 'text': text, 'tables': [[["Série", "Valor"], ["1", "100"]]]}]
+
+    consolidator = FragmentConsolidator()
+    clauses = list(consolidator(iter_pdf_clauses(None, pages=pages)))
+
+    titles = [c['title'] for c in clauses]
+    assert titles == ["CLÁUSULA 5 – PRAZO", "TABELA Pág.1: Série | Valor", "CLÁUSULA 6 – JUROS", "7.1 Item de outra cláusula"]
+    assert "5.1.1 Prorrogável uma vez." in clauses[0]['content']
+    assert clauses[0]['content'].endswith("1.000.000,00 (um milhão de reais)")
+    assert [c['index'] for c in clauses] == [0, 1, 2, 3]
+    assert consolidator.stats == {'clausulas_antes': 7, 'clausulas_depois': 4, 'fragmentos_mesclados': 3,
+                                  'motivos': {'subitem': 2, 'valor': 1, 'corpo_curto': 0}}
+    print("[OK] Fragmentos consolidados na cláusula-mãe")
+
+
+def test_pdf_consolidation_keeps_sibling_and_short_clauses():
+    """
+    Testa que cláusulas irmãs e cláusulas curtas com título não viram fragmento.
+    """
+    from backend.parsing import iter_pdf_clauses
+    from backend.parsers.consolidate import FragmentConsolidator
+
+    body = "Texto corrido da cláusula com palavras suficientes para não ser fragmento."
+    text = "\n".join([
+        "5. PAGAMENTO", body,
+        "5.1 Pagamento mensal.",
+        "6. PRAZO", "O prazo é de 120 meses.",
+        "6.1 Prorrogável.",
+        "7. DO FORO", "Fica eleito o foro de São Paulo/SP.",
+        "4. ANTERIOR", "Curta.",
+    ])
+    consolidator = FragmentConsolidator()
+    clauses = list(consolidator(iter_pdf_clauses(None, pages=[{'page': 1, 'text': text, 'tables': []}])))
+
+    titles = [c['title'] for c in clauses]
+    assert titles == ["5. PAGAMENTO", "6. PRAZO", "7. DO FORO", "4. ANTERIOR"], titles
+    assert "5.1 Pagamento mensal." in clauses[0]['content']
+    assert "6.1 Prorrogável." in clauses[1]['content']
+    assert clauses[2]['content'] == "Fica eleito o foro de São Paulo/SP."
+    assert consolidator.stats['fragmentos_mesclados'] == 2
+    assert consolidator.stats['motivos'] == {'subitem': 2, 'valor': 0, 'corpo_curto': 0}
+    print("[OK] Cláusulas irmãs e curtas preservadas")
+
+
+def test_pdf_consolidation_merges_short_bodies():
+    """
+    Testa a mescla por corpo curto: numeração mais profunda de outra cláusula e título sem numeração.
+    """
+    from backend.parsers.consolidate import FragmentConsolidator
+
+    body = "Texto corrido da cláusula com palavras suficientes para não ser fragmento."
+
+    def clause(title, content):
+        return {'title': title, 'content': content, 'section': None, 'source': 'paragraph'}
+
+    consolidator = FragmentConsolidator()
+    clauses = list(consolidator([
+        clause("CLÁUSULA 6 – JUROS", body),
+        clause("7.1 Ver anexo.", "Conforme tabela."),
+        clause("7.2 Item de outra cláusula", body),
+        clause("Observação", "Sem efeito."),
+        clause("Nota explicativa", body),
+        clause("8. PRAZO", "Curto."),
+    ]))
+
+    titles = [c['title'] for c in clauses]
+    assert titles == ["CLÁUSULA 6 – JUROS", "7.2 Item de outra cláusula", "Nota explicativa", "8. PRAZO"], titles
+    assert clauses[0]['content'].endswith("7.1 Ver anexo.\nConforme tabela.")
+    assert clauses[1]['content'].endswith("Observação\nSem efeito.")
+    assert consolidator.stats['motivos'] == {'subitem': 0, 'valor': 0, 'corpo_curto': 2}
+    assert consolidator.stats['clausulas_depois'] == 4
+    print("[OK] Corpos curtos mesclados na cláusula anterior")
+
+
+def test_table_columnar_summary():
+    """
+    Testa o modelo colunar de tabelas e o resumo usado no lugar de cronogramas grandes.
+    """
+    from backend.parsing import table_to_clause
+    from backend.parsers.table import Table
+
+    rows = [["Parcela", "Data", "Saldo Devedor", None]]
+    rows += [[str(n), f"15/{n % 12 + 1:02d}/{2025 + n // 12}", f"R$ {100 - n}.000,00", ""]
+             for n in range(1, 25)]
+
+    table = Table.from_rows(rows)
+    assert table.n_rows == 24 and table.n_columns == 4
+    assert table.kinds == ['number', 'date', 'number', 'text']
+    assert table.column_range(1) == ("15/02/2025", "15/01/2027")
+    assert table.column_range(2) == ("R$ 76.000,00", "R$ 99.000,00")
+    assert list(table.rows())[0] == ["1", "15/02/2025", "R$ 99.000,00", ""]
+
+    clause = table_to_clause(rows, page=3)
+    assert clause['content'] == table.summary()
+    assert "Tabela com 24 linhas e 4 colunas" in clause['content']
+    assert "Data (data): 15/02/2025 a 15/01/2027" in clause['content']
+
+    # Linhas completas continuam disponíveis (e serializáveis) para relatórios
+    full = Table.from_dict(clause['table'])
+    assert full.text().count('\n') == 24
+
+    small = table_to_clause(rows[:4], page=1)
+    assert small['content'] == "Parcela | Data | Saldo Devedor\n" + '\n'.join(
+        ' | '.join(c for c in row if c) for row in rows[1:4])
+    print("[OK] Tabelas colunares resumidas")
+
+
+def test_parse_from_memory(tmp_path):
+    """
+    Testa o parsing direto de bytes/memoryview/BytesIO, sem arquivo temporário.
+    """
+    import io
+    from backend.parsing import parse_document
+    from backend.parsers.cache import ParseCache, compute_file_hash
+
+    for path in (_make_docx(tmp_path / "minuta.docx"), _make_pdf(tmp_path / "minuta.pdf")):
+        data = path.read_bytes()
+        expected = [c.to_dict() for c in parse_document(str(path)).clauses]
+
+        upload = io.BytesIO(data)
+        upload.name = path.name
+        for source in (data, memoryview(data), upload):
+            doc = parse_document(source, filename=path.name)
+            assert doc.filename == path.name
+            assert [c.to_dict() for c in doc.clauses] == expected
+
+        # Mesmo hash do arquivo em disco; entra no cache com a mesma chave
+        file_hash = compute_file_hash(upload)
+        assert file_hash == compute_file_hash(str(path))
+        cache = ParseCache(str(tmp_path / "cache"))
+        parse_document(upload, cache=cache, file_hash=file_hash)
+        assert parse_document(str(path), cache=cache).from_cache
+
+    try:
+        parse_document(b"%PDF-1.4")
+        assert False, "conteúdo em memória sem nome deveria falhar"
+    except ValueError:
+        pass
+    print("[OK] Parsing a partir da memória")
+
+
+def test_docx_section_tree(tmp_path):
+    """
+    Testa a árvore de seções do extract_blocks_docx (níveis, blocos por seção).
+    """
+    import docx
+    from backend.parsers.docx_parser import extract_sections_docx, extract_blocks_docx
+
+    d = docx.Document()
+    d.add_paragraph("Preâmbulo")
+    for n in (1, 2):
+        d.add_heading(f"CLÁUSULA {n} – OBJETO", level=1)
+        d.add_paragraph(f"Texto da cláusula {n}.")
+        for i in (1, 2):
+            d.add_heading(f"{n}.{i} Subitem", level=2)
+            d.add_paragraph(f"Texto do subitem {n}.{i}.")
+    table = d.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = "Data"
+    table.cell(0, 1).text = "Valor"
+    d.add_heading("ANEXO I", level=1)
+    d.add_paragraph("Texto do anexo.")
+    path = tmp_path / "secoes.docx"
+    d.save(str(path))
+
+    blocks, tree = extract_sections_docx(str(path))
+    assert blocks == extract_blocks_docx(str(path))
+
+    # Heading 1 fecha o anterior; Heading 2 fica sob o Heading 1 aberto
+    clause2 = tree.find("2")
+    assert [c.title for c in tree.children(0)] == ["CLÁUSULA 1 – OBJETO", "CLÁUSULA 2 – OBJETO", "ANEXO I"]
+    assert tree.find("2.1").path == "CLÁUSULA 2 – OBJETO > 2.1 Subitem"
+    assert tree.parent(tree.find("2.2").id) is clause2
+    assert [s.title for s in tree.siblings(tree.find("2.1").id)] == ["2.2 Subitem"]
+
+    # Blocos sob a cláusula 2 (inclui subitens e a tabela, que está na seção 2.2)
+    under = [blocks[i]['text'] for i in tree.blocks_under(clause2.id)]
+    assert under == ["Texto da cláusula 2.", "Texto do subitem 2.1.", "Texto do subitem 2.2.", "Data", "Valor"]
+    assert [blocks[i]['text'] for i in tree.own_blocks(clause2.id)] == ["Texto da cláusula 2."]
+
+    assert blocks[0]['section_id'] == 0 and blocks[0]['section_path'] == ""
+    assert tree.section_of(blocks[-1]).title == "ANEXO I"
+    assert blocks[-2]['table_ref'] == "Tabela 1 / R1C2"
+    assert tree.blocks_under(0) == range(len(blocks))
+
+    from backend.parsers.sections import SectionTree
+    restored = SectionTree.from_dict(tree.to_dict())
+    assert restored.blocks_under(restored.find("2").id) == tree.blocks_under(clause2.id)
+    print("[OK] Árvore de seções do DOCX")
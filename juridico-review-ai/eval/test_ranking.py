@@ -0,0 +1,567 @@
+"""
+Testes dos componentes de ranking contra o catálogo.
+"""
+import sys
+import os
+
+# Adiciona o diretório raiz ao path para imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+CATALOG = {'clausulas': [
+    {'id': 'CRI_001', 'titulo': 'OBJETO', 'keywords': ['objeto', 'créditos'], 'template': 'Objeto da emissão',
+     'regex_patterns': ['(?i)objeto', '([invalido']},
+    {'id': 'CRI_002', 'titulo': 'PRAZO', 'keywords': ['prazo'], 'template': 'Prazo de vencimento'},
+    {'id': 'CRI_003', 'titulo': 'FORO', 'keywords': ['foro'], 'template': 'Foro da comarca'},
+]}
+
+CATALOG_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'catalogos', 'catalogo_cri_destinacao.yaml')
+
+QUERIES = [
+    "CLÁUSULA 1 – DO OBJETO A Emissora emitirá os CRI lastreados em créditos imobiliários.",
+    "Fica eleito o foro da comarca de São Paulo para dirimir quaisquer dúvidas.",
+    "O prazo de vencimento dos CRI é de 120 meses contados da data de emissão.",
+    "Remuneração: juros correspondentes a 100% da Taxa DI acrescida de spread de 1,5% ao ano.",
+    "Texto sem relação alguma com o catálogo.",
+]
+
+
+class _StubEncoder:
+    """Encoder determinístico no lugar do SentenceTransformer (bag of words por hash)"""
+
+    DIM = 32
+
+    def __init__(self, model_name=None):
+        self.calls = 0
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        import zlib
+        import numpy as np
+
+        self.calls += 1
+        vectors = np.zeros((len(texts), self.DIM), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for token in text.lower().split():
+                vectors[i, zlib.crc32(token.encode('utf-8')) % self.DIM] += 1
+        return vectors
+
+
+def _stub_ranker(monkeypatch):
+    """HybridRanker sobre o catálogo de CRI com _StubEncoder (sem baixar modelo)"""
+    import types
+    import yaml
+
+    try:
+        import sentence_transformers  # noqa: F401
+    except ImportError:
+        # Só o nome importado pelo ranker_v2; o encoder é trocado logo abaixo
+        module = types.ModuleType('sentence_transformers')
+        module.SentenceTransformer = _StubEncoder
+        monkeypatch.setitem(sys.modules, 'sentence_transformers', module)
+    from backend import ranker_v2
+    monkeypatch.setattr(ranker_v2, 'SentenceTransformer', _StubEncoder)
+
+    with open(CATALOG_PATH, 'r', encoding='utf-8') as f:
+        catalog = yaml.safe_load(f)
+    ranker = ranker_v2.HybridRanker()
+    ranker.encode_catalog(catalog)
+    return ranker
+
+
+def _queries(ranker):
+    """QUERIES mais cláusulas do próprio catálogo reescritas como texto de minuta"""
+    clauses = ranker.catalog_clauses
+    return QUERIES + [f"{clauses[i]['titulo']} {clauses[i].get('template', '')}" for i in range(0, len(clauses), 6)]
+
+
+def test_catalog_index_reuses_unchanged_clauses(tmp_path):
+    """
+    Testa o índice persistente do catálogo: só cláusulas novas/editadas são codificadas.
+    """
+    import copy
+    import numpy as np
+    from backend.catalog_index import CatalogIndex, clause_text
+
+    encoded = []
+
+    def encode(texts):
+        encoded.append(list(texts))
+        return np.array([[len(t), t.count('o'), 1.0] for t in texts], dtype=np.float32)
+
+    def tokenize(text):
+        return text.lower().split()
+
+    clauses = CATALOG['clausulas']
+    first = CatalogIndex(str(tmp_path), 'modelo/teste').load(clauses, encode, tokenize)
+    assert first.stats == {'codificadas': 3, 'reaproveitadas': 0}
+    assert first.corpus_tokenized[1] == tokenize(clause_text(clauses[1]))
+    assert list(first.invalid[0]) == ['1']
+
+    # Nova carga: tudo do arquivo, por mmap
+    again = CatalogIndex(str(tmp_path), 'modelo/teste').load(clauses, encode, tokenize)
+    assert again.stats == {'codificadas': 0, 'reaproveitadas': 3}
+    assert isinstance(again.embeddings, np.memmap)
+    assert np.array_equal(again.embeddings, first.embeddings)
+
+    # Editar uma cláusula recodifica só ela
+    edited = copy.deepcopy(clauses)
+    edited[2]['template'] = 'Foro da comarca de São Paulo'
+    result = CatalogIndex(str(tmp_path), 'modelo/teste').load(edited, encode, tokenize)
+    assert result.stats == {'codificadas': 1, 'reaproveitadas': 2}
+    assert encoded[-1] == [clause_text(edited[2])]
+    assert np.array_equal(result.embeddings[:2], first.embeddings[:2])
+
+    # Outro modelo não reaproveita embeddings
+    other = CatalogIndex(str(tmp_path), 'outro-modelo').load(clauses, encode, tokenize)
+    assert other.stats['codificadas'] == 3
+    print("[OK] Índice persistente do catálogo")
+
+
+def test_catalog_index_concurrent_writers_and_compaction(tmp_path):
+    """
+    Testa o índice do catálogo com gravações concorrentes e compactação da matriz.
+    """
+    import copy
+    import json
+    import numpy as np
+    from backend.catalog_index import CatalogIndex, clause_text, MANIFEST, LOCK, STALE_FRACTION
+
+    def encode(texts):
+        return np.array([[len(t), t.count('o'), 1.0] for t in texts], dtype=np.float32)
+
+    def tokenize(text):
+        return text.lower().split()
+
+    clauses = CATALOG['clausulas']
+    other = [{**clause, 'id': clause['id'].replace('CRI', 'CRA')} for clause in clauses]
+    index_path = tmp_path / 'modelo_teste'
+
+    # Outro processo grava seu catálogo enquanto este codifica (manifest lido antes)
+    def encode_racing(texts):
+        CatalogIndex(str(tmp_path), 'modelo/teste').load(other, encode, tokenize)
+        return encode(texts)
+
+    CatalogIndex(str(tmp_path), 'modelo/teste').load(clauses, encode_racing, tokenize)
+    for catalog in (clauses, other):
+        reloaded = CatalogIndex(str(tmp_path), 'modelo/teste').load(catalog, encode, tokenize)
+        assert reloaded.stats == {'codificadas': 0, 'reaproveitadas': 3}
+        assert np.array_equal(reloaded.embeddings, encode([clause_text(c) for c in catalog]))
+    # Só o arquivo de embeddings vigente sobra, e o lock é liberado
+    assert len(list(index_path.glob('embeddings-*.npy'))) == 1
+    assert not (index_path / LOCK).exists()
+
+    # Edições sucessivas: a versão anterior sai do manifest e a matriz é compactada
+    edited = copy.deepcopy(clauses)
+    for n in range(10):
+        edited[2]['template'] = f'Foro da comarca {n}'
+        result = CatalogIndex(str(tmp_path), 'modelo/teste').load(edited, encode, tokenize)
+        assert result.stats == {'codificadas': 1, 'reaproveitadas': 2}
+        assert np.array_equal(result.embeddings, encode([clause_text(c) for c in edited]))
+
+    with open(index_path / MANIFEST, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    rows = len(np.load(index_path / manifest['embeddings']))
+    assert len(manifest['entries']) == 6
+    assert rows <= len(manifest['entries']) / (1 - STALE_FRACTION)
+    live_rows = [entry['row'] for entry in manifest['entries'].values()]
+    assert len(set(live_rows)) == len(live_rows) and max(live_rows) < rows
+    assert CatalogIndex(str(tmp_path), 'modelo/teste').load(other, encode, tokenize).stats['codificadas'] == 0
+    print("[OK] Índice do catálogo: escritores concorrentes e compactação")
+
+
+def _mmr_reference(scores, embeddings, lambda_param, top_k):
+    """MMR original: cosseno candidato a candidato"""
+    import numpy as np
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    selected = [int(np.argmax(scores))]
+    candidates = [i for i in range(len(scores)) if i != selected[0]]
+    for _ in range(min(top_k - 1, len(candidates))):
+        mmr = [lambda_param * scores[i] + (1 - lambda_param) *
+               (1 - cosine_similarity(embeddings[i:i + 1], embeddings[selected]).max()) for i in candidates]
+        best = candidates[int(np.argmax(mmr))]
+        selected.append(best)
+        candidates.remove(best)
+    return selected
+
+
+def test_mmr_vectorized_matches_reference():
+    """
+    Testa o MMR vetorizado (uma query e em lote) contra o laço original.
+    """
+    import numpy as np
+    from backend.mmr import similarity_matrix, mmr_select, mmr_select_batch
+
+    rng = np.random.default_rng(0)
+    embeddings = rng.normal(size=(40, 16)).astype(np.float32)
+    scores = rng.random((25, 40))
+    similarity = similarity_matrix(embeddings)
+
+    batch = mmr_select_batch(scores, similarity, lambda_param=0.7, top_k=5)
+    assert batch.shape == (25, 5)
+    for d in range(len(scores)):
+        expected = _mmr_reference(scores[d], embeddings, 0.7, 5)
+        assert mmr_select(scores[d], similarity, 0.7, 5) == expected
+        assert batch[d].tolist() == expected
+
+    # top_k maior que o catálogo e catálogo vazio
+    assert sorted(mmr_select(scores[0][:3], similarity[:3, :3], 0.7, 10)) == [0, 1, 2]
+    assert mmr_select(np.array([]), None, 0.7, 5) == []
+
+    # Uma matriz de similaridade por query (candidatas do ranking em dois estágios)
+    shortlists = np.array([rng.choice(40, size=8, replace=False) for _ in range(len(scores))])
+    per_query = similarity[shortlists[:, :, None], shortlists[:, None, :]]
+    candidate_scores = np.take_along_axis(scores, shortlists, axis=1)
+    staged = mmr_select_batch(candidate_scores, per_query, lambda_param=0.7, top_k=3)
+    for d in range(len(scores)):
+        assert staged[d].tolist() == mmr_select(candidate_scores[d], per_query[d], 0.7, 3)
+    print("[OK] MMR vetorizado")
+
+
+def test_pattern_scanner_matches_individual_search():
+    """
+    Testa o scanner de regex_patterns contra um re.search por pattern.
+    """
+    import re
+    import numpy as np
+    from backend.pattern_scanner import PatternScanner, scope_flags, literal_text
+
+    pattern_lists = [
+        ['(?i)Seção\\ Partes', '(?i)Seção\\ Partes\\ e\\ Objeto', 'cláusula \\d+'],
+        ['(?i)Capítulo\\ Despesas', '([invalido'],
+        [],
+        ['(?i)Seção\\ Partes', r'(\w)\1', '(?s)início.*fim'],
+    ]
+    texts = [
+        "SEÇÃO PARTES E OBJETO da cláusula 12",
+        "Capítulo despesas; seção partes",
+        "Sem nenhum pattern",
+        "Início do texto\ncom fim, ss duplicado",
+        "",
+    ]
+
+    scanner = PatternScanner(pattern_lists)
+    assert [item['pattern'] for item in scanner.invalid] == ['([invalido']
+    assert literal_text('(?i)Capítulo\\ Despesas') == 'Capítulo Despesas'
+    assert literal_text('cláusula \\d+') is None
+    assert scope_flags('(?s)início.*fim') == '(?s:início.*fim)'
+
+    # Inválidos gravados no índice do catálogo: mesmas flags, mesmo veredito
+    from backend.catalog_index import invalid_patterns
+    known = [invalid_patterns(patterns) for patterns in pattern_lists]
+    assert known == [{}, {'1': scanner.invalid[0]['erro']}, {}, {}]
+    assert PatternScanner(pattern_lists, known_invalid=known).invalid == scanner.invalid
+
+    expected = np.zeros((len(texts), len(pattern_lists)))
+    for d, text in enumerate(texts):
+        for c, patterns in enumerate(pattern_lists):
+            valid = [p for p in patterns if p != '([invalido']
+            hits = sum(1 for p in valid if re.search(p, text, re.IGNORECASE | re.MULTILINE))
+            expected[d, c] = hits / len(patterns) if patterns else 0.0
+
+    assert np.array_equal(scanner.score_matrix(texts), expected)
+    assert np.array_equal(scanner.scores(texts[0]), expected[0])
+    # Só as cláusulas candidatas de cada texto
+    candidates = np.array([[3, 0], [1, 2], [0, 3], [3, 1], [2, 0]])
+    assert np.array_equal(scanner.score_pairs(texts, candidates), np.take_along_axis(expected, candidates, axis=1))
+    # Pattern que é prefixo de outro: os dois contam no mesmo trecho
+    assert expected[0, 0] == 1.0
+    print("[OK] Scanner de regex_patterns")
+
+
+def test_keyword_index_matches_substring_search():
+    """
+    Testa o autômato de keywords contra a busca por substring (texto normalizado).
+    """
+    import numpy as np
+    from backend.keyword_index import KeywordIndex
+    from backend.utils.text_norm import normalize
+
+    keyword_lists = [
+        ['Créditos Imobiliários', 'crédito', 'cessão'],
+        ['foro', 'comarca', 'São Paulo'],
+        [],
+        ['he', 'she', 'hers', 'crédito'],
+    ]
+    texts = [
+        "CESSÃO DOS CREDITOS\nIMOBILIÁRIOS",
+        "Fica eleito o foro da Comarca de Sao Paulo",
+        "ushers",
+        "Sem nenhuma keyword",
+        "",
+    ]
+
+    index = KeywordIndex(keyword_lists)
+    expected = np.zeros((len(texts), len(keyword_lists)))
+    for d, text in enumerate(texts):
+        for c, keywords in enumerate(keyword_lists):
+            expected[d, c] = sum(1 for kw in keywords if normalize(kw) in normalize(text))
+
+    assert np.array_equal(index.count_matrix(texts), expected)
+    assert np.array_equal(index.hit_counts(texts[2]), expected[2])
+    # Sufixos sobrepostos (fail links): "ushers" contém she, he e hers
+    assert expected[2, 3] == 3
+    # Acentos e quebra de linha não impedem o casamento
+    assert expected[0, 0] == 3
+
+    scores = index.score_matrix(texts)
+    assert scores[1, 1] == 1.0 and scores[0, 2] == 0.0
+    print("[OK] Índice de keywords")
+
+
+def test_bm25_index_matches_okapi():
+    """
+    Testa o BM25 com índice invertido contra o rank_bm25.BM25Okapi.
+    """
+    import numpy as np
+    from rank_bm25 import BM25Okapi
+    from backend.bm25 import BM25Index, tokenize
+
+    texts = [
+        "Cessão dos créditos imobiliários à securitizadora",
+        "O prazo de vencimento dos CRI é de 120 meses",
+        "Fica eleito o foro da comarca de São Paulo",
+        "Os créditos imobiliários lastreiam os CRI",
+        "A remuneração dos CRI corresponde ao IPCA",
+        "",
+    ]
+    corpus = [tokenize(t) for t in texts]
+    assert tokenize("Cessão dos CRÉDITOS") == ['cessao', 'dos', 'creditos']
+
+    index = BM25Index(corpus)
+    reference = BM25Okapi(corpus)
+    # "dos"/"cri" em mais da metade dos documentos (piso epsilon); token repetido; fora do vocabulário
+    queries = [tokenize(q) for q in ["creditos imobiliarios", "prazo dos CRI CRI", "inexistente", "", "foro"]]
+
+    expected = np.vstack([reference.get_scores(q) for q in queries])
+    assert np.allclose(index.score_matrix(queries), expected)
+    assert np.allclose(index.scores(queries[1]), expected[1])
+
+    indices, scores = index.top_k(queries, k=3)
+    assert indices.shape == (len(queries), 3)
+    for d in range(len(queries)):
+        assert np.allclose(scores[d], np.sort(expected[d])[::-1][:3])
+        assert np.allclose(expected[d][indices[d]], scores[d])
+    assert indices[0, 0] in (0, 3)
+
+    # Documentos fora da máscara não entram no top-k
+    mask = np.array([False, True, True, True, True, True])
+    masked, _ = index.top_k(queries[:1], k=1, mask=mask)
+    assert masked[0, 0] == 3
+
+    assert BM25Index([]).score_matrix(queries).shape == (len(queries), 0)
+    print("[OK] BM25 com índice invertido")
+
+
+def test_fuzzy_matrices_match_pairwise_loop():
+    """
+    Testa as matrizes do rapidfuzz cdist contra o laço par a par do app.py.
+    """
+    import numpy as np
+    from rapidfuzz import fuzz
+    from backend.matching import prepare, fuzzy_matrix, title_word_bonus
+
+    cat_titles = prepare(["Cessão de Créditos", "FORO", "Vencimento Antecipado dos CRI", ""])
+    doc_titles = prepare(["CLÁUSULA 3 – CESSÃO DOS CRÉDITOS", "Do Foro", "Vencimentos", "Anexo I"])
+    assert cat_titles[0] == "cessao de creditos"
+
+    expected_ratio = np.array([[fuzz.partial_ratio(c, d) for d in doc_titles] for c in cat_titles])
+    assert np.allclose(fuzzy_matrix(cat_titles, doc_titles, scorer=fuzz.partial_ratio), expected_ratio)
+
+    expected_bonus = np.zeros((len(cat_titles), len(doc_titles)))
+    for i, cat_title in enumerate(cat_titles):
+        for j, doc_title in enumerate(doc_titles):
+            for word in [w for w in cat_title.split() if len(w) > 3]:
+                if word in doc_title:
+                    expected_bonus[i, j] += 10
+                elif any(fuzz.ratio(word, doc_word) > 80 for doc_word in doc_title.split()):
+                    expected_bonus[i, j] += 5
+    bonus = title_word_bonus(cat_titles, doc_titles)
+    assert np.array_equal(bonus, expected_bonus)
+    # "vencimento" casa com "vencimentos" por substring; "creditos" exato
+    assert bonus[2, 2] == 10 and bonus[0, 0] == 20
+
+    assert fuzzy_matrix([], doc_titles).shape == (0, len(doc_titles))
+    print("[OK] Matrizes de fuzzy matching")
+
+
+def test_assign_clauses_is_globally_optimal():
+    """
+    Testa a atribuição catálogo × documento contra a escolha gulosa e força bruta.
+    """
+    import itertools
+    import numpy as np
+    from backend.matching import assign_clauses
+
+    # Gulosa: as duas cláusulas do catálogo escolheriam o documento 0
+    scores = np.array([
+        [10.0, 9.0, 0.0],
+        [8.0, 1.0, 0.0],
+        [0.0, 0.0, 0.0],
+    ])
+    one = assign_clauses(scores, max_per_doc=1)
+    assert sorted(one.pairs) == [(0, 1, 9.0), (1, 0, 8.0)]
+    assert one.unmatched_catalog == [2] and one.unmatched_document == [2]
+
+    # Uma cláusula do documento pode atender até max_per_doc cláusulas do catálogo
+    two = assign_clauses(scores, max_per_doc=2)
+    assert sorted(two.pairs) == [(0, 0, 10.0), (1, 0, 8.0)]
+    assert two.by_catalog()[1] == (0, 8.0)
+    assert two.unmatched_document == [1, 2]
+
+    # Mínimo: pares fracos não se formam
+    strict = assign_clauses(scores, max_per_doc=1, min_score=8.5)
+    assert strict.pairs == [(0, 0, 10.0)] and strict.unmatched_catalog == [1, 2]
+
+    # Força bruta em uma matriz aleatória (um para um)
+    rng = np.random.default_rng(1)
+    random_scores = rng.random((4, 5))
+    best = max(sum(random_scores[c, d] for c, d in enumerate(perm))
+               for perm in itertools.permutations(range(5), 4))
+    result = assign_clauses(random_scores)
+    assert np.isclose(sum(score for _, _, score in result.pairs), best)
+
+    empty = assign_clauses(np.zeros((2, 0)))
+    assert empty.pairs == [] and empty.unmatched_catalog == [0, 1]
+    print("[OK] Atribuição global de cláusulas")
+
+
+def _reference_components(ranker, query):
+    """
+    Componentes de uma query calculados à parte, sem os índices do ranker:
+    rank_bm25, cosseno, um re.search por pattern e substring de keywords.
+    """
+    import re
+    import numpy as np
+    from rank_bm25 import BM25Okapi
+    from backend.bm25 import tokenize
+    from backend.utils.text_norm import normalize
+
+    bm25 = BM25Okapi(ranker.corpus_tokenized).get_scores(tokenize(query))
+    if bm25.max() > 0:
+        bm25 = bm25 / bm25.max()
+
+    query_embedding = np.asarray(ranker.embedding_model.encode([query]))[0]
+    catalog = np.asarray(ranker.catalog_embeddings)
+    semantic = catalog @ query_embedding / (np.linalg.norm(catalog, axis=1) * np.linalg.norm(query_embedding))
+
+    regex, keyword = [], []
+    query_norm = normalize(query)
+    for clause in ranker.catalog_clauses:
+        patterns = clause.get('regex_patterns', [])
+        hits = 0
+        for pattern in patterns:
+            try:
+                hits += bool(re.search(pattern, query, re.IGNORECASE | re.MULTILINE))
+            except re.error:
+                pass
+        regex.append(hits / len(patterns) if patterns else 0.0)
+
+        keywords = [normalize(str(kw)) for kw in clause.get('keywords', [])]
+        keyword.append(sum(1 for kw in keywords if kw and kw in query_norm) / len(keywords) if keywords else 0.0)
+
+    return {'bm25': bm25, 'semantic': semantic, 'regex': np.array(regex), 'keyword': np.array(keyword)}
+
+
+def test_rank_queries_batch_matches_per_clause(monkeypatch):
+    """
+    Testa o ranking em lote (rank_queries) contra os componentes calculados à parte + mmr_rerank.
+    """
+    import numpy as np
+
+    ranker = _stub_ranker(monkeypatch)
+    from backend.ranker_v2 import DEFAULT_WEIGHTS
+    queries = _queries(ranker)
+    batch = ranker.rank_queries(queries, top_k=5, lambda_param=0.7)
+    assert len(batch) == len(queries)
+
+    for query, matches in zip(queries, batch):
+        components = _reference_components(ranker, query)
+        scores = sum(DEFAULT_WEIGHTS[name] * components[name] for name in components)
+        assert np.allclose(scores, ranker.hybrid_score(query))
+
+        top = ranker.mmr_rerank(scores, lambda_param=0.7, top_k=5)
+        assert [m['clause_id'] for m in matches] == [ranker.catalog_clauses[i].get('id') for i in top]
+        for match, i in zip(matches, top):
+            assert np.isclose(match['combined_score'], scores[i])
+            for name in components:
+                assert np.isclose(match['scores_breakdown'][name], components[name][i])
+    print("[OK] Ranking em lote igual ao ranking cláusula a cláusula")
+
+
+def test_two_stage_ranking_matches_full_when_shortlist_covers(monkeypatch):
+    """
+    Testa o ranking em dois estágios do HybridRanker: ordem da shortlist e top-k igual ao completo.
+    """
+    import numpy as np
+
+    ranker = _stub_ranker(monkeypatch)
+    from backend.ranker_v2 import DEFAULT_WEIGHTS, LEXICAL_COMPONENTS
+
+    queries = _queries(ranker)
+    top_k, candidates = 3, 12
+    indices, lexical = ranker.shortlist(queries, candidates)
+    lexical_scores = sum(DEFAULT_WEIGHTS[name] * lexical[name] for name in LEXICAL_COMPONENTS)
+    assert indices.shape == (len(queries), candidates)
+    for d, row in enumerate(indices):
+        # Candidatas distintas, em ordem decrescente de score lexical, e as N melhores do catálogo
+        assert len(set(row.tolist())) == candidates
+        assert np.all(np.diff(lexical_scores[d, row]) <= 0)
+        outside = np.setdiff1d(np.arange(len(ranker.catalog_clauses)), row)
+        assert lexical_scores[d, outside].max() <= lexical_scores[d, row].min()
+
+    full = ranker.rank_queries(queries, top_k=top_k)
+    staged = ranker.rank_queries(queries, top_k=top_k, candidates=candidates)
+    covered = 0
+    for d, (reference, matches) in enumerate(zip(full, staged)):
+        shortlisted = {ranker.catalog_clauses[i].get('id') for i in indices[d]}
+        if not {m['clause_id'] for m in reference} <= shortlisted:
+            continue
+        # Shortlist contém o top-k completo: o MMR restrito escolhe o mesmo
+        covered += 1
+        assert [m['clause_id'] for m in matches] == [m['clause_id'] for m in reference]
+        for match, ref in zip(matches, reference):
+            assert np.isclose(match['combined_score'], ref['combined_score'])
+            for name, value in ref['scores_breakdown'].items():
+                assert np.isclose(match['scores_breakdown'][name], value)
+    assert covered >= len(queries) // 2
+
+    # Shortlist do tamanho do catálogo é o scoring completo
+    everything = ranker.rank_queries(queries, top_k=top_k, candidates=len(ranker.catalog_clauses))
+    assert [[m['clause_id'] for m in ms] for ms in everything] == [[m['clause_id'] for m in ms] for ms in full]
+
+    try:
+        ranker.rank_queries(queries, top_k=top_k, candidates=0)
+        raise AssertionError("candidates=0 deveria falhar")
+    except ValueError:
+        pass
+    print("[OK] Ranking em dois estágios")
+
+
+def test_rank_clause_stream_yields_before_input_ends(monkeypatch):
+    """
+    Testa que o ranking em streaming devolve o primeiro resultado antes do fim da entrada.
+    """
+    ranker = _stub_ranker(monkeypatch)
+    from backend.ranker_v2 import rank_clause_stream
+
+    queries = _queries(ranker) * 20
+    consumed = []
+
+    def clauses():
+        # Cláusulas chegando uma a uma, como do parsing em streaming
+        for n, query in enumerate(queries):
+            consumed.append(n)
+            yield {'title': f"Cláusula {n}", 'content': query, 'index': n}
+
+    stream = rank_clause_stream(clauses(), ranker, top_k=3)
+    first = next(stream)
+    assert first['clause']['index'] == 0
+    assert len(consumed) < len(queries)
+
+    # O resto do fluxo devolve o mesmo ranking do lote único
+    results = [first] + list(stream)
+    batch = ranker.rank_queries([f"Cláusula {n} {q}" for n, q in enumerate(queries)], top_k=3)
+    assert [r['clause']['index'] for r in results] == list(range(len(queries)))
+    assert [[m['clause_id'] for m in r['matches']] for r in results] == [[m['clause_id'] for m in ms] for ms in batch]
+    print("[OK] Ranking em streaming começa antes do fim da entrada")
@@ -0,0 +1,71 @@
+"""
+Testes do armazenamento em SQLite de cláusulas e resultados (ReviewStore).
+"""
+import sys
+import os
+
+# Adiciona o diretório raiz ao path para imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+CATALOG = {'clausulas': [{'id': 'CRI_001', 'titulo': 'OBJETO'}, {'id': 'CRI_002', 'titulo': 'PRAZO'}]}
+
+
+def _rank(clauses):
+    """Ranking fictício: alterna entre as duas cláusulas do catálogo"""
+    for clause in clauses:
+        catalog_clause = CATALOG['clausulas'][clause['index'] % 2]
+        yield {'clause': clause, 'matches': [{'catalog_clause': catalog_clause, 'clause_id': catalog_clause['id'],
+                                              'combined_score': 0.8}]}
+
+
+def _classify(ranked):
+    """Tier-1 fictício: cláusulas pares PRESENTE, ímpares AUSENTE"""
+    for item in ranked:
+        status = 'PRESENTE' if item['clause']['index'] % 2 == 0 else 'AUSENTE'
+        yield {'clause': item['clause'], 'classification': {'classificacao': status, 'confianca': 0.9},
+               'all_matches': item['matches']}
+
+
+def test_review_store_streams_stages(tmp_path, monkeypatch):
+    """
+    Testa o fluxo parsing -> ranking -> Tier-1 -> Tier-2 por cursores, em lotes pequenos.
+    """
+    import backend.store
+    from backend.store import ReviewStore
+    from backend.router import ClauseRouter
+
+    monkeypatch.setattr(backend.store, 'BATCH_SIZE', 3)
+
+    clauses = [{'title': f"CLÁUSULA {n}", 'content': f"Texto {n}", 'section': None, 'source': 'paragraph',
+                'index': 100 + n, 'page': n} for n in range(10)]
+
+    with ReviewStore(tmp_path / "revisao.sqlite", CATALOG) as store:
+        assert store.add_clauses(iter(clauses)) == 10
+        # Cada etapa lê a anterior por cursor enquanto grava a sua
+        assert store.add_ranked(_rank(store.clauses())) == 10
+        assert store.add_classifications(_classify(store.ranked()), router=ClauseRouter()) == 10
+
+        needs_tier2 = store.results(tier2=True)
+        assert len(needs_tier2) == 5 and needs_tier2
+        store.add_suggestions({**item, 'suggestion': {'texto_sugerido': item['clause']['title']},
+                               'catalog_clause': item['all_matches'][0]['catalog_clause']}
+                              for item in needs_tier2)
+
+        # Visões relidas a cada iteração, como os relatórios usam
+        tier1 = store.results(tier2=False)
+        assert len(tier1) == 5
+        assert [item['clause']['index'] for item in tier1] == [0, 2, 4, 6, 8]
+        assert list(tier1) == list(tier1)
+        assert tier1 and next(iter(tier1))['all_matches'][0]['catalog_clause'] is CATALOG['clausulas'][0]
+
+        suggestions = list(store.suggestions())
+        assert [s['suggestion']['texto_sugerido'] for s in suggestions] == [f"CLÁUSULA {n}" for n in (1, 3, 5, 7, 9)]
+        assert suggestions[0]['catalog_clause']['id'] == 'CRI_002'
+        assert suggestions[0]['classification']['classificacao'] == 'AUSENTE'
+
+        document = store.document("minuta.pdf")
+        assert len(document.clauses) == 10
+        assert next(iter(document.clauses))['page'] == 0
+        assert store.status_counts() == {'presente': 5, 'parcial': 0, 'ausente': 5}
+    print("[OK] ReviewStore em streaming")
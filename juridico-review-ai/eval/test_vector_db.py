@@ -0,0 +1,127 @@
+"""
+Testes do banco vetorial (histórico para RAG): busca lexical e exemplos combinados.
+"""
+import sys
+import os
+import zlib
+
+# Adiciona o diretório raiz ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+CATALOG = "catalogo_cri"
+
+HISTORY = [
+    ("CLÁUSULA 5 – ATUALIZAÇÃO MONETÁRIA",
+     "O valor nominal unitário será atualizado mensalmente pela variação do IPCA."),
+    ("CLÁUSULA 7 – REMUNERAÇÃO",
+     "Os CRI farão jus a juros remuneratórios correspondentes a 100% da Taxa DI."),
+    ("CLÁUSULA 9 – GARANTIAS",
+     "Em garantia, será constituída alienação fiduciária do imóvel matriculado."),
+]
+
+
+def _stub_embedding():
+    """Bag-of-words com hash crc32 (sem modelo de embeddings)"""
+    from chromadb.api import EmbeddingFunction
+
+    class StubEmbedding(EmbeddingFunction):
+        DIM = 32
+
+        def __init__(self):
+            pass
+
+        def __call__(self, input):
+            vectors = []
+            for text in input:
+                vector = [0.0] * self.DIM
+                for word in text.lower().split():
+                    vector[zlib.crc32(word.encode('utf-8')) % self.DIM] += 1.0
+                vectors.append(vector)
+            return vectors
+
+        @staticmethod
+        def name():
+            return "stub"
+
+    return StubEmbedding()
+
+
+def _vector_db(tmp_path):
+    """DocumentVectorDB sobre uma collection em memória do ChromaDB"""
+    import chromadb
+    from chromadb.config import Settings
+    from backend.vector_db import DocumentVectorDB
+
+    db = DocumentVectorDB.__new__(DocumentVectorDB)
+    db.persist_dir = tmp_path
+    db.client = chromadb.EphemeralClient(settings=Settings(anonymized_telemetry=False, allow_reset=True))
+    db.client.reset()
+    db.embedding_function = _stub_embedding()
+    db.collection = db.client.get_or_create_collection(
+        name="clausulas_historico", embedding_function=db.embedding_function
+    )
+    db._lexical = None
+    return db
+
+
+def _add(db, document_name, clauses, classification='PRESENTE'):
+    db.add_document(document_name, [
+        {'title': title, 'content': content,
+         'classification': {'classificacao': classification, 'confianca': 0.9}}
+        for title, content in clauses
+    ], CATALOG)
+
+
+def test_lexical_search_filters_and_truncation(tmp_path):
+    """
+    Testa a busca BM25 do histórico: filtros, só termos em comum e texto truncado em 1000 caracteres.
+    """
+    db = _vector_db(tmp_path)
+    _add(db, "minuta_a.docx", HISTORY)
+    # Cláusulas AUSENTE só entram no histórico por documentos gold
+    _add(db, "GOLD_minuta_b.docx", [("CLÁUSULA 2 – PRAZO", "O prazo é de 120 meses.")], classification='AUSENTE')
+
+    results = db.search_lexical_clauses("atualização pelo ipca", n_results=5)
+    assert [r['metadata']['clause_title'] for r in results] == [HISTORY[0][0]]
+    assert results[0]['score'] > 0
+
+    assert db.search_lexical_clauses("prazo meses", filter_classification='AUSENTE')[0]['metadata']['document_name'] == "GOLD_minuta_b.docx"
+    assert db.search_lexical_clauses("prazo meses", filter_classification='PRESENTE') == []
+    assert db.search_lexical_clauses("prazo meses", filter_catalog="outro", prioritize_gold=False) == []
+
+    # O índice cobre só título + 1000 caracteres do conteúdo armazenados
+    _add(db, "minuta_c.docx", [("CLÁUSULA 12 – DISPOSIÇÕES GERAIS", "x " * 600 + "debenturistas")])
+    assert db.search_lexical_clauses("debenturistas") == []
+    assert db.search_lexical_clauses("disposições gerais")[0]['metadata']['document_name'] == "minuta_c.docx"
+    print("[OK] Busca lexical no histórico")
+
+
+def test_best_examples_combine_semantic_and_lexical(tmp_path):
+    """
+    Testa os exemplos do RAG: rankings semântico e BM25 intercalados, sem repetição, gold primeiro.
+    """
+    from backend.vector_db import DocumentVectorDB, get_rag_context_for_suggestion
+
+    db = _vector_db(tmp_path)
+    _add(db, "minuta_a.docx", HISTORY)
+    _add(db, "GOLD_minuta.docx", [("CLÁUSULA 3 – FORO", "Fica eleito o foro da comarca de São Paulo.")])
+
+    semantic = db.search_similar_clauses("taxa di", n_results=5, filter_classification='PRESENTE',
+                                         filter_catalog=CATALOG, prioritize_gold=False)
+    lexical = db.search_lexical_clauses("taxa di", n_results=5, filter_classification='PRESENTE',
+                                        filter_catalog=CATALOG, prioritize_gold=False)
+    assert lexical[0]['metadata']['clause_title'] == HISTORY[1][0]
+
+    merged = DocumentVectorDB._interleave(semantic, lexical)
+    keys = [(r['metadata']['document_name'], r['metadata']['clause_index']) for r in merged]
+    assert len(keys) == len(set(keys)) == 4
+    assert merged[0] is semantic[0] and lexical[0] in merged[:2]
+
+    examples = db.get_best_examples_for_clause("Remuneração", "juros de 100% da Taxa DI", CATALOG, n_examples=3)
+    assert len(examples) == 3
+    assert examples[0]['metadata']['is_gold']
+    assert HISTORY[1][0] in [e['metadata']['clause_title'] for e in examples]
+
+    context = get_rag_context_for_suggestion(db, "Remuneração", "juros de 100% da Taxa DI", {}, CATALOG, n_examples=2)
+    assert "⭐ [GOLD]" in context and context.count("Exemplo ") == 2
+    print("[OK] Exemplos do RAG por busca semântica e lexical")
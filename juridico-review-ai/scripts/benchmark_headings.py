@@ -0,0 +1,166 @@
+"""
+Benchmark do classificador de títulos (parsers/headings.py) contra as
+heurísticas anteriores de parse_docx/parse_pdf.
+
+Extrai as linhas das minutas (DOCX: parágrafos com negrito/estilo; PDF:
+linhas de texto), classifica cada uma com as duas implementações e reporta
+custo por linha e concordância das decisões (título e seção).
+
+Uso:
+    python scripts/benchmark_headings.py --path data/entrada --repeat 5
+"""
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path para imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.parsing import normalize_text, iter_docx_events, iter_pdf_pages
+from backend.parsers.headings import classify_line
+
+
+def legacy_docx(text: str, bold: bool, style_name: str):
+    """Heurística anterior de parse_docx; devolve (é_título, seção)"""
+    heading_match = re.match(
+        r'^(cl[áa]usula|se[çc][ãa]o|cap[íi]tulo|anexo|item|art|artigo|t[íi]tulo|par[áa]grafo)\s+(.+)$',
+        text,
+        re.IGNORECASE
+    )
+    number_match = re.match(r'^(\d+(\.\d+){0,3})[\.\)\s]*[-–—]?\s*(.*)$', text)
+    letter_match = re.match(r'^([a-z]\)|[a-z]\.|[A-Z]\)|[A-Z]\.)\s+(.+)$', text)
+    style_name = style_name.lower()
+    is_heading_style = 'heading' in style_name or 'título' in style_name or 'title' in style_name
+    is_upper = text.isupper() and len(text.split()) >= 3 and len(text.split()) <= 15
+    colon_match = re.match(r'^([^:]+):\s*$', text)
+
+    is_title = False
+    if heading_match:
+        is_title = True
+    elif number_match and number_match.group(3):
+        has_text = len(number_match.group(3).strip()) > 10
+        is_short = len(text.split()) <= 20
+        if has_text and (bold or is_heading_style or (is_upper and is_short)):
+            is_title = True
+    elif letter_match and len(text.split()) >= 3:
+        is_title = True
+    elif is_heading_style:
+        is_title = True
+    elif bold and len(text.split()) >= 3 and len(text.split()) <= 15:
+        is_title = True
+    elif is_upper and len(text) > 15 and len(text.split()) >= 3:
+        is_title = True
+    elif colon_match and len(text) <= 80 and len(text.split()) >= 2:
+        is_title = True
+
+    section = None
+    if is_title:
+        if heading_match:
+            section = f"{heading_match.group(1).upper()}: {heading_match.group(2)}"
+        elif is_upper and len(text.split()) <= 6:
+            section = text
+    return is_title, section
+
+
+def legacy_pdf(text: str, bold: bool = False, style_name: str = ''):
+    """Heurística anterior de parse_pdf; devolve (é_título, seção)"""
+    heading_match = re.match(r'^(cl[áa]usula|se[çc][ãa]o|cap[íi]tulo|anexo)\s+(.+)$', text, re.IGNORECASE)
+    number_match = re.match(r'^(\d+(\.\d+){0,2})\s*[-–—]?\s*(.+)$', text)
+
+    if heading_match or number_match:
+        section = None
+        if heading_match:
+            section = f"{heading_match.group(1).upper()}: {heading_match.group(2)}"
+        return True, section
+    if text.isupper() and len(text.split()) <= 6 and len(text) > 10:
+        return False, text
+    return False, None
+
+
+def load_lines(path: Path):
+    """Linhas normalizadas de uma minuta: [(texto, negrito, estilo)]"""
+    lines = []
+    if path.suffix.lower() == '.docx':
+        for event in iter_docx_events(str(path)):
+            if event['type'] == 'paragraph':
+                lines.append((normalize_text(event['text']), event['bold'], event['style']))
+    else:
+        for page in iter_pdf_pages(str(path), backend='pymupdf'):
+            for line in page['text'].split('\n'):
+                lines.append((normalize_text(line), False, ''))
+    return [line for line in lines if len(line[0]) >= 3]
+
+
+def _time(func, lines, repeat: int) -> float:
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for text, bold, style in lines:
+            func(text, bold, style)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def benchmark(path: str = "data/entrada", repeat: int = 5, out_json: str = None):
+    """
+    Compara classificador combinado e heurísticas anteriores.
+
+    Args:
+        path: Minuta (DOCX/PDF) ou diretório com minutas
+        repeat: Repetições (usa o melhor tempo)
+        out_json: Caminho para salvar o resultado em JSON (opcional)
+    """
+    target = Path(path)
+    files = sorted(f for f in target.iterdir() if f.suffix.lower() in ('.docx', '.pdf')) \
+        if target.is_dir() else [target]
+
+    if not files:
+        print(f"[ERRO] Nenhuma minuta encontrada em {path}")
+        return
+
+    results = []
+    print(f"{'Arquivo':40} {'Linhas':>8} {'Antes (us)':>11} {'Depois (us)':>12} {'Concord.':>9}")
+    print("-" * 84)
+    for f in files:
+        fmt = 'docx' if f.suffix.lower() == '.docx' else 'pdf'
+        legacy = legacy_docx if fmt == 'docx' else legacy_pdf
+        lines = load_lines(f)
+        if not lines:
+            continue
+
+        def combined(text, bold, style):
+            return classify_line(text, fmt, bold=bold, style_name=style)
+
+        agree = 0
+        for text, bold, style in lines:
+            verdict = combined(text, bold, style)
+            if (verdict.is_title, verdict.section) == legacy(text, bold, style):
+                agree += 1
+
+        t_legacy = _time(legacy, lines, repeat)
+        t_combined = _time(combined, lines, repeat)
+        r = {
+            "arquivo": f.name,
+            "formato": fmt,
+            "linhas": len(lines),
+            "antes_us_por_linha": round(t_legacy / len(lines) * 1e6, 3),
+            "depois_us_por_linha": round(t_combined / len(lines) * 1e6, 3),
+            "concordancia": round(agree / len(lines), 4)
+        }
+        results.append(r)
+        print(f"{r['arquivo'][:40]:40} {r['linhas']:>8} {r['antes_us_por_linha']:>11.2f} "
+              f"{r['depois_us_por_linha']:>12.2f} {r['concordancia']:>9.2%}")
+
+    if out_json:
+        with open(out_json, "w", encoding="utf-8") as fp:
+            json.dump(results, fp, ensure_ascii=False, indent=2)
+        print(f"\n[OK] Resultado salvo em: {out_json}")
+
+
+if __name__ == "__main__":
+    import fire
+    fire.Fire(benchmark)
@@ -0,0 +1,171 @@
+"""
+Benchmark de parsing com minutas sintéticas de tamanho controlado.
+
+Gera pares DOCX/PDF com scripts/gerar_minutas_sinteticas.py (um por tamanho
+em --clausulas) e mede parse_docx, parse_pdf (via parse_document),
+parsers/docx_parser.extract_blocks_docx e parsers/pdf_pymupdf.extract_blocks.
+Cada medição roda em um processo novo para que o pico de RSS seja só do
+parser medido. O resultado (JSON) traz tempo, páginas/s, pico de RSS e
+número de cláusulas/blocos, para acompanhar regressões entre versões.
+
+Uso:
+    python scripts/benchmark_parsing.py --clausulas 100,500,2000 --repeat 3 --out_json bench.json
+"""
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path para imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from scripts.gerar_minutas_sinteticas import generate, DEFAULT_CATALOGS
+
+TARGETS = ('parse_docx', 'parse_pdf', 'extract_blocks_docx', 'extract_blocks')
+
+
+def _rss_mb() -> float:
+    """Pico de RSS do processo atual (ru_maxrss é KB no Linux, bytes no macOS)"""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+def _run_target(target: str, path: str, pdf_backend: str) -> int:
+    """Executa um alvo e devolve o número de cláusulas/blocos"""
+    if target in ('parse_docx', 'parse_pdf'):
+        from backend.parsing import parse_document
+        return len(parse_document(path, pdf_backend=pdf_backend).clauses)
+    if target == 'extract_blocks_docx':
+        from backend.parsers.docx_parser import extract_blocks_docx
+        return len(extract_blocks_docx(path))
+    from backend.parsers.pdf_pymupdf import extract_blocks
+    return len(extract_blocks(path))
+
+
+def _measure(target: str, path: str, pdf_backend: str, repeat: int, queue):
+    """Processo filho: importa, mede o melhor tempo e o pico de RSS"""
+    # Imports fora da medição
+    import backend.parsing  # noqa: F401
+    import backend.parsers.docx_parser  # noqa: F401
+    import backend.parsers.pdf_pymupdf  # noqa: F401
+    rss_base = _rss_mb()
+
+    best = None
+    count = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        count = _run_target(target, path, pdf_backend)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+
+    queue.put({'tempo_segundos': best, 'contagem': count,
+               'rss_base_mb': round(rss_base, 1), 'rss_pico_mb': round(_rss_mb(), 1)})
+
+
+def measure(target: str, path: str, pdf_backend: str = 'pymupdf', repeat: int = 1) -> dict:
+    """
+    Mede um alvo em um processo novo (spawn)
+
+    Args:
+        target: Um de TARGETS
+        path: Arquivo DOCX ou PDF
+        pdf_backend: Backend do parse_pdf ('pdfplumber' ou 'pymupdf')
+        repeat: Repetições (usa o melhor tempo)
+
+    Returns:
+        {'tempo_segundos', 'contagem', 'rss_base_mb', 'rss_pico_mb'}
+    """
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_measure, args=(target, path, pdf_backend, repeat, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def benchmark(clausulas=(50, 200, 1000),
+              profundidade: int = 2,
+              tabelas: int = 2,
+              linhas_tabela: int = 40,
+              estilo: str = 'mixed',
+              pdf_backend: str = 'pymupdf',
+              alvos=TARGETS,
+              repeat: int = 1,
+              catalogos: str = DEFAULT_CATALOGS,
+              out_dir: str = None,
+              out_json: str = None,
+              seed: int = 0):
+    """
+    Gera as minutas e mede cada alvo.
+
+    Args:
+        clausulas: Tamanhos das minutas (número de cláusulas), ex. 100,500
+        profundidade: Níveis de subitens numerados
+        tabelas: Tabelas de cronograma por minuta
+        linhas_tabela: Linhas por tabela
+        estilo: Títulos 'bold', 'heading' ou 'mixed'
+        pdf_backend: Backend do parse_pdf
+        alvos: Subconjunto de TARGETS
+        repeat: Repetições por alvo
+        catalogos: Padrão glob dos catálogos YAML usados como fonte
+        out_dir: Onde gravar as minutas (padrão: diretório temporário)
+        out_json: Caminho para salvar o resultado em JSON (opcional)
+        seed: Semente do gerador
+    """
+    if isinstance(clausulas, int):
+        clausulas = (clausulas,)
+    if isinstance(alvos, str):
+        alvos = tuple(a.strip() for a in alvos.split(','))
+    unknown = set(alvos) - set(TARGETS)
+    if unknown:
+        print(f"[ERRO] Alvos desconhecidos: {', '.join(sorted(unknown))} (use {', '.join(TARGETS)})")
+        return
+
+    out_dir = out_dir or tempfile.mkdtemp(prefix="minutas_")
+    report = {
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'pdf_backend': pdf_backend,
+        'repeat': repeat,
+        'resultados': []
+    }
+
+    print(f"{'Minuta':42} {'Alvo':20} {'Tempo (s)':>10} {'Pág/s':>8} {'RSS (MB)':>9} {'Contagem':>9}")
+    print("-" * 102)
+    for n in clausulas:
+        docx_path, pdf_path, info = generate(out_dir, int(n), profundidade, tabelas, linhas_tabela,
+                                             estilo, catalogos, seed)
+        for target in alvos:
+            path = docx_path if target in ('parse_docx', 'extract_blocks_docx') else pdf_path
+            m = measure(target, str(path), pdf_backend=pdf_backend, repeat=repeat)
+            # DOCX não tem páginas: usa as do PDF com o mesmo conteúdo
+            pages_per_second = info['paginas'] / m['tempo_segundos'] if m['tempo_segundos'] else None
+            report['resultados'].append({
+                'minuta': info,
+                'alvo': target,
+                'arquivo': Path(path).name,
+                'tempo_segundos': round(m['tempo_segundos'], 4),
+                'paginas_por_segundo': round(pages_per_second, 1) if pages_per_second else None,
+                'rss_base_mb': m['rss_base_mb'],
+                'rss_pico_mb': m['rss_pico_mb'],
+                'contagem': m['contagem']
+            })
+            print(f"{info['nome'][:42]:42} {target:20} {m['tempo_segundos']:>10.3f} "
+                  f"{pages_per_second or 0:>8.1f} {m['rss_pico_mb']:>9.1f} {m['contagem']:>9}")
+
+    if out_json:
+        with open(out_json, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, ensure_ascii=False, indent=2)
+        print(f"\n[OK] Resultado salvo em: {out_json}")
+
+
+if __name__ == "__main__":
+    import fire
+    fire.Fire(benchmark)
@@ -0,0 +1,95 @@
+"""
+Benchmark dos backends de PDF do parse_document (pdfplumber x PyMuPDF).
+
+Para cada PDF, mede o tempo de parsing e compara número de cláusulas e
+tabelas entre os backends.
+
+Uso:
+    python scripts/benchmark_pdf_backends.py --path data/entrada --repeat 3
+"""
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Adiciona o diretório raiz ao path para imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.parsing import parse_document, PDF_BACKENDS
+
+
+def benchmark_file(pdf_path: str, repeat: int = 1, workers: int = 1) -> dict:
+    """
+    Mede os backends em um PDF.
+
+    Args:
+        pdf_path: Caminho do PDF
+        repeat: Repetições por backend (usa o melhor tempo)
+        workers: Processos para extração paralela
+
+    Returns:
+        Dicionário com tempo, cláusulas e tabelas por backend
+    """
+    result = {"arquivo": Path(pdf_path).name, "backends": {}}
+
+    for backend in PDF_BACKENDS:
+        best = None
+        doc = None
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            doc = parse_document(pdf_path, workers=workers, pdf_backend=backend)
+            elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+
+        result["backends"][backend] = {
+            "tempo_segundos": round(best, 4),
+            "clausulas": len(doc.clauses),
+            "tabelas": doc.metadata.get("num_tables", 0)
+        }
+
+    base = result["backends"]["pdfplumber"]["tempo_segundos"]
+    fast = result["backends"]["pymupdf"]["tempo_segundos"]
+    result["speedup_pymupdf"] = round(base / fast, 2) if fast else None
+    return result
+
+
+def benchmark(path: str = "data/entrada", repeat: int = 1, workers: int = 1, out_json: str = None):
+    """
+    Executa o benchmark em um PDF ou em todos os PDFs de um diretório.
+
+    Args:
+        path: Arquivo PDF ou diretório com PDFs
+        repeat: Repetições por backend
+        workers: Processos para extração paralela
+        out_json: Caminho para salvar o resultado em JSON (opcional)
+    """
+    target = Path(path)
+    files = sorted(target.glob("*.pdf")) if target.is_dir() else [target]
+
+    if not files:
+        print(f"[ERRO] Nenhum PDF encontrado em {path}")
+        return
+
+    results = []
+    print(f"{'Arquivo':40} {'Backend':12} {'Tempo (s)':>10} {'Cláusulas':>10} {'Tabelas':>8}")
+    print("-" * 84)
+    for f in files:
+        r = benchmark_file(str(f), repeat=repeat, workers=workers)
+        results.append(r)
+        for backend, m in r["backends"].items():
+            print(f"{r['arquivo'][:40]:40} {backend:12} {m['tempo_segundos']:>10.3f} "
+                  f"{m['clausulas']:>10} {m['tabelas']:>8}")
+        # Sem speedup quando o pymupdf arredonda para 0s
+        speedup = r['speedup_pymupdf']
+        print(f"{'':40} {'speedup':12} {(f'{speedup}x' if speedup is not None else 'n/a'):>11}")
+
+    if out_json:
+        with open(out_json, "w", encoding="utf-8") as fp:
+            json.dump(results, fp, ensure_ascii=False, indent=2)
+        print(f"\n[OK] Resultado salvo em: {out_json}")
+
+
+if __name__ == "__main__":
+    import fire
+    fire.Fire(benchmark)
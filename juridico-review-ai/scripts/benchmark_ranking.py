@@ -0,0 +1,166 @@
+"""
+Benchmark do ranking em dois estágios contra o scoring completo.
+
+Rankeia as cláusulas de uma minuta (ou de uma minuta sintética gerada por
+scripts/gerar_minutas_sinteticas.py) com o HybridRanker completo e em dois
+estágios (shortlist lexical de N candidatas por cláusula; semântica, regex e
+MMR só nelas), para cada N em --candidatos. Para cada N reporta:
+
+- latência do ranking (melhor de --repeat) e speedup sobre o completo
+- recall@k: fração dos top-k do scoring completo devolvidos em dois estágios
+- cobertura da shortlist: fração dos top-k completos entre as N candidatas
+  (teto do recall@k; abaixo dele, a diferença vem do MMR restrito)
+
+Os catálogos de --catalogos são concatenados em um só, para medir catálogos
+maiores que os de produção.
+
+Uso:
+    python scripts/benchmark_ranking.py --minuta data/entrada/minuta.pdf --candidatos 10,25,50
+    python scripts/benchmark_ranking.py --clausulas 500 --top_k 3 --out_json ranking.json
+"""
+import glob
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import yaml
+
+# Adiciona o diretório raiz ao path para imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from scripts.gerar_minutas_sinteticas import generate, DEFAULT_CATALOGS
+
+
+def load_catalogs(catalogs: str = DEFAULT_CATALOGS) -> dict:
+    """Cláusulas de todos os catálogos do padrão glob em um único catálogo"""
+    clauses = []
+    for path in sorted(glob.glob(catalogs)):
+        with open(path, 'r', encoding='utf-8') as f:
+            clauses.extend(yaml.safe_load(f).get('clausulas', []))
+    if not clauses:
+        raise FileNotFoundError(f"Nenhum catálogo encontrado em {catalogs}")
+    return {'clausulas': clauses}
+
+
+def recall_at_k(reference, candidate) -> float:
+    """
+    Recall@k médio: fração dos ids de referência presentes no candidato
+
+    Args:
+        reference: Por query, ids do top-k do scoring completo
+        candidate: Por query, ids devolvidos pelo outro método
+
+    Returns:
+        Média sobre as queries (1.0 = mesmo conjunto)
+    """
+    values = [len(set(ref) & set(cand)) / len(ref) for ref, cand in zip(reference, candidate) if ref]
+    return sum(values) / len(values) if values else 1.0
+
+
+def _timed_rank(ranker, queries, top_k, lambda_param, candidates, repeat):
+    """(melhor tempo, índices do catálogo por query) do rank_queries"""
+    from backend.ranker_v2 import RANK_BATCH_SIZE
+
+    positions = {id(clause): i for i, clause in enumerate(ranker.catalog_clauses)}
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        results = []
+        for start in range(0, len(queries), RANK_BATCH_SIZE):
+            results.extend(ranker.rank_queries(queries[start:start + RANK_BATCH_SIZE], top_k, lambda_param,
+                                               candidates=candidates))
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, [[positions[id(m['catalog_clause'])] for m in matches] for matches in results]
+
+
+def benchmark(minuta: str = None,
+              clausulas: int = 300,
+              catalogos: str = DEFAULT_CATALOGS,
+              candidatos=(10, 25, 50),
+              top_k: int = 3,
+              lambda_param: float = 0.7,
+              pdf_backend: str = 'pymupdf',
+              repeat: int = 1,
+              out_json: str = None,
+              seed: int = 0):
+    """
+    Compara o ranking em dois estágios com o scoring completo.
+
+    Args:
+        minuta: Minuta (.docx/.pdf); sem ela, gera uma sintética
+        clausulas: Número de cláusulas da minuta sintética
+        catalogos: Padrão glob dos catálogos YAML (concatenados)
+        candidatos: Tamanhos de shortlist, ex. 10,25,50
+        top_k: Matches por cláusula
+        lambda_param: Parâmetro MMR
+        pdf_backend: Backend do parse_pdf
+        repeat: Repetições por configuração (usa o melhor tempo)
+        out_json: Caminho para salvar o resultado em JSON (opcional)
+        seed: Semente do gerador
+    """
+    from backend.parsing import parse_document
+    from backend.ranker_v2 import HybridRanker
+
+    if isinstance(candidatos, int):
+        candidatos = (candidatos,)
+
+    if minuta is None:
+        _, minuta, _ = generate(tempfile.mkdtemp(prefix="minutas_"), int(clausulas), catalogos=catalogos, seed=seed)
+    document = parse_document(str(minuta), pdf_backend=pdf_backend)
+    queries = [f"{clause['title']} {clause['content']}" for clause in document.clauses]
+
+    catalog = load_catalogs(catalogos)
+    ranker = HybridRanker()
+    t0 = time.perf_counter()
+    ranker.encode_catalog(catalog)
+    t_catalog = time.perf_counter() - t0
+
+    t_full, full = _timed_rank(ranker, queries, top_k, lambda_param, None, repeat)
+
+    report = {
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+        'minuta': os.path.basename(str(minuta)),
+        'clausulas_documento': len(queries),
+        'clausulas_catalogo': len(ranker.catalog_clauses),
+        'top_k': top_k,
+        'tempo_catalogo_segundos': round(t_catalog, 4),
+        'completo_segundos': round(t_full, 4),
+        'resultados': []
+    }
+
+    print(f"{len(queries)} cláusulas x {len(ranker.catalog_clauses)} do catálogo, top-{top_k}")
+    print(f"{'Candidatas':>10} {'Tempo (s)':>10} {'Speedup':>8} {'Recall@k':>9} {'Cobertura':>10}")
+    print("-" * 51)
+    print(f"{'completo':>10} {t_full:>10.3f} {1.0:>8.2f} {1.0:>9.3f} {1.0:>10.3f}")
+
+    for n in candidatos:
+        n = int(n)
+        elapsed, staged = _timed_rank(ranker, queries, top_k, lambda_param, n, repeat)
+        shortlist, _ = ranker.shortlist(queries, n)
+        coverage = recall_at_k(full, shortlist.tolist())
+        recall = recall_at_k(full, staged)
+        speedup = t_full / elapsed if elapsed else None
+        report['resultados'].append({
+            'candidatas': n,
+            'tempo_segundos': round(elapsed, 4),
+            'speedup': round(speedup, 2) if speedup else None,
+            'recall_at_k': round(recall, 4),
+            'cobertura_shortlist': round(coverage, 4)
+        })
+        print(f"{n:>10} {elapsed:>10.3f} {speedup or 0:>8.2f} {recall:>9.3f} {coverage:>10.3f}")
+
+    if out_json:
+        with open(out_json, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, ensure_ascii=False, indent=2)
+        print(f"\n[OK] Resultado salvo em: {out_json}")
+
+
+if __name__ == "__main__":
+    import fire
+    fire.Fire(benchmark)
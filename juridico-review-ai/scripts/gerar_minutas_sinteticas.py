@@ -0,0 +1,263 @@
+"""
+Gerador de minutas sintéticas (DOCX e PDF) a partir dos catálogos.
+
+Monta um documento com cláusulas tiradas dos templates de
+data/catalogos/*.yaml, com tamanho controlável: número de cláusulas,
+profundidade de numeração (5.1, 5.1.1, ...), tabelas de cronograma e estilo
+dos títulos (negrito, estilo Heading ou misto). O mesmo conteúdo é gravado
+como DOCX (python-docx) e PDF (PyMuPDF), então o número de páginas do PDF
+serve de referência de tamanho para os dois formatos.
+
+Uso:
+    python scripts/gerar_minutas_sinteticas.py --clausulas 200 --profundidade 2 --tabelas 3
+"""
+import glob
+import os
+import random
+import re
+import sys
+import textwrap
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import yaml
+
+# Adiciona o diretório raiz ao path para imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+DEFAULT_CATALOGS = "data/catalogos/*.yaml"
+STYLES = ('bold', 'heading', 'mixed')
+
+# Página A4 em pontos e layout do PDF
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+MARGIN_X, MARGIN_TOP, MARGIN_BOTTOM = 50, 60, 60
+LINE_HEIGHT = 13
+WRAP_CHARS = 95
+
+# Fontes base-14 do PDF só cobrem latin-1
+PDF_REPLACEMENTS = str.maketrans({'–': '-', '—': '-', '“': '"', '”': '"', '‘': "'", '’': "'", '•': '*', '…': '...'})
+
+FILLER = (
+    "As Partes acordam que as obrigações previstas nesta cláusula serão cumpridas nos prazos "
+    "e condições estabelecidos neste Termo de Securitização."
+)
+
+
+def load_templates(catalogs: str = DEFAULT_CATALOGS) -> List[Dict]:
+    """
+    Cláusulas dos catálogos como {titulo, linhas} para montar as minutas
+
+    Args:
+        catalogs: Padrão glob dos catálogos YAML
+
+    Returns:
+        Lista de {'titulo', 'linhas'} (linhas do corpo do template)
+    """
+    templates = []
+    for path in sorted(glob.glob(catalogs)):
+        with open(path, 'r', encoding='utf-8') as f:
+            catalog = yaml.safe_load(f)
+        for clause in catalog.get('clausulas', []):
+            body = clause.get('template', '').split('\n\n', 1)
+            lines = []
+            if len(body) > 1:
+                for line in body[1].split('\n'):
+                    line = line.strip()
+                    if line and not line.startswith('[Conteúdo completo') and line != '[•]':
+                        lines.append(re.sub(r'\.\.\.$', '.', line))
+            templates.append({'titulo': clause.get('titulo', 'CLÁUSULA'), 'linhas': lines})
+
+    if not templates:
+        raise FileNotFoundError(f"Nenhum catálogo encontrado em {catalogs}")
+    return templates
+
+
+def build_minuta(templates: List[Dict],
+                 num_clauses: int = 50,
+                 depth: int = 2,
+                 num_tables: int = 2,
+                 table_rows: int = 40,
+                 style: str = 'mixed',
+                 seed: int = 0) -> List[Dict]:
+    """
+    Monta a sequência de blocos da minuta
+
+    Args:
+        templates: Saída de load_templates
+        num_clauses: Número de cláusulas (títulos CLÁUSULA N)
+        depth: Níveis de subitens numerados (0 = sem subitens, até 3)
+        num_tables: Tabelas de cronograma distribuídas pelo documento
+        table_rows: Linhas de dados por tabela
+        style: Títulos em 'bold', 'heading' (estilo Heading 1) ou 'mixed'
+        seed: Semente do gerador aleatório
+
+    Returns:
+        Blocos {'kind': 'title'|'paragraph'|'item'|'table', ...} em ordem
+    """
+    if style not in STYLES:
+        raise ValueError(f"Estilo desconhecido: {style} (use {', '.join(STYLES)})")
+
+    rng = random.Random(seed)
+    pool = [line for t in templates for line in t['linhas'] if len(line) > 40] or [FILLER]
+    table_after = {round((k + 1) * num_clauses / (num_tables + 1)) for k in range(num_tables)}
+
+    blocks = []
+    for n in range(1, num_clauses + 1):
+        template = templates[(n - 1) % len(templates)]
+        heading = 'heading' if style == 'heading' or (style == 'mixed' and n % 2 == 0) else 'bold'
+        blocks.append({'kind': 'title', 'text': f"CLÁUSULA {n} – {template['titulo']}", 'style': heading})
+
+        body = template['linhas'][:3] or [rng.choice(pool)]
+        blocks.append({'kind': 'paragraph', 'text': ' '.join(body + [FILLER])})
+
+        for i in range(1, 3 if depth >= 1 else 1):
+            number = f"{n}.{i}"
+            blocks.append({'kind': 'item', 'text': f"{number} {rng.choice(pool)}", 'level': 1})
+            for level in range(2, depth + 1):
+                number = f"{number}.1"
+                blocks.append({'kind': 'item', 'text': f"{number} {rng.choice(pool)}", 'level': level})
+
+        if n in table_after:
+            rows = [["Parcela", "Data de Pagamento", "Saldo Devedor (R$)", "Amortização (%)"]]
+            for r in range(1, table_rows + 1):
+                rows.append([str(r), f"15/{(r - 1) % 12 + 1:02d}/{2025 + (r - 1) // 12}",
+                             f"{1000 * (table_rows - r + 1)}.000,00", f"{100 / table_rows:.4f}".replace('.', ',')])
+            blocks.append({'kind': 'table', 'rows': rows})
+
+    return blocks
+
+
+def write_docx(blocks: List[Dict], path) -> Path:
+    """Grava os blocos como DOCX (títulos em negrito ou estilo Heading 1)"""
+    import docx
+
+    d = docx.Document()
+    for block in blocks:
+        if block['kind'] == 'title':
+            if block['style'] == 'heading':
+                d.add_heading(block['text'], level=1)
+            else:
+                d.add_paragraph().add_run(block['text']).bold = True
+        elif block['kind'] == 'table':
+            rows = block['rows']
+            table = d.add_table(rows=len(rows), cols=len(rows[0]))
+            for r, row in enumerate(rows):
+                cells = table.rows[r].cells
+                for c, value in enumerate(row):
+                    cells[c].text = value
+        else:
+            d.add_paragraph(block['text'])
+
+    d.save(str(path))
+    return Path(path)
+
+
+def write_pdf(blocks: List[Dict], path) -> int:
+    """
+    Grava os blocos como PDF (texto com quebra de linha, tabelas com grade)
+
+    Returns:
+        Número de páginas
+    """
+    import fitz
+
+    doc = fitz.open()
+    state = {'page': None, 'y': PAGE_HEIGHT}
+
+    def ensure(height: float):
+        if state['page'] is None or state['y'] + height > PAGE_HEIGHT - MARGIN_BOTTOM:
+            state['page'] = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+            state['y'] = MARGIN_TOP
+
+    def write_line(text: str, bold: bool = False, indent: int = 0):
+        ensure(LINE_HEIGHT)
+        state['page'].insert_text((MARGIN_X + indent, state['y']), text.translate(PDF_REPLACEMENTS),
+                                  fontname='hebo' if bold else 'helv', fontsize=11 if bold else 10)
+        state['y'] += LINE_HEIGHT
+
+    for block in blocks:
+        if block['kind'] == 'table':
+            rows = block['rows']
+            col_width = (PAGE_WIDTH - 2 * MARGIN_X) / len(rows[0])
+            for row in rows:
+                ensure(LINE_HEIGHT + 6)
+                top = state['y'] - LINE_HEIGHT + 3
+                for c, value in enumerate(row):
+                    rect = fitz.Rect(MARGIN_X + c * col_width, top,
+                                     MARGIN_X + (c + 1) * col_width, top + LINE_HEIGHT + 4)
+                    state['page'].draw_rect(rect, color=(0, 0, 0), width=0.6)
+                    state['page'].insert_text((rect.x0 + 3, rect.y1 - 5), value.translate(PDF_REPLACEMENTS),
+                                              fontname='helv', fontsize=8)
+                state['y'] += LINE_HEIGHT + 4
+            state['y'] += LINE_HEIGHT
+            continue
+
+        bold = block['kind'] == 'title'
+        indent = 15 * block.get('level', 0)
+        if bold:
+            state['y'] += 6
+        for line in textwrap.wrap(block['text'], WRAP_CHARS - indent // 5):
+            write_line(line, bold=bold, indent=indent)
+        state['y'] += 4
+
+    num_pages = len(doc)
+    for i, page in enumerate(doc, 1):
+        page.insert_text((PAGE_WIDTH / 2 - 30, PAGE_HEIGHT - 25), f"Página {i} de {num_pages}",
+                         fontname='helv', fontsize=8)
+
+    doc.save(str(path))
+    doc.close()
+    return num_pages
+
+
+def generate(out_dir: str = "data/sinteticas",
+             clausulas: int = 50,
+             profundidade: int = 2,
+             tabelas: int = 2,
+             linhas_tabela: int = 40,
+             estilo: str = 'mixed',
+             catalogos: str = DEFAULT_CATALOGS,
+             seed: int = 0) -> Tuple[Path, Path, Dict]:
+    """
+    Gera o par DOCX/PDF de uma minuta sintética
+
+    Args:
+        out_dir: Diretório de saída
+        clausulas: Número de cláusulas
+        profundidade: Níveis de subitens numerados (0-3)
+        tabelas: Número de tabelas de cronograma
+        linhas_tabela: Linhas por tabela
+        estilo: 'bold', 'heading' ou 'mixed'
+        catalogos: Padrão glob dos catálogos YAML
+        seed: Semente
+
+    Returns:
+        (caminho do DOCX, caminho do PDF, descrição da minuta)
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+
+    blocks = build_minuta(load_templates(catalogos), clausulas, profundidade, tabelas,
+                          linhas_tabela, estilo, seed)
+    name = f"minuta_c{clausulas}_p{profundidade}_t{tabelas}x{linhas_tabela}_{estilo}"
+    docx_path = write_docx(blocks, out / f"{name}.docx")
+    pdf_path = out / f"{name}.pdf"
+    pages = write_pdf(blocks, pdf_path)
+
+    info = {
+        'nome': name,
+        'clausulas': clausulas,
+        'profundidade': profundidade,
+        'tabelas': tabelas,
+        'linhas_tabela': linhas_tabela,
+        'estilo': estilo,
+        'paginas': pages,
+        'blocos': len(blocks)
+    }
+    print(f"[OK] {docx_path} / {pdf_path} ({pages} páginas)")
+    return docx_path, pdf_path, info
+
+
+if __name__ == "__main__":
+    import fire
+    fire.Fire(generate)
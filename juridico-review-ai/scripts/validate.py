@@ -1,14 +1,22 @@
 import json
-import hashlib
 import os
 import sys
 
 # Adiciona o diretório raiz ao path para imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from typing import Dict
-from backend.parsing import parse_document
-from backend.report_v2 import gerar_relatorio_html
+from typing import Dict, Optional
+from backend.parsers.cache import ParseCache, DEFAULT_CACHE_DIR, compute_file_hash
+from backend.parsers.pdf_pymupdf import extract_blocks as extract_pdf
+from backend.parsers.docx_parser import extract_blocks_docx
+from backend.retrieval.index_faiss import build_index, query_topk
+from backend.rules.engine import apply_rules
+from backend.agents.gemini_validator import judge_with_gemini
+from backend.schemas import ClauseJudgement
+from backend.reports.html_report import render_html
+
+# Incrementar quando a extração de blocos mudar (invalida o cache)
+BLOCKS_VERSION = "blocks-2"
 
 def sha256_file(path: str) -> str:
     """
@@ -20,18 +28,16 @@ def sha256_file(path: str) -> str:
     Returns:
         Hash SHA256 em hexadecimal
     """
-    h = hashlib.sha256()
-    with open(path,'rb') as f:
-        for chunk in iter(lambda: f.read(1<<20), b''):
-            h.update(chunk)
-    return h.hexdigest()
+    return compute_file_hash(path)
 
-def load_blocks(any_path: str):
+def load_blocks(any_path: str, cache: Optional[ParseCache] = None, file_hash: Optional[str] = None):
     """
     Carrega blocos de um documento PDF ou DOCX.
 
     Args:
         any_path: Caminho do arquivo (.pdf ou .docx)
+        cache: Cache de parsing (opcional)
+        file_hash: SHA-256 do arquivo, se já calculado
 
     Returns:
         Lista de blocos extraídos
@@ -40,14 +46,28 @@ def load_blocks(any_path: str):
         ValueError: Se o formato não for suportado
     """
     ext = os.path.splitext(any_path)[1].lower()
+    if ext not in (".pdf", ".docx"):
+        raise ValueError("Formato não suportado. Use PDF (.pdf) ou DOCX (.docx).")
+
+    key = None
+    if cache is not None:
+        key = cache.make_key(file_hash or compute_file_hash(any_path), BLOCKS_VERSION, {"format": ext})
+        cached = cache.get(key)
+        if cached is not None:
+            return cached["blocks"]
+
     if ext == ".pdf":
-        return extract_pdf(any_path)
-    elif ext == ".docx":
-        return extract_blocks_docx(any_path)
+        blocks = extract_pdf(any_path)
     else:
-        raise ValueError("Formato não suportado. Use PDF (.pdf) ou DOCX (.docx).")
+        blocks = extract_blocks_docx(any_path)
+
+    if cache is not None:
+        cache.put(key, {"blocks": blocks})
+
+    return blocks
 
-def validate(pdf_path: str, standard_path: str, k: int = 5, use_llm: bool = True, out_html: str = "report.html"):
+def validate(pdf_path: str, standard_path: str, k: int = 5, use_llm: bool = True, out_html: str = "report.html",
+             cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
     """
     Pipeline completo de validação documental.
 
@@ -66,12 +86,15 @@ def validate(pdf_path: str, standard_path: str, k: int = 5, use_llm: bool = True
         k: Número de blocos a recuperar (default: 5)
         use_llm: Se deve usar LLM para casos ambíguos (default: True)
         out_html: Caminho do relatório HTML de saída (default: report.html)
+        cache_dir: Diretório do cache de parsing (None desativa)
     """
     print(f"[1/4] Carregando standard: {standard_path}")
     std = json.load(open(standard_path, 'r', encoding='utf-8'))
 
     print(f"[2/4] Extraindo blocos do documento: {pdf_path}")
-    blocks = load_blocks(pdf_path)
+    pdf_sha256 = sha256_file(pdf_path)
+    cache = ParseCache(cache_dir) if cache_dir else None
+    blocks = load_blocks(pdf_path, cache=cache, file_hash=pdf_sha256)
     print(f"      Blocos extraídos: {len(blocks)}")
 
     print(f"[3/4] Construindo índice FAISS...")
@@ -106,7 +129,7 @@ def validate(pdf_path: str, standard_path: str, k: int = 5, use_llm: bool = True
         results.append(out)
 
     payload = {
-        "pdf_sha256": sha256_file(pdf_path),
+        "pdf_sha256": pdf_sha256,
         "standard_version": std["version"],
         "results": results
     }